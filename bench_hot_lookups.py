@@ -0,0 +1,91 @@
+"""
+Benchmark des recherches les plus fréquentes (utilisateur par login, dossier,
+modèle et acte par id) : requêtes construites à chaque appel (db.query(), db.get())
+contre les requêtes pré-construites de src/repositories/lookups.py.
+
+Utilise DATABASE_URL si elle est définie, sinon une base SQLite en mémoire.
+Les données de test sont créées dans une transaction annulée à la fin.
+
+    python bench_hot_lookups.py [iterations]
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy.orm import Session
+from src.database import engine, init_schema
+from src.models.user import User
+from src.models.dossier import Dossier
+from src.models.template import Template
+from src.models.acte import Acte
+from src.repositories.lookups import get_user_by_username, get_dossier, get_template, get_acte
+
+
+def seed(db):
+    user = User(username="bench_user", password_hash="x", email="bench@example.com", role="clerc")
+    db.add(user)
+    db.flush()
+    dossier = Dossier(numero_dossier="BENCH-0001", intitule="Dossier benchmark", type_dossier="VENTE",
+                      statut="OUVERT", responsable_id=user.id)
+    template = Template(nom="Modèle benchmark", type_acte="VENTE", contenu="{{ dossier.intitule }}")
+    db.add_all([dossier, template])
+    db.flush()
+    acte = Acte(dossier_id=dossier.id, template_id=template.id, titre="Acte benchmark", contenu="...")
+    db.add(acte)
+    db.flush()
+    return user.username, dossier.id, template.id, acte.id
+
+
+def measure(db, iterations, lookup):
+    # Vider l'identity map pour que chaque appel aille réellement en base
+    start = time.perf_counter()
+    for _ in range(iterations):
+        db.expunge_all()
+        lookup()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    if engine.dialect.name == "sqlite":
+        init_schema()
+
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = Session(bind=connection)
+    try:
+        username, dossier_id, template_id, acte_id = seed(db)
+        cases = [
+            ("utilisateur par login",
+             lambda: db.query(User).filter(User.username == username).first(),
+             lambda: get_user_by_username(db, username)),
+            ("dossier par id",
+             lambda: db.query(Dossier).filter(Dossier.id == dossier_id).first(),
+             lambda: get_dossier(db, dossier_id)),
+            ("modèle par id",
+             lambda: db.get(Template, template_id),
+             lambda: get_template(db, template_id)),
+            ("acte par id",
+             lambda: db.get(Acte, acte_id),
+             lambda: get_acte(db, acte_id)),
+        ]
+
+        print(f"Base : {engine.dialect.name} - {iterations} appels par cas")
+        print(f"{'Recherche':<24}{'avant (µs)':>12}{'après (µs)':>12}{'gain':>8}")
+        for name, before, after in cases:
+            # Préchauffage : remplit le cache de compilation des deux variantes
+            measure(db, 50, before)
+            measure(db, 50, after)
+            before_us = measure(db, iterations, before)
+            after_us = measure(db, iterations, after)
+            print(f"{name:<24}{before_us:>12.1f}{after_us:>12.1f}{(1 - after_us / before_us) * 100:>7.0f}%")
+    finally:
+        db.close()
+        transaction.rollback()
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Shared pytest fixtures.
+
+Tests run inside a transaction that is rolled back at the end, so they can
+seed rows freely without touching existing data.
+"""
+import os
+import tempfile
+from datetime import datetime, date
+import pytest
+
+# Hermetic by default: an embedded SQLite file shared by the sync and async
+# engines. Export DATABASE_URL to run the suite against PostgreSQL instead.
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='agen_test_'), 'agen_ohada.db')}"
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+import src.models  # noqa: F401 - registers every mapper
+from src.database import engine, init_schema
+from src.models.user import User
+from src.models.client import Client
+from src.models.dossier import Dossier, DossierParties, DossierHistorique, Document
+from src.models.template import Template
+from src.models.acte import Acte
+from src.utils.sql_instrumentation import assert_max_queries as _assert_max_queries
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """Create the tables of src.models once per test run"""
+    try:
+        init_schema()
+    except OperationalError as e:
+        pytest.skip(f"Base de données indisponible : {e}")
+
+
+@pytest.fixture
+def db_session():
+    """Session bound to a transaction rolled back after the test"""
+    try:
+        connection = engine.connect()
+    except OperationalError as e:
+        pytest.skip(f"Base de données indisponible : {e}")
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Context manager failing when a block issues more than N statements"""
+    return _assert_max_queries
+
+
+@pytest.fixture
+def seeded_dossier(db_session):
+    """A dossier with parties, documents, history and actes, plus a template"""
+    user = User(username="test_clerc", email="clerc@test.local", password_hash="x", role="CLERC")
+    db_session.add(user)
+    db_session.flush()
+
+    dossier = Dossier(
+        numero_dossier="TEST-0001",
+        intitule="Vente Immeuble Test",
+        type_dossier="VENTE",
+        statut="INSTRUCTION",
+        date_ouverture=date.today(),
+        responsable_id=user.id,
+        description="Dossier de test",
+    )
+    db_session.add(dossier)
+    db_session.flush()
+
+    for i, role in enumerate(["VENDEUR", "ACQUEREUR", "AUTRE"]):
+        client = Client(type_client="PHYSIQUE", nom=f"Nom{i}", prenom=f"Prenom{i}", telephone=f"77000000{i}")
+        db_session.add(client)
+        db_session.flush()
+        db_session.add(DossierParties(dossier_id=dossier.id, client_id=client.id, role_dans_acte=role))
+
+    for i in range(2):
+        db_session.add(Document(
+            dossier_id=dossier.id, titre=f"Doc {i}", type_document="ACTE",
+            chemin_fichier=f"uploads/test_{i}.pdf", date_upload=datetime.utcnow()
+        ))
+        db_session.add(DossierHistorique(
+            dossier_id=dossier.id, ancien_statut="OUVERT", nouveau_statut="INSTRUCTION",
+            date_changement=datetime.utcnow(), user_id=user.id
+        ))
+
+    template = Template(nom="Modèle de test", type_acte="VENTE", contenu="Dossier {{dossier.numero}} - {{dossier.intitule}}")
+    db_session.add(template)
+    db_session.flush()
+
+    for i in range(2):
+        db_session.add(Acte(dossier_id=dossier.id, template_id=template.id, titre=f"Acte {i}", contenu="..."))
+
+    db_session.commit()
+    db_session.expunge_all()
+    # Open the next savepoint now so it is not counted by the test's query budget
+    db_session.connection()
+    return {"dossier_id": dossier.id, "template_id": template.id}
@@ -5,31 +5,22 @@ import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
-# Paramètres de connexion
-DB_HOST = "localhost"
-DB_PORT = 5432
-DB_USER = "postgres"
-DB_PASSWORD = "Dcadmin01"
-DB_NAME = "agen_ohada_db"
+# Paramètres de connexion (variables DB_* / DATABASE_URL, voir .env)
+from src.database import connection_params, engine, init_schema
 
 def create_database():
     """Crée la base de données si elle n'existe pas"""
+    db_name = connection_params()["dbname"]
     try:
         # Connexion au serveur PostgreSQL (base postgres par défaut)
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database="postgres"
-        )
+        conn = psycopg2.connect(**connection_params("postgres"))
         conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         cursor = conn.cursor()
         
         # Vérifier si la base existe
         cursor.execute(
             "SELECT 1 FROM pg_database WHERE datname = %s",
-            (DB_NAME,)
+            (db_name,)
         )
         exists = cursor.fetchone()
         
@@ -37,12 +28,12 @@ def create_database():
             # Créer la base de données
             cursor.execute(
                 sql.SQL("CREATE DATABASE {}").format(
-                    sql.Identifier(DB_NAME)
+                    sql.Identifier(db_name)
                 )
             )
-            print(f"✅ Base de données '{DB_NAME}' créée avec succès!")
+            print(f"✅ Base de données '{db_name}' créée avec succès!")
         else:
-            print(f"ℹ️  La base de données '{DB_NAME}' existe déjà.")
+            print(f"ℹ️  La base de données '{db_name}' existe déjà.")
         
         cursor.close()
         conn.close()
@@ -57,13 +48,7 @@ def execute_schema():
     """Exécute le fichier schema.sql"""
     try:
         # Connexion à la base de données créée
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
+        conn = psycopg2.connect(**connection_params())
         cursor = conn.cursor()
         
         # Lire et exécuter le fichier schema.sql
@@ -90,8 +75,12 @@ def execute_schema():
 if __name__ == "__main__":
     print("🚀 Initialisation de la base de données AGEN-OHADA\n")
     
+    if engine.dialect.name != "postgresql":
+        # Base embarquée (SQLite) : schéma créé à partir des modèles
+        init_schema()
+        print(f"✅ Schéma créé à partir des modèles sur {engine.url}")
     # Étape 1: Créer la base de données
-    if create_database():
+    elif create_database():
         # Étape 2: Exécuter le schéma
         if execute_schema():
             print("\n✅ Initialisation terminée avec succès!")
@@ -0,0 +1,9 @@
+-- Dashboard KPIs
+-- Date: 2026-10-18
+-- Purpose: Count actes awaiting signature and pending formalités without reading the whole tables
+
+CREATE INDEX IF NOT EXISTS idx_actes_statut ON actes(statut);
+CREATE INDEX IF NOT EXISTS idx_formalites_statut ON formalites(statut);
+
+ANALYZE actes;
+ANALYZE formalites;
@@ -0,0 +1,84 @@
+-- Dashboard counters maintained by triggers
+-- Date: 2026-10-18
+-- Purpose: Dossiers per statut, type, responsable and month, and actes per statut,
+-- as running totals updated by triggers, so dashboard reads cost a few rows
+-- whatever the size of dossiers and actes. reconcile_stats.py repairs any drift.
+
+-- 1. Counters
+CREATE TABLE IF NOT EXISTS stats_counters (
+    dimension VARCHAR(30) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    emoluments DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    debours DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, key)
+);
+
+-- 2. Triggers (same DDL as src/models/stats.py)
+CREATE OR REPLACE FUNCTION stats_counters_bump(dim text, k text, n integer, emol numeric, deb numeric)
+        RETURNS void LANGUAGE sql AS $$
+        INSERT INTO stats_counters (dimension, key, count, emoluments, debours) VALUES (dim, k, n, emol, deb)
+        ON CONFLICT (dimension, key) DO UPDATE SET
+            count = stats_counters.count + excluded.count,
+            emoluments = stats_counters.emoluments + excluded.emoluments,
+            debours = stats_counters.debours + excluded.debours
+        $$;
+
+CREATE OR REPLACE FUNCTION stats_counters_dossiers() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stats_counters_bump('statut', coalesce(OLD.statut, ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('type', coalesce(OLD.type_dossier, ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('responsable', coalesce(CAST(OLD.responsable_id AS TEXT), ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('mois', to_char(OLD.date_ouverture, 'YYYY-MM'), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stats_counters_bump('statut', coalesce(NEW.statut, ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('type', coalesce(NEW.type_dossier, ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('responsable', coalesce(CAST(NEW.responsable_id AS TEXT), ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('mois', to_char(NEW.date_ouverture, 'YYYY-MM'), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_stats_counters ON dossiers;
+
+CREATE TRIGGER trg_stats_counters AFTER INSERT OR DELETE OR UPDATE OF statut, type_dossier, responsable_id, date_ouverture, emoluments, debours ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_dossiers();
+
+CREATE OR REPLACE FUNCTION stats_counters_actes() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stats_counters_bump('acte_statut', coalesce(OLD.statut, ''), -1, 0, 0);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stats_counters_bump('acte_statut', coalesce(NEW.statut, ''), +1, 0, 0);
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_stats_counters ON actes;
+
+CREATE TRIGGER trg_stats_counters AFTER INSERT OR DELETE OR UPDATE OF statut ON actes
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_actes();
+
+-- 3. Initial fill (the writers wait for it, nothing is counted twice)
+BEGIN;
+LOCK TABLE stats_counters IN EXCLUSIVE MODE;
+DELETE FROM stats_counters;
+INSERT INTO stats_counters (dimension, key, count, emoluments, debours)
+SELECT 'statut', coalesce(statut, ''), count(*), coalesce(sum(emoluments), 0), coalesce(sum(debours), 0)
+FROM dossiers GROUP BY 2
+UNION ALL
+SELECT 'type', coalesce(type_dossier, ''), count(*), coalesce(sum(emoluments), 0), coalesce(sum(debours), 0)
+FROM dossiers GROUP BY 2
+UNION ALL
+SELECT 'responsable', coalesce(CAST(responsable_id AS TEXT), ''), count(*), coalesce(sum(emoluments), 0), coalesce(sum(debours), 0)
+FROM dossiers GROUP BY 2
+UNION ALL
+SELECT 'mois', to_char(date_ouverture, 'YYYY-MM'), count(*), coalesce(sum(emoluments), 0), coalesce(sum(debours), 0)
+FROM dossiers GROUP BY 2
+UNION ALL
+SELECT 'acte_statut', coalesce(statut, ''), count(*), 0, 0
+FROM actes GROUP BY 2;
+COMMIT;
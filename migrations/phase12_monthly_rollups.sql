@@ -0,0 +1,102 @@
+-- Monthly rollups for the dashboard charts
+-- Date: 2026-10-18
+-- Purpose: Dossiers opened and closed, émoluments and débours per month and type,
+-- so the charts read a few dozen rows whatever the history. Triggers queue the
+-- months touched by every write to dossiers and dossier_historique; the server
+-- (or refresh_rollups.py) recomputes only those.
+
+-- 1. Rollups
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    mois VARCHAR(7) NOT NULL,
+    type_dossier VARCHAR(50) NOT NULL,
+    dossiers_ouverts INTEGER NOT NULL DEFAULT 0,
+    dossiers_clotures INTEGER NOT NULL DEFAULT 0,
+    emoluments DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    debours DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (mois, type_dossier)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_dirty_months (
+    id SERIAL PRIMARY KEY,
+    mois VARCHAR(7) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+ALTER TABLE rollup_watermarks ALTER COLUMN refreshed_at TYPE TIMESTAMP WITH TIME ZONE;
+
+-- Closures by month, read when recomputing a month
+CREATE INDEX IF NOT EXISTS idx_dossier_historique_statut_date ON dossier_historique(nouveau_statut, date_changement);
+DROP INDEX IF EXISTS idx_dossiers_created_at;
+
+-- 2. Triggers queuing the touched months (same DDL as src/models/rollup.py)
+CREATE OR REPLACE FUNCTION rollup_mark_dossier() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO rollup_dirty_months (mois)
+            SELECT to_char(OLD.date_ouverture, 'YYYY-MM')
+            UNION
+            SELECT to_char(h.date_changement, 'YYYY-MM') FROM dossier_historique h
+            WHERE h.dossier_id = OLD.id AND h.nouveau_statut = 'CLOTURE' AND h.date_changement IS NOT NULL;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO rollup_dirty_months (mois)
+            SELECT to_char(NEW.date_ouverture, 'YYYY-MM')
+            UNION
+            SELECT to_char(h.date_changement, 'YYYY-MM') FROM dossier_historique h
+            WHERE h.dossier_id = NEW.id AND h.nouveau_statut = 'CLOTURE' AND h.date_changement IS NOT NULL;
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_rollup_dirty ON dossiers;
+
+CREATE TRIGGER trg_rollup_dirty AFTER INSERT OR DELETE OR UPDATE OF type_dossier, date_ouverture, emoluments, debours ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION rollup_mark_dossier();
+
+CREATE OR REPLACE FUNCTION rollup_mark_closure() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.nouveau_statut = 'CLOTURE' AND OLD.date_changement IS NOT NULL THEN
+            INSERT INTO rollup_dirty_months (mois) VALUES (to_char(OLD.date_changement, 'YYYY-MM'));
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.nouveau_statut = 'CLOTURE' AND NEW.date_changement IS NOT NULL THEN
+            INSERT INTO rollup_dirty_months (mois) VALUES (to_char(NEW.date_changement, 'YYYY-MM'));
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_rollup_dirty ON dossier_historique;
+
+CREATE TRIGGER trg_rollup_dirty AFTER INSERT OR DELETE OR UPDATE ON dossier_historique
+        FOR EACH ROW EXECUTE FUNCTION rollup_mark_closure();
+
+-- 3. Initial fill (same figures as refresh_rollups.py --full)
+LOCK TABLE monthly_rollups IN EXCLUSIVE MODE;
+DELETE FROM monthly_rollups;
+DELETE FROM rollup_dirty_months;
+
+INSERT INTO monthly_rollups (mois, type_dossier, dossiers_ouverts, dossiers_clotures, emoluments, debours)
+SELECT mois, type_dossier, sum(ouverts), sum(clotures), sum(emoluments), sum(debours)
+FROM (
+    SELECT to_char(date_ouverture, 'YYYY-MM') AS mois, coalesce(type_dossier, '') AS type_dossier,
+           count(*) AS ouverts, 0 AS clotures, 0 AS emoluments, 0 AS debours
+    FROM dossiers
+    WHERE date_ouverture IS NOT NULL
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT to_char(h.date_changement, 'YYYY-MM'), coalesce(d.type_dossier, ''),
+           0, count(*), coalesce(sum(d.emoluments), 0), coalesce(sum(d.debours), 0)
+    FROM dossier_historique h
+    JOIN dossiers d ON d.id = h.dossier_id
+    WHERE h.nouveau_statut = 'CLOTURE' AND h.date_changement IS NOT NULL
+    GROUP BY 1, 2
+) AS totaux
+GROUP BY mois, type_dossier;
+
+INSERT INTO rollup_watermarks (name, refreshed_at) VALUES ('monthly', now())
+ON CONFLICT (name) DO UPDATE SET refreshed_at = excluded.refreshed_at;
+
+ANALYZE monthly_rollups;
+ANALYZE dossier_historique;
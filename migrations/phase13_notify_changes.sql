@@ -0,0 +1,43 @@
+-- Change notifications for the other server processes
+-- Date: 2026-10-18
+-- Purpose: Every committed change to dossiers, actes, documents and formalites is
+-- announced on the agen_ohada_changes channel ({"table", "id", "dossier_id", "statut",
+-- "ancien_statut", "origin"});
+-- each server process LISTENs and refreshes the open pages concerned, no polling.
+
+-- Triggers (same DDL as src/utils/notify_bus.py)
+CREATE OR REPLACE FUNCTION agen_notify_change() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        data jsonb;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN data := to_jsonb(OLD); ELSE data := to_jsonb(NEW); END IF;
+        PERFORM pg_notify('agen_ohada_changes', json_build_object(
+            'table', TG_TABLE_NAME,
+            'id', data->'id',
+            'dossier_id', data->'dossier_id',
+            'statut', data->'statut',
+            'ancien_statut', CASE WHEN TG_OP = 'UPDATE' THEN to_jsonb(OLD)->'statut' END,
+            'origin', current_setting('agen_ohada.origin', true)
+        )::text);
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_notify_change ON dossiers;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
+
+DROP TRIGGER IF EXISTS trg_notify_change ON actes;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON actes
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
+
+DROP TRIGGER IF EXISTS trg_notify_change ON documents;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON documents
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
+
+DROP TRIGGER IF EXISTS trg_notify_change ON formalites;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON formalites
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
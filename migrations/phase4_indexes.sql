@@ -0,0 +1,30 @@
+-- Index pack for the list, search and picker screens
+-- Date: 2026-10-18
+-- Purpose: Cover the filters, orderings and '%term%' searches issued by the pages
+
+-- 1. Trigram support for LIKE '%term%'
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- 2. Dossier list: status / type filters, most recent first
+CREATE INDEX IF NOT EXISTS idx_dossiers_date_ouverture ON dossiers(date_ouverture DESC);
+CREATE INDEX IF NOT EXISTS idx_dossiers_statut_type ON dossiers(statut, type_dossier, date_ouverture DESC);
+CREATE INDEX IF NOT EXISTS idx_dossiers_type ON dossiers(type_dossier, date_ouverture DESC);
+
+-- 3. Dossier list search (numéro, intitulé)
+CREATE INDEX IF NOT EXISTS idx_dossiers_numero_trgm ON dossiers USING gin (numero_dossier gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_dossiers_intitule_trgm ON dossiers USING gin (intitule gin_trgm_ops);
+
+-- 4. Client picker search (nom, prénom, email)
+CREATE INDEX IF NOT EXISTS idx_clients_nom_trgm ON clients USING gin (nom gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clients_prenom_trgm ON clients USING gin (prenom gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clients_email_trgm ON clients USING gin (email gin_trgm_ops);
+
+-- 5. Foreign key not covered by the (dossier_id, client_id) primary key
+CREATE INDEX IF NOT EXISTS idx_dossier_parties_client ON dossier_parties(client_id);
+
+ANALYZE dossiers;
+ANALYZE clients;
+ANALYZE dossier_parties;
+
+-- Display confirmation
+SELECT 'Phase 4 index migration completed successfully!' AS status;
@@ -0,0 +1,21 @@
+-- Keyset pagination of the dossier list
+-- Date: 2026-10-18
+-- Purpose: Page the list by (date_ouverture, id) so the first screen does not depend on the table size
+
+-- 1. The keyset must be total: no dossier without an opening date
+UPDATE dossiers SET date_ouverture = COALESCE(created_at::date, CURRENT_DATE) WHERE date_ouverture IS NULL;
+ALTER TABLE dossiers ALTER COLUMN date_ouverture SET DEFAULT CURRENT_DATE;
+ALTER TABLE dossiers ALTER COLUMN date_ouverture SET NOT NULL;
+
+-- 2. Extend the list indexes with id, the tie-breaker of the keyset
+DROP INDEX IF EXISTS idx_dossiers_date_ouverture;
+DROP INDEX IF EXISTS idx_dossiers_statut_type;
+DROP INDEX IF EXISTS idx_dossiers_type;
+CREATE INDEX idx_dossiers_date_ouverture ON dossiers(date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_statut_type ON dossiers(statut, type_dossier, date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_type ON dossiers(type_dossier, date_ouverture DESC, id DESC);
+
+ANALYZE dossiers;
+
+-- Display confirmation
+SELECT 'Phase 5 migration completed successfully!' AS status;
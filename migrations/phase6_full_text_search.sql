@@ -0,0 +1,29 @@
+-- French full-text search on dossiers
+-- Date: 2026-10-18
+-- Purpose: Accent- and case-insensitive, stemmed and ranked search over numéro, intitulé, type and description
+
+-- 1. unaccent inside a French text search configuration
+CREATE EXTENSION IF NOT EXISTS unaccent;
+DO $$ BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'french_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = french);
+        ALTER TEXT SEARCH CONFIGURATION french_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+    END IF;
+END $$;
+
+-- 2. Search document maintained by PostgreSQL (numéro and intitulé weigh most)
+ALTER TABLE dossiers ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('french_unaccent', coalesce(numero_dossier, '')), 'A') ||
+    setweight(to_tsvector('french_unaccent', coalesce(intitule, '')), 'A') ||
+    setweight(to_tsvector('french_unaccent', coalesce(type_dossier, '')), 'B') ||
+    setweight(to_tsvector('french_unaccent', coalesce(description, '')), 'C')
+) STORED;
+
+-- 3. GIN index
+CREATE INDEX IF NOT EXISTS idx_dossiers_search ON dossiers USING gin (search_vector);
+
+ANALYZE dossiers;
+
+-- Display confirmation
+SELECT 'Phase 6 migration completed successfully!' AS status;
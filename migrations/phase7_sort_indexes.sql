@@ -0,0 +1,13 @@
+-- Sort options of the dossier list
+-- Date: 2026-10-18
+-- Purpose: One (sort key, id) index per sort of the list page, so every sort is read
+-- in index order and paginated with a keyset cursor instead of sorting the table
+
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_numero ON dossiers(numero_dossier, id);
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_intitule ON dossiers(intitule, id);
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_statut ON dossiers((coalesce(statut, '')), id);
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_responsable ON dossiers((coalesce(responsable_id, 0)), id);
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_montant_acte ON dossiers((coalesce(montant_acte, 0)) DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_dossiers_sort_emoluments ON dossiers((coalesce(emoluments, 0)) DESC, id DESC);
+
+ANALYZE dossiers;
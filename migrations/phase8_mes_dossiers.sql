@@ -0,0 +1,9 @@
+-- "Mes dossiers" view of the dossier list
+-- Date: 2026-10-18
+-- Purpose: Serve the per-clerk default list (responsable_id = current user), with or
+-- without a status filter, most recent first
+
+CREATE INDEX IF NOT EXISTS idx_dossiers_responsable
+    ON dossiers(responsable_id, statut, date_ouverture DESC, id DESC);
+
+ANALYZE dossiers;
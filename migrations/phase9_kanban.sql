@@ -0,0 +1,8 @@
+-- Kanban board of dossiers by status
+-- Date: 2026-10-18
+-- Purpose: Each column pages through one status most recent first and counts it;
+-- idx_dossiers_statut_type cannot serve that order when no type is chosen
+
+CREATE INDEX IF NOT EXISTS idx_dossiers_statut_date ON dossiers(statut, date_ouverture DESC, id DESC);
+
+ANALYZE dossiers;
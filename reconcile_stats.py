@@ -0,0 +1,26 @@
+"""
+Reconciliation job for the dashboard counters: rebuilds stats_counters from
+dossiers and actes and reports the counters that had drifted. Run it
+periodically, e.g. nightly from cron:
+
+    0 3 * * * cd /opt/agen-ohada && python reconcile_stats.py
+"""
+from src.database import session_scope
+from src.repositories.stats import reconcile_stats_counters
+
+def run_reconciliation():
+    try:
+        with session_scope("reconcile_stats") as db:
+            drifted = reconcile_stats_counters(db)
+        
+        if drifted:
+            print(f"[SUCCESS] stats_counters rebuilt, {drifted} counter(s) repaired")
+        else:
+            print("[SUCCESS] stats_counters rebuilt, no drift")
+        
+    except Exception as e:
+        print(f"[ERROR] Reconciliation failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_reconciliation()
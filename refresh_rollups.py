@@ -0,0 +1,29 @@
+"""
+Refresh job for the monthly rollups read by the dashboard charts: recomputes
+the months queued by the triggers since the last refresh. The server already
+does it every ROLLUP_REFRESH_INTERVAL seconds; run this from cron when that is
+disabled. --full rebuilds every month (e.g. after restoring a backup):
+
+    */5 * * * * cd /opt/agen-ohada && python refresh_rollups.py
+    0 4 * * 0 cd /opt/agen-ohada && python refresh_rollups.py --full
+"""
+import sys
+from src.database import session_scope
+from src.repositories.rollups import refresh_monthly_rollups
+
+def run_refresh(full: bool = False):
+    try:
+        with session_scope("refresh_rollups") as db:
+            months = refresh_monthly_rollups(db, full=full)
+        
+        if months:
+            print(f"[SUCCESS] monthly_rollups refreshed: {', '.join(months)}")
+        else:
+            print("[SUCCESS] monthly_rollups already up to date")
+        
+    except Exception as e:
+        print(f"[ERROR] Refresh failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_refresh(full="--full" in sys.argv[1:])
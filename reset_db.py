@@ -5,30 +5,24 @@ import psycopg2
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
-# Paramètres de connexion
-DB_HOST = "localhost"
-DB_PORT = 5432
-DB_USER = "postgres"
-DB_PASSWORD = "Dcadmin01"
-DB_NAME = "agen_ohada_db"
+# Paramètres de connexion (variables DB_* / DATABASE_URL, voir .env)
+from src.database import connection_params, Base, engine, init_schema
 
 def reset_database():
     """Supprime et recrée toutes les tables"""
     try:
         # Connexion à la base de données
-        conn = psycopg2.connect(
-            host=DB_HOST,
-            port=DB_PORT,
-            user=DB_USER,
-            password=DB_PASSWORD,
-            database=DB_NAME
-        )
+        conn = psycopg2.connect(**connection_params())
         cursor = conn.cursor()
         
         print("🗑️  Suppression des tables existantes...")
         
         # Supprimer toutes les tables dans le bon ordre (contraintes FK)
         drop_tables = """
+        DROP TABLE IF EXISTS rollup_watermarks CASCADE;
+        DROP TABLE IF EXISTS rollup_dirty_months CASCADE;
+        DROP TABLE IF EXISTS monthly_rollups CASCADE;
+        DROP TABLE IF EXISTS stats_counters CASCADE;
         DROP TABLE IF EXISTS compta_mouvements CASCADE;
         DROP TABLE IF EXISTS compta_ecritures CASCADE;
         DROP TABLE IF EXISTS compta_comptes CASCADE;
@@ -70,7 +64,13 @@ if __name__ == "__main__":
     print("🚀 Réinitialisation de la base de données AGEN-OHADA\n")
     print("⚠️  ATTENTION: Cette opération va SUPPRIMER toutes les données!\n")
     
-    if reset_database():
+    if engine.dialect.name != "postgresql":
+        # Base embarquée (SQLite) : on repart des modèles
+        import src.models  # noqa: F401
+        Base.metadata.drop_all(bind=engine)
+        init_schema()
+        print(f"\n✅ Réinitialisation terminée sur {engine.url}")
+    elif reset_database():
         print("\n✅ Réinitialisation terminée avec succès!")
     else:
         print("\n❌ Échec de la réinitialisation.")
@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 10: dashboard indexes
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 10 migration (Dashboard)...")
+        
+        with open('migrations/phase10_dashboard.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 10 migration completed successfully!")
+        print("   - Created idx_actes_statut and idx_formalites_statut")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 11: dashboard counters maintained by triggers
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 11 migration (Stats counters)...")
+        
+        with open('migrations/phase11_stats_counters.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 11 migration completed successfully!")
+        print("   - Created stats_counters, its triggers on dossiers and actes, and filled it")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
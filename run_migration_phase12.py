@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 12: monthly rollups for the dashboard charts
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 12 migration (Monthly rollups)...")
+        
+        with open('migrations/phase12_monthly_rollups.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 12 migration completed successfully!")
+        print("   - Created monthly_rollups, its refresh queue and triggers, and filled it")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
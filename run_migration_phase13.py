@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 13: change notifications between server processes
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 13 migration (Change notifications)...")
+        
+        with open('migrations/phase13_notify_changes.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 13 migration completed successfully!")
+        print("   - Created the NOTIFY triggers on dossiers, actes, documents and formalites")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
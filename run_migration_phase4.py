@@ -0,0 +1,34 @@
+"""
+Migration script for Phase 4: index pack (composite, trigram and foreign-key indexes)
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 4 migration (Indexes)...")
+        
+        with open('migrations/phase4_indexes.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 4 migration completed successfully!")
+        print("   - Enabled pg_trgm")
+        print("   - Added status/type/date indexes on dossiers")
+        print("   - Added trigram indexes for dossier and client searches")
+        print("   - Added dossier_parties(client_id) index")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
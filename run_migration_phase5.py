@@ -0,0 +1,32 @@
+"""
+Migration script for Phase 5: keyset pagination of the dossier list
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 5 migration (Keyset pagination)...")
+        
+        with open('migrations/phase5_keyset_pagination.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 5 migration completed successfully!")
+        print("   - Made dossiers.date_ouverture NOT NULL")
+        print("   - Rebuilt the list indexes on (date_ouverture, id)")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,32 @@
+"""
+Migration script for Phase 6: French full-text search on dossiers
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 6 migration (Full-text search)...")
+        
+        with open('migrations/phase6_full_text_search.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 6 migration completed successfully!")
+        print("   - Created the french_unaccent search configuration")
+        print("   - Added dossiers.search_vector and its GIN index")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 7: sort indexes of the dossier list
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 7 migration (Sort indexes)...")
+        
+        with open('migrations/phase7_sort_indexes.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 7 migration completed successfully!")
+        print("   - Created one (sort key, id) index per sort of the dossier list")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 8: "mes dossiers" index
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 8 migration (Mes dossiers)...")
+        
+        with open('migrations/phase8_mes_dossiers.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 8 migration completed successfully!")
+        print("   - Created idx_dossiers_responsable (responsable_id, statut, date_ouverture)")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
@@ -0,0 +1,31 @@
+"""
+Migration script for Phase 9: kanban board index
+"""
+import psycopg2
+from src.database import connection_params
+
+def run_migration():
+    try:
+        conn = psycopg2.connect(**connection_params())
+        conn.autocommit = True
+        cursor = conn.cursor()
+        
+        print("[INFO] Running Phase 9 migration (Kanban)...")
+        
+        with open('migrations/phase9_kanban.sql', 'r', encoding='utf-8') as f:
+            sql_script = f.read()
+        
+        cursor.execute(sql_script)
+        
+        print("[SUCCESS] Phase 9 migration completed successfully!")
+        print("   - Created idx_dossiers_statut_date (statut, date_ouverture, id)")
+        
+        cursor.close()
+        conn.close()
+        
+    except Exception as e:
+        print(f"[ERROR] Migration failed: {e}")
+        raise
+
+if __name__ == "__main__":
+    run_migration()
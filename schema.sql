@@ -37,7 +37,7 @@ CREATE TABLE IF NOT EXISTS dossiers (
     intitule VARCHAR(200) NOT NULL,
     type_dossier VARCHAR(50), -- Vente, Succession, etc.
     statut VARCHAR(30) DEFAULT 'OUVERT' CHECK (statut IN ('OUVERT', 'INSTRUCTION', 'SIGNATURE', 'FORMALITE', 'CLOTURE', 'ARCHIVE')),
-    date_ouverture DATE DEFAULT CURRENT_DATE,
+    date_ouverture DATE NOT NULL DEFAULT CURRENT_DATE,
     date_cloture DATE,
     responsable_id INTEGER REFERENCES users(id),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
@@ -111,3 +111,150 @@ CREATE TABLE IF NOT EXISTS formalites (
 CREATE INDEX idx_dossiers_numero ON dossiers(numero_dossier);
 CREATE INDEX idx_clients_nom ON clients(nom);
 CREATE INDEX idx_actes_dossier ON actes(dossier_id);
+CREATE INDEX idx_actes_statut ON actes(statut);
+CREATE INDEX idx_formalites_statut ON formalites(statut);
+
+-- Index des écrans de liste et de recherche (voir migrations/phase4_indexes.sql)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX idx_dossiers_date_ouverture ON dossiers(date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_statut_type ON dossiers(statut, type_dossier, date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_statut_date ON dossiers(statut, date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_type ON dossiers(type_dossier, date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_numero_trgm ON dossiers USING gin (numero_dossier gin_trgm_ops);
+CREATE INDEX idx_dossiers_intitule_trgm ON dossiers USING gin (intitule gin_trgm_ops);
+CREATE INDEX idx_dossiers_responsable ON dossiers(responsable_id, statut, date_ouverture DESC, id DESC);
+CREATE INDEX idx_dossiers_sort_numero ON dossiers(numero_dossier, id);
+CREATE INDEX idx_dossiers_sort_intitule ON dossiers(intitule, id);
+CREATE INDEX idx_dossiers_sort_statut ON dossiers((coalesce(statut, '')), id);
+CREATE INDEX idx_dossiers_sort_responsable ON dossiers((coalesce(responsable_id, 0)), id);
+CREATE INDEX idx_dossiers_sort_montant_acte ON dossiers((coalesce(montant_acte, 0)) DESC, id DESC);
+CREATE INDEX idx_dossiers_sort_emoluments ON dossiers((coalesce(emoluments, 0)) DESC, id DESC);
+CREATE INDEX idx_clients_nom_trgm ON clients USING gin (nom gin_trgm_ops);
+CREATE INDEX idx_clients_prenom_trgm ON clients USING gin (prenom gin_trgm_ops);
+CREATE INDEX idx_clients_email_trgm ON clients USING gin (email gin_trgm_ops);
+CREATE INDEX idx_dossier_parties_client ON dossier_parties(client_id);
+
+-- Recherche plein texte en français sur les dossiers (voir migrations/phase6_full_text_search.sql)
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE TEXT SEARCH CONFIGURATION french_unaccent (COPY = french);
+ALTER TEXT SEARCH CONFIGURATION french_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+ALTER TABLE dossiers ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('french_unaccent', coalesce(numero_dossier, '')), 'A') ||
+    setweight(to_tsvector('french_unaccent', coalesce(intitule, '')), 'A') ||
+    setweight(to_tsvector('french_unaccent', coalesce(type_dossier, '')), 'B') ||
+    setweight(to_tsvector('french_unaccent', coalesce(description, '')), 'C')
+) STORED;
+CREATE INDEX idx_dossiers_search ON dossiers USING gin (search_vector);
+
+-- Compteurs du tableau de bord tenus à jour par triggers (voir migrations/phase11_stats_counters.sql)
+CREATE TABLE IF NOT EXISTS stats_counters (
+    dimension VARCHAR(30) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    emoluments DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    debours DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (dimension, key)
+);
+
+CREATE OR REPLACE FUNCTION stats_counters_bump(dim text, k text, n integer, emol numeric, deb numeric)
+        RETURNS void LANGUAGE sql AS $$
+        INSERT INTO stats_counters (dimension, key, count, emoluments, debours) VALUES (dim, k, n, emol, deb)
+        ON CONFLICT (dimension, key) DO UPDATE SET
+            count = stats_counters.count + excluded.count,
+            emoluments = stats_counters.emoluments + excluded.emoluments,
+            debours = stats_counters.debours + excluded.debours
+        $$;
+
+CREATE OR REPLACE FUNCTION stats_counters_dossiers() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stats_counters_bump('statut', coalesce(OLD.statut, ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('type', coalesce(OLD.type_dossier, ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('responsable', coalesce(CAST(OLD.responsable_id AS TEXT), ''), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+            PERFORM stats_counters_bump('mois', to_char(OLD.date_ouverture, 'YYYY-MM'), -1, -coalesce(OLD.emoluments, 0), -coalesce(OLD.debours, 0));
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stats_counters_bump('statut', coalesce(NEW.statut, ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('type', coalesce(NEW.type_dossier, ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('responsable', coalesce(CAST(NEW.responsable_id AS TEXT), ''), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+            PERFORM stats_counters_bump('mois', to_char(NEW.date_ouverture, 'YYYY-MM'), +1, +coalesce(NEW.emoluments, 0), +coalesce(NEW.debours, 0));
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_stats_counters ON dossiers;
+
+CREATE TRIGGER trg_stats_counters AFTER INSERT OR DELETE OR UPDATE OF statut, type_dossier, responsable_id, date_ouverture, emoluments, debours ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_dossiers();
+
+CREATE OR REPLACE FUNCTION stats_counters_actes() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM stats_counters_bump('acte_statut', coalesce(OLD.statut, ''), -1, 0, 0);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM stats_counters_bump('acte_statut', coalesce(NEW.statut, ''), +1, 0, 0);
+        END IF;
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_stats_counters ON actes;
+
+CREATE TRIGGER trg_stats_counters AFTER INSERT OR DELETE OR UPDATE OF statut ON actes
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_actes();
+
+-- Cumuls mensuels lus par les graphiques du tableau de bord (voir migrations/phase12_monthly_rollups.sql,
+-- qui pose aussi les triggers sur dossiers et dossier_historique créée par la phase 2)
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    mois VARCHAR(7) NOT NULL,
+    type_dossier VARCHAR(50) NOT NULL,
+    dossiers_ouverts INTEGER NOT NULL DEFAULT 0,
+    dossiers_clotures INTEGER NOT NULL DEFAULT 0,
+    emoluments DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    debours DECIMAL(15, 2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (mois, type_dossier)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_dirty_months (
+    id SERIAL PRIMARY KEY,
+    mois VARCHAR(7) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    name VARCHAR(50) PRIMARY KEY,
+    refreshed_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Notifications de modification entre processus serveur (voir migrations/phase13_notify_changes.sql,
+-- qui pose aussi le trigger de la table documents créée par la phase 2)
+CREATE OR REPLACE FUNCTION agen_notify_change() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        data jsonb;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN data := to_jsonb(OLD); ELSE data := to_jsonb(NEW); END IF;
+        PERFORM pg_notify('agen_ohada_changes', json_build_object(
+            'table', TG_TABLE_NAME,
+            'id', data->'id',
+            'dossier_id', data->'dossier_id',
+            'statut', data->'statut',
+            'ancien_statut', CASE WHEN TG_OP = 'UPDATE' THEN to_jsonb(OLD)->'statut' END,
+            'origin', current_setting('agen_ohada.origin', true)
+        )::text);
+        RETURN NULL;
+    END $$;
+
+DROP TRIGGER IF EXISTS trg_notify_change ON dossiers;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
+
+DROP TRIGGER IF EXISTS trg_notify_change ON actes;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON actes
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
+
+DROP TRIGGER IF EXISTS trg_notify_change ON formalites;
+
+CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON formalites
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change();
@@ -1,7 +1,22 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, StaticPool
+from contextlib import contextmanager, asynccontextmanager
+import functools
+import inspect
+import logging
 import os
+import threading
+import time
+import traceback
+import weakref
 from dotenv import load_dotenv
+from src.utils import sql_instrumentation, change_events, notify_bus
+
+logger = logging.getLogger("agen_ohada.database")
 
 load_dotenv()
 
@@ -11,12 +26,496 @@ DB_NAME = os.getenv("DB_NAME", "agen_ohada_db")
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "Dcadmin01")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() in ("1", "true", "yes")
+# Compiled statements kept per engine by SQLAlchemy
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1000"))
+# Server-side prepared statements kept per asyncpg connection (0 disables them)
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "256"))
+
+# Optional streaming replica for read-only screens (full SQLAlchemy URL)
+DB_REPLICA_URL = os.getenv("DB_REPLICA_URL", "")
+# Reads go back to the primary when the replica lags more than this (seconds)
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "30"))
+# How often the replica health is re-checked (seconds)
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10"))
+# An unreachable replica fails its connection attempts after this long (seconds)
+DB_REPLICA_CONNECT_TIMEOUT = float(os.getenv("DB_REPLICA_CONNECT_TIMEOUT", "3"))
+
+# When enabled, every session records where it was opened so that sessions
+# which are never closed can be reported (see get_session_stats()).
+DB_DEBUG_SESSIONS = os.getenv("DB_DEBUG_SESSIONS", "False").lower() in ("1", "true", "yes")
+
+# DATABASE_URL overrides the DB_* variables, e.g. "sqlite:///bench.db" to run
+# tests and benchmarks without a PostgreSQL server
+DATABASE_URL = os.getenv("DATABASE_URL") or f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Async driver used for each backend by async Rio event handlers
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _async_url(url):
+    url = make_url(url)
+    return url.set(drivername=_ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+# Same database through an async driver
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+
+def connection_params(database: str = None) -> dict:
+    """
+    psycopg2.connect() keyword arguments for DATABASE_URL, for the scripts
+    talking to PostgreSQL directly (init_db, reset_db, migrations); `database`
+    replaces the URL's database, e.g. "postgres" to create it.
+    """
+    url = make_url(DATABASE_URL)
+    return dict(
+        host=url.host,
+        port=url.port,
+        user=url.username,
+        password=url.password,
+        dbname=database or url.database,
+        **url.query
+    )
+
+
+# --- Session leak detection -------------------------------------------------
+
+_tracker_lock = threading.Lock()
+_open_sessions = {}  # key -> (opened_at, stack)
+_leaked_sessions = 0
+
+
+def _on_session_collected(key):
+    """Called when a tracked session is garbage collected."""
+    global _leaked_sessions
+    with _tracker_lock:
+        entry = _open_sessions.pop(key, None)
+        if entry is None:
+            return
+        _leaked_sessions += 1
+    opened_at, stack = entry
+    logger.warning(
+        "Session leaked: collected without close() after %.1fs. Opened at:\n%s",
+        time.monotonic() - opened_at, stack
+    )
+
+
+class TrackedSession(Session):
+    """
+    Session that registers itself with the leak tracker when DB_DEBUG_SESSIONS
+    is enabled. Tracking is removed as soon as close() is called.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tracking_key = None
+        if DB_DEBUG_SESSIONS:
+            key = id(self)
+            # Skip this frame and sessionmaker.__call__ so the trace ends in app code
+            stack = "".join(traceback.format_stack()[:-2])
+            with _tracker_lock:
+                _open_sessions[key] = (time.monotonic(), stack)
+            self._tracking_key = key
+            weakref.finalize(self, _on_session_collected, key)
+
+    def close(self):
+        if self._tracking_key is not None:
+            with _tracker_lock:
+                _open_sessions.pop(self._tracking_key, None)
+            self._tracking_key = None
+        super().close()
+
+
+def get_session_stats() -> dict:
+    """Return the number of currently open and leaked (never closed) sessions."""
+    with _tracker_lock:
+        return {"open": len(_open_sessions), "leaked": _leaked_sessions}
+
+
+def report_open_sessions(older_than: float = 0.0) -> int:
+    """
+    Log the opening stack trace of every session still open for longer
+    than `older_than` seconds. Returns the number of sessions reported.
+    """
+    now = time.monotonic()
+    with _tracker_lock:
+        entries = [e for e in _open_sessions.values() if now - e[0] >= older_than]
+    for opened_at, stack in entries:
+        logger.warning("Session open for %.1fs. Opened at:\n%s", now - opened_at, stack)
+    return len(entries)
+
+
+# --- Connection pool statistics ---------------------------------------------
+
+_pool_stats_lock = threading.Lock()
+_pool_stats = {}
+
+
+def reset_pool_stats():
+    """Reset the pool counters (e.g. before a load test)."""
+    with _pool_stats_lock:
+        _pool_stats.update(
+            checkouts=0,
+            overflow_checkouts=0,
+            max_overflow_used=0,
+            timeouts=0,
+            invalidations=0,
+            total_wait=0.0,
+            max_wait=0.0,
+        )
+
+
+reset_pool_stats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            with _pool_stats_lock:
+                _pool_stats["timeouts"] += 1
+            raise
+        waited = time.perf_counter() - start
+        overflow = max(self.checkedout() - self.size(), 0)
+        with _pool_stats_lock:
+            _pool_stats["checkouts"] += 1
+            _pool_stats["total_wait"] += waited
+            _pool_stats["max_wait"] = max(_pool_stats["max_wait"], waited)
+            if overflow:
+                _pool_stats["overflow_checkouts"] += 1
+                _pool_stats["max_overflow_used"] = max(_pool_stats["max_overflow_used"], overflow)
+        return connection
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Instrumented pool for the asyncio engine; shares the same counters."""
+
+
+def get_pool_stats() -> dict:
+    """
+    Snapshot of the connection pool: configured limits, current usage and the
+    counters accumulated since startup (or the last reset_pool_stats()).
+    Wait times are in seconds. Counters cover both the sync and async engines,
+    current usage is reported for the sync engine.
+    """
+    pool = engine.pool
+    with _pool_stats_lock:
+        stats = dict(_pool_stats)
+    stats["avg_wait"] = stats["total_wait"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    if isinstance(pool, QueuePool):
+        stats.update(
+            pool_size=pool.size(),
+            max_overflow=DB_MAX_OVERFLOW,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    with _pool_stats_lock:
+        _pool_stats["invalidations"] += 1
+
+
+# --- Engine and sessions ----------------------------------------------------
+
+def _pool_options() -> dict:
+    return dict(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _prepared_url(url):
+    """asyncpg prepares every statement server-side; size its per-connection cache"""
+    url = make_url(url)
+    if url.get_driver_name() == "asyncpg" and "prepared_statement_cache_size" not in url.query:
+        url = url.update_query_dict({"prepared_statement_cache_size": str(DB_PREPARED_STATEMENT_CACHE_SIZE)})
+    return url
+
+
+def _engine_options(url, poolclass) -> dict:
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite":
+        return dict(poolclass=poolclass, query_cache_size=DB_QUERY_CACHE_SIZE, **_pool_options())
+    # Embedded SQLite: connections are shared across Rio's threads, and an
+    # in-memory database only exists for the lifetime of its single connection
+    options = dict(connect_args={"check_same_thread": False}, query_cache_size=DB_QUERY_CACHE_SIZE)
+    if url.database in (None, "", ":memory:"):
+        options["poolclass"] = StaticPool
+    return options
+
+
+def _configure_sqlite(sync_engine):
+    """Let SQLAlchemy drive SQLite transactions so SAVEPOINT works, enforce foreign keys"""
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(sync_engine, "begin")
+    def _on_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL, InstrumentedQueuePool))
+async_engine = create_async_engine(
+    _prepared_url(ASYNC_DATABASE_URL), **_engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncQueuePool)
+)
+if engine.dialect.name == "sqlite":
+    _configure_sqlite(engine)
+    _configure_sqlite(async_engine.sync_engine)
+
+replica_engine = None
+async_replica_engine = None
+if DB_REPLICA_URL:
+    replica_engine = create_engine(
+        DB_REPLICA_URL, connect_args={"connect_timeout": max(1, round(DB_REPLICA_CONNECT_TIMEOUT))},
+        **_engine_options(DB_REPLICA_URL, InstrumentedQueuePool)
+    )
+    async_replica_engine = create_async_engine(
+        _prepared_url(make_url(DB_REPLICA_URL).set(drivername="postgresql+asyncpg")),
+        connect_args={"timeout": DB_REPLICA_CONNECT_TIMEOUT},
+        **_engine_options(DB_REPLICA_URL, InstrumentedAsyncQueuePool)
+    )
+
+for _engine in (engine, async_engine.sync_engine, replica_engine, async_replica_engine and async_replica_engine.sync_engine):
+    if _engine is None:
+        continue
+    event.listen(_engine, "invalidate", _on_invalidate)
+    event.listen(_engine, "soft_invalidate", _on_invalidate)
+    sql_instrumentation.install(_engine)
+
+# expire_on_commit=False keeps loaded rows readable once the scope has closed,
+# pages build their UI from them after the session is returned.
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False,
+    bind=engine, class_=TrackedSession
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False,
+    sync_session_class=TrackedSession
+)
+# Read-only factories, bound to the replica when one is configured
+ReadOnlySessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False,
+    bind=replica_engine or engine, class_=TrackedSession
+)
+AsyncReadOnlySessionLocal = async_sessionmaker(
+    bind=async_replica_engine or async_engine, autoflush=False, expire_on_commit=False,
+    sync_session_class=TrackedSession
+)
+
+# Committed changes are announced per table to the pages caching query results
+change_events.install(Session)
 
 Base = declarative_base()
+# The other server processes learn of them through NOTIFY triggers (PostgreSQL)
+notify_bus.install(Base.metadata, engine, async_engine.sync_engine)
+
+
+def init_schema(bind=None):
+    """
+    Create every table declared in src.models that does not exist yet. Used to
+    bootstrap an embedded database (SQLite) for tests and benchmarks; the
+    PostgreSQL schema is still managed by schema.sql and migrations/.
+    """
+    import src.models  # noqa: F401 - registers every mapper on Base.metadata
+    bind = bind or engine
+    if bind.dialect.name == "postgresql":
+        # Trigram indexes declared on the models need the extension first
+        with bind.begin() as connection:
+            connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    Base.metadata.create_all(bind=bind)
+
+
+@contextmanager
+def session_scope(label: str = None):
+    """
+    Provide a transactional scope around a series of operations.
+
+    Commits on success, rolls back on error and always returns the
+    connection to the pool:
+
+        with session_scope() as db:
+            db.add(obj)
+
+    Statements are attributed to `label` in the SQL statistics, by default
+    "Component.method" of the caller.
+    """
+    label = label or sql_instrumentation.caller_label(2)
+    with sql_instrumentation.interaction(label):
+        db = SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+@asynccontextmanager
+async def async_session_scope(label: str = None):
+    """
+    Async counterpart of session_scope(). Queries are awaited, so a slow
+    statement only suspends the handler that issued it instead of blocking
+    the event loop shared by every connected user:
+
+        async with async_session_scope() as db:
+            result = await db.execute(select(Dossier))
+    """
+    label = label or sql_instrumentation.caller_label(2)
+    with sql_instrumentation.interaction(label):
+        db = AsyncSessionLocal()
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.close()
+
+
+def with_session(handler):
+    """
+    Decorator for Rio event handlers. Runs the handler inside a session scope
+    and passes the session as the `db` keyword argument: a Session for sync
+    handlers, an AsyncSession for `async def` handlers. If the caller already
+    supplies `db`, it is reused.
+    """
+    if inspect.iscoroutinefunction(handler):
+        @functools.wraps(handler)
+        async def async_wrapper(*args, **kwargs):
+            if kwargs.get("db") is not None:
+                return await handler(*args, **kwargs)
+            async with async_session_scope(handler.__qualname__) as db:
+                return await handler(*args, db=db, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if kwargs.get("db") is not None:
+            return handler(*args, **kwargs)
+        with session_scope(handler.__qualname__) as db:
+            return handler(*args, db=db, **kwargs)
+    return wrapper
+
+
+# --- Read replica routing ---------------------------------------------------
+
+# Replay lag in seconds; 0 when the replica has replayed everything it received
+_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+_replica_lock = threading.Lock()
+_replica_status = {"healthy": False, "lag": None, "checked_at": None, "error": None}
+_replica_check_running = False
+
+
+def _replica_check_due() -> bool:
+    checked_at = _replica_status["checked_at"]
+    return checked_at is None or time.monotonic() - checked_at >= DB_REPLICA_CHECK_INTERVAL
+
+
+def check_replica() -> bool:
+    """
+    Probe the replica now (blocking, bounded by DB_REPLICA_CONNECT_TIMEOUT)
+    and record the result. Runs in a background thread, never on the event
+    loop; the lock only guards the status, not the probe.
+    """
+    global _replica_check_running
+    try:
+        with replica_engine.connect() as connection:
+            lag = float(connection.execute(_REPLICA_LAG_SQL).scalar() or 0)
+        healthy, error = lag <= DB_REPLICA_MAX_LAG, None
+    except Exception as e:
+        lag, healthy, error = None, False, str(e)
+    with _replica_lock:
+        if healthy != _replica_status["healthy"] or error:
+            if healthy:
+                logger.info("Read replica available, reads use the replica")
+            else:
+                logger.warning("Read replica unavailable (lag=%s, error=%s), reads fall back to the primary", lag, error)
+        _replica_status.update(healthy=healthy, lag=lag, checked_at=time.monotonic(), error=error)
+        _replica_check_running = False
+    return healthy
+
+
+def replica_available() -> bool:
+    """
+    True when a replica is configured, reachable and lagging less than
+    DB_REPLICA_MAX_LAG according to the last health check. Never blocks:
+    when the result is older than DB_REPLICA_CHECK_INTERVAL a new check is
+    started in the background and the cached result is returned meanwhile
+    (the primary until the first check succeeds).
+    """
+    global _replica_check_running
+    if replica_engine is None:
+        return False
+    with _replica_lock:
+        if _replica_check_due() and not _replica_check_running:
+            _replica_check_running = True
+            threading.Thread(target=check_replica, name="replica-health-check", daemon=True).start()
+        return _replica_status["healthy"]
+
+
+def get_replica_status() -> dict:
+    """Configured flag plus the result of the last replica health check"""
+    with _replica_lock:
+        return {"configured": replica_engine is not None, **_replica_status}
+
+
+@contextmanager
+def read_session_scope(label: str = None, use_replica: bool = True):
+    """
+    Session for read-only screens. Served by the replica when it is healthy,
+    by the primary otherwise (or when `use_replica` is False, e.g. right after
+    the user saved something and must see it). Nothing is ever committed.
+    """
+    label = label or sql_instrumentation.caller_label(2)
+    factory = ReadOnlySessionLocal if use_replica and replica_available() else SessionLocal
+    with sql_instrumentation.interaction(label):
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+@asynccontextmanager
+async def async_read_session_scope(label: str = None, use_replica: bool = True):
+    """Async counterpart of read_session_scope()"""
+    label = label or sql_instrumentation.caller_label(2)
+    factory = AsyncReadOnlySessionLocal if use_replica and replica_available() else AsyncSessionLocal
+    with sql_instrumentation.interaction(label):
+        db = factory()
+        try:
+            yield db
+        finally:
+            await db.close()
+
 
 def get_db():
     db = SessionLocal()
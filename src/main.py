@@ -1,15 +1,23 @@
 from __future__ import annotations
+import asyncio
+import logging
 import rio
 from src.pages.login import LoginPage
 from src.pages.dashboard import DashboardPage
-from src.pages.dossiers import DossierListPage
+from src.pages.dossiers import DossierListPage, prefetch_my_dossiers
 from src.pages.dossier_form import DossierFormPage
+from src.pages.dossier_kanban import DossierKanbanPage
+from src.pages.workload import WorkloadPage
 from src.pages.dossier_detail import DossierDetailPage
 from src.pages.dossier_edit import DossierEditPage
 from src.pages.templates import TemplatesPage
 from src.pages.acte_edit import ActeEditPage
-from src.database import get_db
+from src.database import session_scope, async_session_scope, engine, DATABASE_URL
 from src.models.dossier import Dossier
+from src.repositories.rollups import ROLLUP_REFRESH_INTERVAL, refresh_monthly_rollups
+from src.utils import notify_bus
+
+logger = logging.getLogger("agen_ohada.rollups")
 
 class MainApp(rio.Component):
     """
@@ -18,31 +26,40 @@ class MainApp(rio.Component):
     # Session state
     is_authenticated: bool = False
     current_user: str = ""
+    current_user_id: int = None
     current_page: str = "dashboard"
     current_dossier_id: int = None
     current_acte_id: int = None
+    # Set when the page is opened right after a save: it loads from the
+    # primary, the replica may not have replayed the user's own write yet
+    after_write: bool = False
 
     
     # Delete confirmation state
     show_delete_dialog: bool = False
     dossier_to_delete_id: int = None
     
-    def on_login_success(self, username: str):
+    def on_login_success(self, username: str, user_id: int):
         """Called when user successfully logs in"""
         self.is_authenticated = True
         self.current_user = username
+        self.current_user_id = user_id
         print(f"[INFO] User {username} logged in successfully")
+        # Warm "mes dossiers" while the dashboard is shown
+        self.session.create_task(prefetch_my_dossiers(user_id))
     
     def on_logout(self):
         """Called when user logs out"""
         self.is_authenticated = False
         self.current_user = ""
+        self.current_user_id = None
         self.current_page = "dashboard"
         print("[INFO] User logged out")
         
-    def navigate_to(self, page: str, dossier_id: int = None, acte_id: int = None):
+    def navigate_to(self, page: str, dossier_id: int = None, acte_id: int = None, after_write: bool = False):
         """Navigate to a specific page"""
         self.current_page = page
+        self.after_write = after_write
         if dossier_id is not None:
              self.current_dossier_id = dossier_id
         if acte_id is not None:
@@ -59,21 +76,21 @@ class MainApp(rio.Component):
     def on_delete_confirm(self):
         """Confirm and execute deletion"""
         try:
-            db = next(get_db())
-            dossier = db.query(Dossier).filter(Dossier.id == self.dossier_to_delete_id).first()
-            
-            if dossier:
-                # Soft delete: change status to ARCHIVE
-                dossier.statut = "ARCHIVE"
-                db.commit()
-                print(f"✅ Dossier {dossier.numero_dossier} archived successfully")
+            with session_scope() as db:
+                dossier = db.query(Dossier).filter(Dossier.id == self.dossier_to_delete_id).first()
                 
-                # Navigate back to list
-                self.navigate_to("dossiers")
+                if dossier:
+                    # Soft delete: change status to ARCHIVE
+                    dossier.statut = "ARCHIVE"
+                    db.commit()
+                    print(f"✅ Dossier {dossier.numero_dossier} archived successfully")
+                    
+                    # Navigate back to list
+                    self.navigate_to("dossiers", after_write=True)
             
         except Exception as e:
+            # session_scope() has already rolled back
             print(f"❌ Error deleting dossier: {str(e)}")
-            db.rollback()
         finally:
             self.show_delete_dialog = False
             self.dossier_to_delete_id = None
@@ -99,17 +116,28 @@ class MainApp(rio.Component):
             content = DashboardPage()
         elif self.current_page == "dossiers":
             content = DossierListPage(
+                current_user_id=self.current_user_id,
+                use_replica=not self.after_write,
                 on_new_dossier=lambda: self.navigate_to("dossier_new"),
                 on_view_dossier=lambda dossier_id: self.navigate_to("dossier_detail", dossier_id)
             )
+        elif self.current_page == "kanban":
+            content = DossierKanbanPage(
+                current_user_id=self.current_user_id,
+                on_view_dossier=lambda dossier_id: self.navigate_to("dossier_detail", dossier_id)
+            )
+        elif self.current_page == "workload":
+            content = WorkloadPage()
         elif self.current_page == "dossier_new":
             content = DossierFormPage(
+                responsable_id=self.current_user_id,
                 on_cancel=lambda: self.navigate_to("dossiers"),
-                on_success=lambda: self.navigate_to("dossiers")
+                on_success=lambda: self.navigate_to("dossiers", after_write=True)
             )
         elif self.current_page == "dossier_detail":
             content = DossierDetailPage(
                 dossier_id=self.current_dossier_id,
+                use_replica=not self.after_write,
                 on_back=lambda: self.navigate_to("dossiers"),
                 on_edit=lambda dossier_id: self.navigate_to("dossier_edit", dossier_id),
                 on_delete=self.on_delete_request,
@@ -121,20 +149,20 @@ class MainApp(rio.Component):
                 dossier_id=self.current_dossier_id,
                 current_username=self.current_user,
                 on_cancel=lambda: self.navigate_to("dossier_detail", self.current_dossier_id),
-                on_success=lambda dossier_id: self.navigate_to("dossier_detail", dossier_id)
+                on_success=lambda dossier_id: self.navigate_to("dossier_detail", dossier_id, after_write=True)
             )
         elif self.current_page == "acte_new":
             content = ActeEditPage(
                 dossier_id=self.current_dossier_id,
                 on_cancel=lambda: self.navigate_to("dossier_detail", self.current_dossier_id),
-                on_success=lambda: self.navigate_to("dossier_detail", self.current_dossier_id)
+                on_success=lambda: self.navigate_to("dossier_detail", self.current_dossier_id, after_write=True)
             )
         elif self.current_page == "acte_edit":
             content = ActeEditPage(
                 dossier_id=self.current_dossier_id,
                 acte_id=self.current_acte_id,
                 on_cancel=lambda: self.navigate_to("dossier_detail", self.current_dossier_id),
-                on_success=lambda: self.navigate_to("dossier_detail", self.current_dossier_id)
+                on_success=lambda: self.navigate_to("dossier_detail", self.current_dossier_id, after_write=True)
             )
         elif self.current_page == "templates":
             content = TemplatesPage()
@@ -162,6 +190,18 @@ class MainApp(rio.Component):
                         style="major" if self.current_page.startswith("dossier") else "colored-text",
                         on_press=lambda: self.navigate_to("dossiers")
                     ),
+                    rio.Button(
+                        "Suivi (Kanban)", 
+                        icon="material/view_kanban", 
+                        style="major" if self.current_page == "kanban" else "colored-text",
+                        on_press=lambda: self.navigate_to("kanban")
+                    ),
+                    rio.Button(
+                        "Charge de travail", 
+                        icon="material/assignment_ind", 
+                        style="major" if self.current_page == "workload" else "colored-text",
+                        on_press=lambda: self.navigate_to("workload")
+                    ),
                     rio.Button(
                         "Modèles", 
                         icon="material/description", 
@@ -261,10 +301,40 @@ class MainApp(rio.Component):
         
         return main_layout
 
+async def refresh_rollups():
+    # Committed on the event loop: the "monthly_rollups" notification reaches
+    # the open dashboards on the loop thread, where they can schedule reloads
+    async with async_session_scope("refresh_rollups") as db:
+        return await db.run_sync(refresh_monthly_rollups)
+
+
+async def refresh_rollups_periodically():
+    """Keep the chart rollups current while the server runs"""
+    while True:
+        try:
+            await refresh_rollups()
+        except Exception:
+            logger.exception("Monthly rollups refresh failed")
+        await asyncio.sleep(ROLLUP_REFRESH_INTERVAL)
+
+
+_background_tasks = set()
+
+
+def on_app_start(_app: rio.App):
+    loop = asyncio.get_running_loop()
+    if ROLLUP_REFRESH_INTERVAL > 0:
+        _background_tasks.add(loop.create_task(refresh_rollups_periodically()))
+    if engine.dialect.name == "postgresql":
+        # One listener per server process republishes the other processes' changes
+        _background_tasks.add(loop.create_task(notify_bus.listen(DATABASE_URL)))
+
+
 # Create the Rio app
 app = rio.App(
     build=MainApp,
-    name="AGEN-OHADA"
+    name="AGEN-OHADA",
+    on_app_start=on_app_start
 )
 
 if __name__ == "__main__":
@@ -3,3 +3,6 @@ from src.models.client import Client
 from src.models.dossier import Dossier, DossierParties
 from src.models.template import Template
 from src.models.acte import Acte
+from src.models.formalite import Formalite
+from src.models.stats import StatsCounter
+from src.models.rollup import MonthlyRollup, RollupDirtyMonth, RollupWatermark
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 from datetime import datetime
@@ -22,6 +22,11 @@ class Acte(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("idx_actes_dossier", dossier_id),
+        Index("idx_actes_statut", statut),
+    )
+
     # Relationships
     dossier = relationship("Dossier", back_populates="actes")
     template = relationship("Template")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime
+from sqlalchemy import Column, Integer, String, Date, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 from datetime import datetime
@@ -19,3 +19,10 @@ class Client(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     dossier_associations = relationship("DossierParties", back_populates="client")
+
+    # pg_trgm indexes for the '%term%' client picker search (migrations/phase4_indexes.sql)
+    __table_args__ = tuple(
+        Index(f"idx_clients_{column}_trgm", column,
+              postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}).ddl_if(dialect="postgresql")
+        for column in ("nom", "prenom", "email")
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Numeric, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, DateTime, Numeric, Text, Index, DDL, event, func, literal_column
 from sqlalchemy.orm import relationship
 from src.database import Base
 from datetime import datetime
@@ -11,7 +11,7 @@ class Dossier(Base):
     intitule = Column(String, nullable=False)
     type_dossier = Column(String, nullable=True)
     statut = Column(String, default="OUVERT")
-    date_ouverture = Column(Date, default=datetime.utcnow)
+    date_ouverture = Column(Date, default=datetime.utcnow, nullable=False)
     date_cloture = Column(Date, nullable=True)
     responsable_id = Column(Integer, ForeignKey("users.id"))
     
@@ -23,6 +23,30 @@ class Dossier(Base):
     
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Same indexes as migrations/phase4_indexes.sql, phase5_keyset_pagination.sql,
+    # phase7_sort_indexes.sql, phase8_mes_dossiers.sql and phase9_kanban.sql;
+    # (date_ouverture, id) is the keyset of the paginated dossier list, the (key, id)
+    # indexes serve its other sort options, idx_dossiers_responsable the per-clerk
+    # "mes dossiers" view and idx_dossiers_statut_date the kanban columns
+    __table_args__ = (
+        Index("idx_dossiers_date_ouverture", date_ouverture.desc(), id.desc()),
+        Index("idx_dossiers_statut_type", statut, type_dossier, date_ouverture.desc(), id.desc()),
+        Index("idx_dossiers_statut_date", statut, date_ouverture.desc(), id.desc()),
+        Index("idx_dossiers_type", type_dossier, date_ouverture.desc(), id.desc()),
+        Index("idx_dossiers_responsable", responsable_id, statut, date_ouverture.desc(), id.desc()),
+        Index("idx_dossiers_sort_numero", numero_dossier, id),
+        Index("idx_dossiers_sort_intitule", intitule, id),
+        Index("idx_dossiers_sort_statut", func.coalesce(statut, literal_column("''")), id),
+        Index("idx_dossiers_sort_responsable", func.coalesce(responsable_id, literal_column("0")), id),
+        Index("idx_dossiers_sort_montant_acte", func.coalesce(montant_acte, literal_column("0")).desc(), id.desc()),
+        Index("idx_dossiers_sort_emoluments", func.coalesce(emoluments, literal_column("0")).desc(), id.desc()),
+        # pg_trgm indexes serve the '%term%' searches of the list page
+        Index("idx_dossiers_numero_trgm", numero_dossier,
+              postgresql_using="gin", postgresql_ops={"numero_dossier": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+        Index("idx_dossiers_intitule_trgm", intitule,
+              postgresql_using="gin", postgresql_ops={"intitule": "gin_trgm_ops"}).ddl_if(dialect="postgresql"),
+    )
+
     responsable = relationship("User", back_populates="dossiers")
     parties_associations = relationship("DossierParties", back_populates="dossier")
     historique = relationship("DossierHistorique", back_populates="dossier", cascade="all, delete-orphan")
@@ -30,6 +54,31 @@ class Dossier(Base):
     actes = relationship("Acte", back_populates="dossier", cascade="all, delete-orphan")
 
 
+# French full-text search, PostgreSQL only (same DDL as migrations/phase6_full_text_search.sql).
+# unaccent is part of the text search configuration, which keeps to_tsvector
+# immutable so it can feed a generated column.
+SEARCH_CONFIG = "french_unaccent"
+SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""DO $$ BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = french);
+            ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, french_stem;
+        END IF;
+    END $$""",
+    f"""ALTER TABLE dossiers ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(numero_dossier, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(intitule, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(type_dossier, '')), 'B') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS idx_dossiers_search ON dossiers USING gin (search_vector)",
+]
+for _statement in SEARCH_DDL:
+    event.listen(Dossier.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+
+
 class DossierParties(Base):
     __tablename__ = "dossier_parties"
 
@@ -37,6 +86,10 @@ class DossierParties(Base):
     client_id = Column(Integer, ForeignKey("clients.id"), primary_key=True)
     role_dans_acte = Column(String, nullable=False)
 
+    __table_args__ = (
+        Index("idx_dossier_parties_client", client_id),
+    )
+
     dossier = relationship("Dossier", back_populates="parties_associations")
     client = relationship("Client", back_populates="dossier_associations")
 
@@ -52,6 +105,12 @@ class DossierHistorique(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     commentaire = Column(Text, nullable=True)
 
+    __table_args__ = (
+        Index("idx_dossier_historique_dossier", dossier_id),
+        # Closures by date, read by the monthly rollups (phase12_monthly_rollups.sql)
+        Index("idx_dossier_historique_statut_date", nouveau_statut, date_changement),
+    )
+
     dossier = relationship("Dossier", back_populates="historique")
     user = relationship("User")
 
@@ -67,4 +126,8 @@ class Document(Base):
     date_upload = Column(DateTime, default=datetime.utcnow)
     taille_fichier = Column(Integer, nullable=True)
 
+    __table_args__ = (
+        Index("idx_documents_dossier", dossier_id),
+    )
+
     dossier = relationship("Dossier", back_populates="documents")
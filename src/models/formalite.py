@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Numeric, Index
+from sqlalchemy.orm import relationship
+from src.database import Base
+import enum
+
+class StatutFormalite(str, enum.Enum):
+    A_FAIRE = "A_FAIRE"
+    EN_COURS = "EN_COURS"
+    TERMINEE = "TERMINEE"
+
+# Formalités still awaiting completion (shown on the dashboard)
+STATUTS_FORMALITE_EN_ATTENTE = (StatutFormalite.A_FAIRE.value, StatutFormalite.EN_COURS.value)
+
+class Formalite(Base):
+    """Post-signature formalité of a dossier (enregistrement, publicité foncière, ...), table of schema.sql"""
+    __tablename__ = "formalites"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dossier_id = Column(Integer, ForeignKey("dossiers.id", ondelete="CASCADE"))
+    type_formalite = Column(String(100), nullable=False)
+    date_depot = Column(Date, nullable=True)
+    date_retour = Column(Date, nullable=True)
+    cout_estime = Column(Numeric(12, 2), nullable=True)
+    cout_reel = Column(Numeric(12, 2), nullable=True)
+    reference_externe = Column(String(100), nullable=True)  # Numéro de quittance
+    statut = Column(String(30), default=StatutFormalite.A_FAIRE.value)
+
+    __table_args__ = (
+        Index("idx_formalites_statut", statut),
+    )
+
+    dossier = relationship("Dossier")
@@ -0,0 +1,124 @@
+from sqlalchemy import Column, String, Integer, Numeric, DateTime, DDL, event
+from src.database import Base
+
+
+class MonthlyRollup(Base):
+    """
+    Activity and fees per month and dossier type, the only table read by the
+    dashboard charts. Rebuilt month by month by
+    src.repositories.rollups.refresh_monthly_rollups().
+    """
+    __tablename__ = "monthly_rollups"
+
+    mois = Column(String(7), primary_key=True)  # YYYY-MM
+    type_dossier = Column(String(50), primary_key=True)  # '' when the dossier has no type
+    dossiers_ouverts = Column(Integer, nullable=False, default=0)  # by date_ouverture
+    dossiers_clotures = Column(Integer, nullable=False, default=0)  # by CLOTURE in dossier_historique
+    # Fees booked at clôture
+    emoluments = Column(Numeric(15, 2), nullable=False, default=0)
+    debours = Column(Numeric(15, 2), nullable=False, default=0)
+
+
+class RollupDirtyMonth(Base):
+    """
+    Month whose rollup rows are out of date, queued by the triggers below on
+    every write to dossiers and dossier_historique that can change them, and
+    consumed by the next refresh.
+    """
+    __tablename__ = "rollup_dirty_months"
+
+    id = Column(Integer, primary_key=True)
+    mois = Column(String(7), nullable=False)
+
+
+class RollupWatermark(Base):
+    """Time of the last refresh of a rollup; none yet means the next refresh rebuilds everything"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# Dossier columns feeding the rollups
+ROLLUP_COLUMNS = "type_dossier, date_ouverture, emoluments, debours"
+
+
+def _month(column: str, dialect: str) -> str:
+    if dialect == "postgresql":
+        return f"to_char({column}, 'YYYY-MM')"
+    return f"strftime('%Y-%m', {column})"
+
+
+def _dossier_months(row: str, dialect: str) -> str:
+    """INSERT queuing the opening month of dossier `row` and the months it was closed in"""
+    return f"""INSERT INTO rollup_dirty_months (mois)
+            SELECT {_month(f"{row}.date_ouverture", dialect)}
+            UNION
+            SELECT {_month("h.date_changement", dialect)} FROM dossier_historique h
+            WHERE h.dossier_id = {row}.id AND h.nouveau_statut = 'CLOTURE' AND h.date_changement IS NOT NULL"""
+
+
+def _closure_month(row: str, dialect: str) -> str:
+    return f"INSERT INTO rollup_dirty_months (mois) VALUES ({_month(f'{row}.date_changement', dialect)})"
+
+
+_CLOSURE = "{row}.nouveau_statut = 'CLOTURE' AND {row}.date_changement IS NOT NULL"
+
+
+def _postgresql_ddl() -> list[str]:
+    return [
+        f"""CREATE OR REPLACE FUNCTION rollup_mark_dossier() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            {_dossier_months("OLD", "postgresql")};
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            {_dossier_months("NEW", "postgresql")};
+        END IF;
+        RETURN NULL;
+    END $$""",
+        "DROP TRIGGER IF EXISTS trg_rollup_dirty ON dossiers",
+        f"""CREATE TRIGGER trg_rollup_dirty AFTER INSERT OR DELETE OR UPDATE OF {ROLLUP_COLUMNS} ON dossiers
+        FOR EACH ROW EXECUTE FUNCTION rollup_mark_dossier()""",
+        f"""CREATE OR REPLACE FUNCTION rollup_mark_closure() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' AND {_CLOSURE.format(row="OLD")} THEN
+            {_closure_month("OLD", "postgresql")};
+        END IF;
+        IF TG_OP <> 'DELETE' AND {_CLOSURE.format(row="NEW")} THEN
+            {_closure_month("NEW", "postgresql")};
+        END IF;
+        RETURN NULL;
+    END $$""",
+        "DROP TRIGGER IF EXISTS trg_rollup_dirty ON dossier_historique",
+        """CREATE TRIGGER trg_rollup_dirty AFTER INSERT OR DELETE OR UPDATE ON dossier_historique
+        FOR EACH ROW EXECUTE FUNCTION rollup_mark_closure()""",
+    ]
+
+
+def _sqlite_ddl() -> list[str]:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_dossiers_insert AFTER INSERT ON dossiers BEGIN\n"
+        f"    {_dossier_months('NEW', 'sqlite')};\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_dossiers_delete AFTER DELETE ON dossiers BEGIN\n"
+        f"    {_dossier_months('OLD', 'sqlite')};\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_dossiers_update AFTER UPDATE OF {ROLLUP_COLUMNS} ON dossiers BEGIN\n"
+        f"    {_dossier_months('OLD', 'sqlite')};\n    {_dossier_months('NEW', 'sqlite')};\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_historique_insert AFTER INSERT ON dossier_historique\n"
+        f"    WHEN {_CLOSURE.format(row='NEW')} BEGIN\n    {_closure_month('NEW', 'sqlite')};\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_historique_delete AFTER DELETE ON dossier_historique\n"
+        f"    WHEN {_CLOSURE.format(row='OLD')} BEGIN\n    {_closure_month('OLD', 'sqlite')};\nEND",
+        f"CREATE TRIGGER IF NOT EXISTS trg_rollup_historique_update AFTER UPDATE ON dossier_historique BEGIN\n"
+        f"    INSERT INTO rollup_dirty_months (mois) SELECT {_month('OLD.date_changement', 'sqlite')}"
+        f" WHERE {_CLOSURE.format(row='OLD')};\n"
+        f"    INSERT INTO rollup_dirty_months (mois) SELECT {_month('NEW.date_changement', 'sqlite')}"
+        f" WHERE {_CLOSURE.format(row='NEW')};\nEND",
+    ]
+
+
+# Same trigger DDL as migrations/phase12_monthly_rollups.sql, attached to the
+# metadata like src.models.stats.STATS_DDL
+ROLLUP_DDL = {"postgresql": _postgresql_ddl(), "sqlite": _sqlite_ddl()}
+for _dialect, _statements in ROLLUP_DDL.items():
+    for _statement in _statements:
+        event.listen(Base.metadata, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect=_dialect))
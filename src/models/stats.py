@@ -0,0 +1,114 @@
+from sqlalchemy import Column, String, Integer, Numeric, DDL, event
+from src.database import Base
+
+
+class StatsCounter(Base):
+    """
+    Running totals for the dashboard, one row per (dimension, key): dossiers
+    per statut, type, responsable and opening month, actes per statut. Kept
+    up to date by the triggers below on every write to dossiers and actes,
+    rebuilt by src.repositories.stats.reconcile_stats_counters().
+    """
+    __tablename__ = "stats_counters"
+
+    dimension = Column(String(30), primary_key=True)
+    key = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    # Fees of the dossiers counted (zero for actes)
+    emoluments = Column(Numeric(15, 2), nullable=False, default=0)
+    debours = Column(Numeric(15, 2), nullable=False, default=0)
+
+
+def _month_key(row: str, dialect: str) -> str:
+    if dialect == "postgresql":
+        return f"to_char({row}.date_ouverture, 'YYYY-MM')"
+    return f"strftime('%Y-%m', {row}.date_ouverture)"
+
+
+def counter_keys(table: str, row: str, dialect: str) -> list[tuple[str, str]]:
+    """(dimension, key expression) maintained for a row of `table`, `row` being OLD, NEW or the table"""
+    if table == "actes":
+        return [("acte_statut", f"coalesce({row}.statut, '')")]
+    return [
+        ("statut", f"coalesce({row}.statut, '')"),
+        ("type", f"coalesce({row}.type_dossier, '')"),
+        ("responsable", f"coalesce(CAST({row}.responsable_id AS TEXT), '')"),
+        ("mois", _month_key(row, dialect)),
+    ]
+
+
+def _delta(table: str, row: str, sign: str) -> str:
+    """count, emoluments, debours added to each counter of `row` (sign '+' or '-')"""
+    if table == "actes":
+        return f"{sign}1, 0, 0"
+    return f"{sign}1, {sign}coalesce({row}.emoluments, 0), {sign}coalesce({row}.debours, 0)"
+
+
+# Columns whose update moves a row between counters
+TRACKED_COLUMNS = {
+    "dossiers": "statut, type_dossier, responsable_id, date_ouverture, emoluments, debours",
+    "actes": "statut",
+}
+
+_UPSERT = """INSERT INTO stats_counters (dimension, key, count, emoluments, debours) VALUES ({values})
+        ON CONFLICT (dimension, key) DO UPDATE SET
+            count = stats_counters.count + excluded.count,
+            emoluments = stats_counters.emoluments + excluded.emoluments,
+            debours = stats_counters.debours + excluded.debours"""
+
+
+def _postgresql_ddl() -> list[str]:
+    statements = [
+        f"""CREATE OR REPLACE FUNCTION stats_counters_bump(dim text, k text, n integer, emol numeric, deb numeric)
+        RETURNS void LANGUAGE sql AS $$
+        {_UPSERT.format(values="dim, k, n, emol, deb")}
+        $$"""
+    ]
+    for table, columns in TRACKED_COLUMNS.items():
+        def bumps(row, sign):
+            return "\n".join(
+                f"            PERFORM stats_counters_bump('{dimension}', {key}, {_delta(table, row, sign)});"
+                for dimension, key in counter_keys(table, row, "postgresql")
+            )
+        statements += [
+            f"""CREATE OR REPLACE FUNCTION stats_counters_{table}() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+{bumps("OLD", "-")}
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+{bumps("NEW", "+")}
+        END IF;
+        RETURN NULL;
+    END $$""",
+            f"DROP TRIGGER IF EXISTS trg_stats_counters ON {table}",
+            f"""CREATE TRIGGER trg_stats_counters AFTER INSERT OR DELETE OR UPDATE OF {columns} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION stats_counters_{table}()""",
+        ]
+    return statements
+
+
+def _sqlite_ddl() -> list[str]:
+    statements = []
+    for table, columns in TRACKED_COLUMNS.items():
+        def bumps(row, sign):
+            return "\n".join(
+                "    " + _UPSERT.format(values=f"'{dimension}', {key}, {_delta(table, row, sign)}") + ";"
+                for dimension, key in counter_keys(table, row, "sqlite")
+            )
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_insert AFTER INSERT ON {table} BEGIN\n{bumps('NEW', '+')}\nEND",
+            f"CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_delete AFTER DELETE ON {table} BEGIN\n{bumps('OLD', '-')}\nEND",
+            f"CREATE TRIGGER IF NOT EXISTS trg_stats_{table}_update AFTER UPDATE OF {columns} ON {table} BEGIN\n"
+            f"{bumps('OLD', '-')}\n{bumps('NEW', '+')}\nEND",
+        ]
+    return statements
+
+
+# Same trigger DDL as migrations/phase11_stats_counters.sql. Attached to the
+# metadata so it runs once every table exists; every statement is idempotent.
+STATS_DDL = {"postgresql": _postgresql_ddl(), "sqlite": _sqlite_ddl()}
+for _dialect, _statements in STATS_DDL.items():
+    for _statement in _statements:
+        # DDL() applies %-formatting to its statement
+        event.listen(Base.metadata, "after_create", DDL(_statement.replace("%", "%%")).execute_if(dialect=_dialect))
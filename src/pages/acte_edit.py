@@ -1,11 +1,11 @@
 from __future__ import annotations
 import rio
 from dataclasses import field
-from src.database import SessionLocal
+from src.database import with_session
 from src.models.acte import Acte, StatutActe
-from src.models.dossier import Dossier
-from src.models.template import Template
-from src.utils.template_engine import TemplateEngine
+from src.repositories.actes import generate_acte_content
+from src.repositories.lookups import get_acte, get_dossier
+from src.repositories.templates import TemplateOption, list_template_options
 from datetime import datetime
 
 class ActeEditPage(rio.Component):
@@ -21,7 +21,7 @@ class ActeEditPage(rio.Component):
     
     # Internal State
     acte: Acte = None
-    templates: list[Template] = field(default_factory=list)
+    templates: list[TemplateOption] = field(default_factory=list)
     
     # Form State
     step: int = 1 # 1: Select Template/Metadata, 2: Edit Content
@@ -40,16 +40,15 @@ class ActeEditPage(rio.Component):
         """Called when component is mounted - data already loaded in __post_init__"""
         pass
         
-    def load_data(self):
-        session = SessionLocal()
+    @with_session
+    def load_data(self, db):
         try:
-            # Load Templates for dropdown
-            self.templates = session.query(Template).all()
-            session.expunge_all()
+            # Load Templates for dropdown (id and name only)
+            self.templates = list_template_options(db)
             
             if self.acte_id:
                 # Edit Mode
-                acte = session.query(Acte).get(self.acte_id)
+                acte = get_acte(db, self.acte_id)
                 if acte:
                     self.dossier_id = acte.dossier_id
                     self.form_titre = acte.titre
@@ -59,32 +58,24 @@ class ActeEditPage(rio.Component):
                     self.step = 2 # Jump to editor directly
             elif self.dossier_id:
                 # Create Mode
-                dossier = session.query(Dossier).get(self.dossier_id)
+                dossier = get_dossier(db, self.dossier_id)
                 if dossier:
                     self.form_titre = f"Acte - {dossier.intitule}"
         except Exception as e:
             self.error_message = f"Erreur de chargement: {str(e)}"
-        finally:
-            session.close()
 
-    def on_generate_click(self):
+    @with_session
+    def on_generate_click(self, db):
         """Generate content from template and move to editor"""
         if not self.form_template_id:
             self.error_message = "Veuillez sélectionner un modèle"
             return
             
-        session = SessionLocal()
         try:
-            template = session.query(Template).get(self.form_template_id)
-            dossier = session.query(Dossier).get(self.dossier_id)
+            generated = generate_acte_content(db, self.form_template_id, self.dossier_id)
             
-            if template and dossier:
-                # Prepare Context
-                # For now simple context, later we can enrich with parties info
-                ctx = TemplateEngine.get_dossier_context(dossier)
-                
-                # Merge
-                self.form_contenu = TemplateEngine.merge(template.contenu, ctx)
+            if generated:
+                template, dossier, self.form_contenu = generated
                 
                 # Clean up title if default
                 if self.form_titre == f"Acte - {dossier.intitule}":
@@ -94,19 +85,17 @@ class ActeEditPage(rio.Component):
                 self.error_message = ""
         except Exception as e:
             self.error_message = f"Erreur de génération: {str(e)}"
-        finally:
-            session.close()
 
-    def on_save(self):
+    @with_session
+    async def on_save(self, db):
         if not self.form_titre:
             self.error_message = "Le titre est obligatoire"
             return
             
-        session = SessionLocal()
         try:
             if self.acte_id:
                 # Update
-                acte = session.query(Acte).get(self.acte_id)
+                acte = await db.run_sync(get_acte, self.acte_id)
                 acte.titre = self.form_titre
                 acte.contenu = self.form_contenu
                 acte.statut = self.form_statut
@@ -120,16 +109,14 @@ class ActeEditPage(rio.Component):
                     contenu=self.form_contenu,
                     statut=self.form_statut
                 )
-                session.add(acte)
+                db.add(acte)
                 
-            session.commit()
+            await db.commit()
             if self.on_success:
                 self.on_success()
         except Exception as e:
-            session.rollback()
+            await db.rollback()
             self.error_message = f"Erreur d'enregistrement: {str(e)}"
-        finally:
-            session.close()
 
     def build(self) -> rio.Component:
         if self.step == 1:
@@ -1,5 +1,5 @@
 import rio
-from src.database import get_db
+from src.database import async_session_scope
 from src.models.dossier import Document
 from datetime import datetime
 import os
@@ -55,18 +55,16 @@ class AddDocumentDialog(rio.Component):
                 f.write(file_content)
                 
             # Save to database
-            db = next(get_db())
-            document = Document(
-                dossier_id=self.dossier_id,
-                titre=self.titre,
-                type_document=self.type_document,
-                chemin_fichier=file_path,
-                taille_fichier=self.file.size_in_bytes,
-                date_upload=datetime.utcnow()
-            )
-            
-            db.add(document)
-            db.commit()
+            async with async_session_scope() as db:
+                document = Document(
+                    dossier_id=self.dossier_id,
+                    titre=self.titre,
+                    type_document=self.type_document,
+                    chemin_fichier=file_path,
+                    taille_fichier=self.file.size_in_bytes,
+                    date_upload=datetime.utcnow()
+                )
+                db.add(document)
             
             if self.on_success:
                 self.on_success()
@@ -1,6 +1,6 @@
 import rio
-from src.database import get_db
-from src.models.client import Client
+from src.database import session_scope, with_session
+from src.repositories.clients import search_clients
 from src.models.dossier import DossierParties
 from src.pages.client_physique_form import ClientPhysiqueForm
 from src.pages.client_morale_form import ClientMoraleForm
@@ -26,18 +26,8 @@ class AddPartieDialog(rio.Component):
     
     def get_filtered_clients(self):
         """Get list of clients filtered by search"""
-        db = next(get_db())
-        query = db.query(Client)
-        
-        if self.search_query.strip():
-            search_term = f"%{self.search_query.strip()}%"
-            query = query.filter(
-                (Client.nom.like(search_term)) |
-                (Client.prenom.like(search_term)) |
-                (Client.email.like(search_term))
-            )
-        
-        return query.order_by(Client.nom).limit(50).all()
+        with session_scope() as db:
+            return search_clients(db, self.search_query, limit=50)
     
     def on_mode_select(self, mode: str):
         """Handle mode selection"""
@@ -56,15 +46,14 @@ class AddPartieDialog(rio.Component):
         self.current_step = "select_role"
         self.error_message = ""
     
-    def on_add_partie(self):
+    @with_session
+    def on_add_partie(self, db):
         """Add the partie to the dossier"""
         if not self.selected_client_id:
             self.error_message = "Aucun client sélectionné"
             return
         
         try:
-            db = next(get_db())
-            
             # Check if this client is already in this dossier
             existing = db.query(DossierParties).filter(
                 DossierParties.dossier_id == self.dossier_id,
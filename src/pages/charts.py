@@ -0,0 +1,96 @@
+from __future__ import annotations
+import rio
+from dataclasses import field
+from typing import NamedTuple
+
+# Colours given to the series in order, then reused
+SERIES_COLORS = [
+    rio.Color.from_hex("1f77b4"),
+    rio.Color.from_hex("ff7f0e"),
+    rio.Color.from_hex("2ca02c"),
+    rio.Color.from_hex("d62728"),
+    rio.Color.from_hex("9467bd"),
+    rio.Color.from_hex("8c564b"),
+]
+
+
+class ChartSeries(NamedTuple):
+    label: str
+    values: list[float]
+
+
+class BarChart(rio.Component):
+    """
+    Stacked bar chart drawn with plain rectangles: one bar per label, one
+    segment per series, the total and the detail in a tooltip.
+    """
+    title: str
+    labels: list[str] = field(default_factory=list)
+    series: list[ChartSeries] = field(default_factory=list)
+    unit: str = ""
+    height: float = 12
+
+    def _format(self, value: float) -> str:
+        text = f"{value:,.0f}".replace(",", " ")
+        return f"{text} {self.unit}" if self.unit else text
+
+    def _bar(self, index: int, highest: float) -> rio.Component:
+        segments = []
+        details = [self.labels[index]]
+        # Drawn top to bottom, so the first series sits on the axis
+        for position, serie in reversed(list(enumerate(self.series))):
+            value = serie.values[index]
+            if value <= 0:
+                continue
+            segments.append(
+                rio.Rectangle(
+                    fill=SERIES_COLORS[position % len(SERIES_COLORS)],
+                    min_height=self.height * value / highest,
+                )
+            )
+            details.insert(1, f"{serie.label} : {self._format(value)}")
+        total = sum(serie.values[index] for serie in self.series)
+        details.append(f"Total : {self._format(total)}")
+        return rio.Tooltip(
+            rio.Column(
+                rio.Column(*segments, align_y=1, min_height=self.height),
+                rio.Text(self.labels[index], style="text-dim", overflow="ellipsize", justify="center"),
+                spacing=0.3,
+                margin_x=0.2,
+                grow_x=True,
+            ),
+            "\n".join(details),
+            position="top",
+        )
+
+    def build(self) -> rio.Component:
+        totals = [sum(serie.values[index] for serie in self.series) for index in range(len(self.labels))]
+        highest = max(totals, default=0)
+        if highest <= 0:
+            body = rio.Text("Aucune donnée sur la période", style="text-dim", min_height=self.height, align_y=0.5)
+        else:
+            body = rio.Row(*(self._bar(index, highest) for index in range(len(self.labels))), spacing=0.2)
+        legend = [
+            rio.Row(
+                rio.Rectangle(fill=SERIES_COLORS[position % len(SERIES_COLORS)], min_width=0.9, min_height=0.9),
+                rio.Text(serie.label, style="text-dim"),
+                spacing=0.4,
+                align_y=0.5,
+            )
+            for position, serie in enumerate(self.series)
+        ]
+        return rio.Card(
+            rio.Column(
+                rio.Row(
+                    rio.Text(self.title, style="heading3"),
+                    rio.Spacer(),
+                    rio.Text(f"Max : {self._format(highest)}", style="text-dim"),
+                    align_y=0.5,
+                ),
+                body,
+                rio.Row(*legend, spacing=1.5, align_x=0),
+                spacing=1,
+                margin=1,
+            ),
+            grow_x=True,
+        )
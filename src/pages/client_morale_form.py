@@ -1,5 +1,5 @@
 import rio
-from src.database import get_db
+from src.database import with_session
 from src.models.client import Client
 from datetime import datetime
 
@@ -25,7 +25,8 @@ class ClientMoraleForm(rio.Component):
     on_cancel: rio.EventHandler[[]] = None
     on_success: rio.EventHandler[[int]] = None  # Returns client_id
     
-    def on_submit(self):
+    @with_session
+    def on_submit(self, db):
         """Handle form submission"""
         # Validation
         if not self.raison_sociale.strip():
@@ -33,8 +34,6 @@ class ClientMoraleForm(rio.Component):
             return
         
         try:
-            db = next(get_db())
-            
             # Parse date if provided
             date_creation_obj = None
             if self.date_creation.strip():
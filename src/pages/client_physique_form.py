@@ -1,5 +1,5 @@
 import rio
-from src.database import get_db
+from src.database import with_session
 from src.models.client import Client
 from datetime import datetime, date
 
@@ -24,7 +24,8 @@ class ClientPhysiqueForm(rio.Component):
     on_cancel: rio.EventHandler[[]] = None
     on_success: rio.EventHandler[[int]] = None  # Returns client_id
     
-    def on_submit(self):
+    @with_session
+    def on_submit(self, db):
         """Handle form submission"""
         # Validation
         if not self.nom.strip():
@@ -36,8 +37,6 @@ class ClientPhysiqueForm(rio.Component):
             return
         
         try:
-            db = next(get_db())
-            
             # Parse date if provided
             date_naissance_obj = None
             if self.date_naissance.strip():
@@ -1,41 +1,191 @@
+from __future__ import annotations
 import rio
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+from src.database import async_read_session_scope
+from src.repositories.dashboard import DashboardKpis, get_dashboard_kpis
+from src.repositories.rollups import RollupRow, read_monthly_rollups, last_months
+from src.pages.charts import BarChart, ChartSeries
+from src.utils import change_events
+from src.utils.debounce import LatestOnly
+from src.utils.ttl_cache import TTLCache
+
+# The figures are shared by every session for a few seconds: however many
+# users open the dashboard at once, the aggregate runs once per TTL
+DASHBOARD_CACHE_TTL = 15
+_kpi_cache = TTLCache(DASHBOARD_CACHE_TTL, maxsize=1)
+KPI_TABLES = ("dossiers", "actes", "formalites")
+for _table in KPI_TABLES:
+    change_events.subscribe(_table, _kpi_cache.clear)
+
+
+# The charts read monthly_rollups only; it changes when the rollups are
+# refreshed, which is published in-process and otherwise caught by the TTL
+TRENDS_CACHE_TTL = 300
+_trends_cache = TTLCache(TRENDS_CACHE_TTL, maxsize=4)
+change_events.subscribe("monthly_rollups", _trends_cache.clear)
+
+# Period of the charts: number of months read, and whether bars are months or years
+TREND_PERIODS = {"12 mois": ("MOIS", 12), "5 ans": ("ANNEES", 60)}
+MONTH_LABELS = ["Janv", "Févr", "Mars", "Avr", "Mai", "Juin", "Juil", "Août", "Sept", "Oct", "Nov", "Déc"]
+
+
+async def load_dashboard_kpis() -> DashboardKpis:
+    """Dashboard figures from the shared cache, computed in one query on a miss"""
+    async def load():
+        async with async_read_session_scope() as db:
+            return await db.run_sync(get_dashboard_kpis)
+    return await _kpi_cache.get_or_load_async("kpis", load)
+
+
+async def load_trends(period: str) -> list[RollupRow]:
+    """Rollup rows of the chart period, from the shared cache"""
+    months = last_months(TREND_PERIODS[period][1])
+
+    async def load():
+        async with async_read_session_scope() as db:
+            return await db.run_sync(read_monthly_rollups, months[0], months[-1])
+    return await _trends_cache.get_or_load_async(period, load)
+
+
+def trend_series(rows: list[RollupRow], period: str, today: Optional[date] = None):
+    """
+    Bar labels, dossiers opened per type and fees series of the charts, every
+    month (or year) of the period present even when it has no rollup row.
+    """
+    grain, count = TREND_PERIODS[period]
+    months = last_months(count, today)
+    if grain == "MOIS":
+        buckets = months
+        labels = [f"{MONTH_LABELS[int(mois[5:]) - 1]} {mois[2:4]}" for mois in months]
+        bucket_of = lambda mois: mois
+    else:
+        buckets = sorted({mois[:4] for mois in months})
+        labels = buckets
+        bucket_of = lambda mois: mois[:4]
+    position = {bucket: index for index, bucket in enumerate(buckets)}
+
+    opened = defaultdict(lambda: [0] * len(buckets))
+    emoluments = [0.0] * len(buckets)
+    debours = [0.0] * len(buckets)
+    for row in rows:
+        index = position.get(bucket_of(row.mois))
+        if index is None:
+            continue
+        if row.dossiers_ouverts:
+            opened[row.type_dossier or "Sans type"][index] += row.dossiers_ouverts
+        emoluments[index] += float(row.emoluments)
+        debours[index] += float(row.debours)
+
+    opened_series = [ChartSeries(label, values) for label, values in sorted(opened.items())]
+    fees_series = [ChartSeries("Émoluments", emoluments), ChartSeries("Débours", debours)]
+    return labels, opened_series, fees_series
+
+
+def format_amount(value) -> str:
+    return f"{value:,.0f} FCFA"
+
 
 class DashboardPage(rio.Component):
-    def build(self) -> rio.Component:
+    """
+    Home page figures. They are loaded on mount and again when a committed
+    change touches one of the tables they are computed from.
+    """
+    kpis: Optional[DashboardKpis] = None
+    trend_period: str = "12 mois"
+    trends: Optional[list[RollupRow]] = None
+
+    @rio.event.on_mount
+    def on_mount(self):
+        self._loads = LatestOnly()
+        self._trend_loads = LatestOnly()
+        self._unsubscribes = [change_events.subscribe(table, self.on_data_changed) for table in KPI_TABLES]
+        self._unsubscribes.append(change_events.subscribe("monthly_rollups", self.on_rollups_changed))
+        self.reload()
+        self.reload_trends()
+
+    @rio.event.on_unmount
+    def on_unmount(self):
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._loads.cancel()
+        self._trend_loads.cancel()
+
+    def reload(self):
+        self._loads.submit(load_dashboard_kpis, self.apply_kpis, create_task=self.session.create_task)
+
+    def apply_kpis(self, kpis: DashboardKpis):
+        self.kpis = kpis
+
+    def on_data_changed(self, _ids: set):
+        self.reload()
+
+    def reload_trends(self):
+        period = self.trend_period
+        self._trend_loads.submit(lambda: load_trends(period), self.apply_trends, create_task=self.session.create_task)
+
+    def apply_trends(self, rows: list[RollupRow]):
+        self.trends = rows
+
+    def on_rollups_changed(self, _months: set):
+        self.reload_trends()
+
+    def on_period_change(self, _event: rio.DropdownChangeEvent):
+        self.reload_trends()
+
+    def _trend_charts(self) -> rio.Component:
+        if self.trends is None:
+            return rio.Text("Chargement…", style="text-dim")
+        labels, opened, fees = trend_series(self.trends, self.trend_period)
         return rio.Column(
+            BarChart("Dossiers ouverts par type", labels=labels, series=opened),
+            BarChart("Émoluments et débours encaissés à la clôture", labels=labels, series=fees, unit="FCFA"),
+            spacing=2
+        )
+
+    def _kpi_card(self, title: str, value: str, fill: rio.Color = None) -> rio.Component:
+        return rio.Card(
+            rio.Column(
+                rio.Text(title, style="heading3"),
+                rio.Text(value, style=rio.TextStyle(font_size=3, font_weight="bold", fill=fill)),
+                spacing=1
+            ),
+            margin=1,
+            grow_x=True
+        )
+
+    def build(self) -> rio.Component:
+        kpis = self.kpis
+        # The charts make the page taller than the screen
+        return rio.ScrollContainer(rio.Column(
             rio.Text("Tableau de Bord", style="heading1"),
             rio.Row(
-                rio.Card(
-                    rio.Column(
-                        rio.Text("Dossiers en cours", style="heading3"),
-                        rio.Text("12", style=rio.TextStyle(font_size=3, font_weight="bold")),
-                        spacing=1
-                    ),
-                    margin=1,
-                    grow_x=True
-                ),
-                rio.Card(
-                    rio.Column(
-                        rio.Text("Actes à signer", style="heading3"),
-                        rio.Text("3", style=rio.TextStyle(font_size=3, font_weight="bold", fill=rio.Color.ORANGE)),
-                        spacing=1
-                    ),
-                    margin=1,
-                    grow_x=True
-                ),
-                rio.Card(
-                    rio.Column(
-                        rio.Text("Formalités", style="heading3"),
-                        rio.Text("5", style=rio.TextStyle(font_size=3, font_weight="bold", fill=rio.Color.BLUE)),
-                        spacing=1
-                    ),
-                    margin=1,
-                    grow_x=True
-                ),
+                self._kpi_card("Dossiers en cours", str(kpis.dossiers_en_cours) if kpis else "…"),
+                self._kpi_card("Actes à signer", str(kpis.actes_a_signer) if kpis else "…", rio.Color.ORANGE),
+                self._kpi_card("Formalités", str(kpis.formalites_en_attente) if kpis else "…", rio.Color.BLUE),
+                spacing=2
+            ),
+            rio.Row(
+                self._kpi_card("Émoluments", format_amount(kpis.emoluments) if kpis else "…"),
+                self._kpi_card("Débours", format_amount(kpis.debours) if kpis else "…"),
+                self._kpi_card("Total facturé", format_amount(kpis.emoluments + kpis.debours) if kpis else "…"),
                 spacing=2
             ),
-            rio.Spacer(height=2),
+            rio.Row(
+                rio.Text("Tendances", style="heading2"),
+                rio.Spacer(),
+                rio.Dropdown(
+                    label="Période",
+                    options={period: period for period in TREND_PERIODS},
+                    selected_value=self.bind().trend_period,
+                    on_change=self.on_period_change,
+                    min_width=12
+                ),
+                align_y=0.5
+            ),
+            self._trend_charts(),
             rio.Text("Bienvenue sur AGEN-OHADA", style=rio.TextStyle(fill=rio.Color.GREY)),
             spacing=2,
             margin=2
-        )
+        ), scroll_x="never")
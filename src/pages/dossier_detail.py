@@ -1,12 +1,15 @@
 from __future__ import annotations
 import rio
-from src.database import get_db
-from src.models.dossier import Dossier, DossierParties, DossierHistorique, Document
+from src.database import session_scope, async_read_session_scope
+from src.repositories.dossiers import get_dossier_detail
+from src.models.dossier import Dossier, DossierParties, Document
 from src.models.acte import Acte
 from src.models.user import User
 from src.models.client import Client
 from src.pages.add_partie_dialog import AddPartieDialog
 from src.pages.add_document_dialog import AddDocumentDialog
+from src.utils import change_events
+from src.utils.debounce import LatestOnly
 from datetime import datetime
 import os
 
@@ -15,6 +18,8 @@ class DossierDetailPage(rio.Component):
     Detailed view of a single dossier with all information
     """
     dossier_id: int
+    # False right after the user saved this dossier or one of its actes: read it from the primary
+    use_replica: bool = True
     dossier: Dossier = None
     error_message: str = ""
     current_tab: str = "actes"  # parties, documents, historique, actes
@@ -35,33 +40,47 @@ class DossierDetailPage(rio.Component):
     on_edit_acte: rio.EventHandler[[int]] = None
     
     @rio.event.on_mount
-    def on_mount(self):
+    async def on_mount(self):
         """Load dossier data when component mounts"""
-        self.load_dossier()
+        self._loads = LatestOnly()
+        # Edits of this dossier or of its actes, documents, ... (from any session) reload it
+        self._unsubscribes = [
+            change_events.subscribe("dossiers", self.on_dossiers_changed),
+            change_events.subscribe(change_events.DOSSIER_CONTENTS, self.on_dossiers_changed),
+        ]
+        await self.load_dossier(use_replica=self.use_replica)
     
-    def load_dossier(self):
+    @rio.event.on_unmount
+    def on_unmount(self):
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._loads.cancel()
+    
+    def on_dossiers_changed(self, dossier_ids: set):
+        if self.dossier_id in dossier_ids:
+            self.reload_dossier()
+    
+    def reload_dossier(self):
+        """Schedule a reload after a change, read from the primary so the change is visible"""
+        # A reload requested meanwhile (e.g. by the change notification) replaces this one
+        self._loads.submit(
+            lambda: self.load_dossier(use_replica=False), lambda _: None, create_task=self.session.create_task
+        )
+    
+    async def load_dossier(self, use_replica: bool = True):
         """Fetch dossier from database"""
-        db = None
         try:
-            db = next(get_db())
-            # Eagerly load the dossier with all relationships to avoid lazy-loading issues
-            from sqlalchemy.orm import joinedload
-            
-            dossier = db.query(Dossier).options(
-                joinedload(Dossier.responsable),
-                joinedload(Dossier.parties_associations).joinedload(DossierParties.client),
-                joinedload(Dossier.historique).joinedload(DossierHistorique.user),
-                joinedload(Dossier.documents),
-                joinedload(Dossier.actes)
-            ).filter(Dossier.id == self.dossier_id).first()
-            
-            if not dossier:
-                self.error_message = "Dossier non trouvé"
-                print(f"[ERROR] Dossier with ID {self.dossier_id} not found")
-                return
-            
-            # Detach from session to make it accessible after session closes
-            db.expunge(dossier)
+            async with async_read_session_scope(use_replica=use_replica) as db:
+                # Eagerly load the dossier with all relationships to avoid lazy-loading issues
+                dossier = await db.run_sync(get_dossier_detail, self.dossier_id)
+                
+                if not dossier:
+                    self.error_message = "Dossier non trouvé"
+                    print(f"[ERROR] Dossier with ID {self.dossier_id} not found")
+                    return
+                
+                # Detach from session to make it accessible after session closes
+                db.expunge(dossier)
             self.dossier = dossier
             print(f"[INFO] Dossier {dossier.numero_dossier} loaded successfully")
             
@@ -70,9 +89,6 @@ class DossierDetailPage(rio.Component):
             print(f"[ERROR] Error loading dossier: {str(e)}")
             import traceback
             traceback.print_exc()
-        finally:
-            if db:
-                db.close()
     
     def on_back_click(self):
         """Handle back button"""
@@ -100,7 +116,7 @@ class DossierDetailPage(rio.Component):
     def on_add_partie_success(self):
         """Handle successful partie addition"""
         self.show_add_partie_dialog = False
-        self.load_dossier()  # Reload to show new partie
+        self.reload_dossier()  # Reload to show new partie
     
     def on_add_partie_cancel(self):
         """Handle partie dialog cancel"""
@@ -117,22 +133,19 @@ class DossierDetailPage(rio.Component):
             return
         
         try:
-            db = next(get_db())
             dossier_id, client_id = self.partie_to_delete
-            
-            partie = db.query(DossierParties).filter(
-                DossierParties.dossier_id == dossier_id,
-                DossierParties.client_id == client_id
-            ).first()
-            
-            if partie:
-                db.delete(partie)
-                db.commit()
-                self.load_dossier()  # Reload
+            with session_scope() as db:
+                partie = db.query(DossierParties).filter(
+                    DossierParties.dossier_id == dossier_id,
+                    DossierParties.client_id == client_id
+                ).first()
+                
+                if partie:
+                    db.delete(partie)
+            self.reload_dossier()  # Reload
             
         except Exception as e:
             print(f"Error removing partie: {str(e)}")
-            db.rollback()
         finally:
             self.show_delete_partie_dialog = False
             self.partie_to_delete = None
@@ -148,7 +161,7 @@ class DossierDetailPage(rio.Component):
         
     def on_add_document_success(self):
         self.show_add_document_dialog = False
-        self.load_dossier()
+        self.reload_dossier()
         
     def on_add_document_cancel(self):
         self.show_add_document_dialog = False
@@ -162,26 +175,24 @@ class DossierDetailPage(rio.Component):
             return
             
         try:
-            db = next(get_db())
-            document = db.query(Document).filter(Document.id == self.document_to_delete_id).first()
-            
-            if document:
-                # Remove file from disk
-                import os
-                if os.path.exists(document.chemin_fichier):
-                    try:
-                        os.remove(document.chemin_fichier)
-                    except:
-                        pass
+            with session_scope() as db:
+                document = db.query(Document).filter(Document.id == self.document_to_delete_id).first()
                 
-                # Remove from db
-                db.delete(document)
-                db.commit()
-                self.load_dossier()
+                if document:
+                    # Remove file from disk
+                    import os
+                    if os.path.exists(document.chemin_fichier):
+                        try:
+                            os.remove(document.chemin_fichier)
+                        except:
+                            pass
+                    
+                    # Remove from db
+                    db.delete(document)
+            self.reload_dossier()
                 
         except Exception as e:
             print(f"Error deleting document: {str(e)}")
-            db.rollback()
         finally:
             self.show_delete_document_dialog = False
             self.document_to_delete_id = None
@@ -1,7 +1,7 @@
 import rio
-from src.database import get_db
-from src.models.dossier import Dossier, DossierHistorique
-from src.models.user import User
+from src.database import with_session
+from src.models.dossier import DossierHistorique
+from src.repositories.lookups import get_dossier, get_user_by_username
 from datetime import datetime, date
 
 class DossierEditPage(rio.Component):
@@ -32,11 +32,11 @@ class DossierEditPage(rio.Component):
         """Load dossier data when component mounts"""
         self.load_dossier()
     
-    def load_dossier(self):
+    @with_session
+    def load_dossier(self, db):
         """Fetch dossier from database and populate form"""
         try:
-            db = next(get_db())
-            dossier = db.query(Dossier).filter(Dossier.id == self.dossier_id).first()
+            dossier = get_dossier(db, self.dossier_id)
             
             if not dossier:
                 self.error_message = "Dossier non trouvé"
@@ -56,7 +56,8 @@ class DossierEditPage(rio.Component):
         except Exception as e:
             self.error_message = f"Erreur lors du chargement : {str(e)}"
     
-    def on_submit(self):
+    @with_session
+    def on_submit(self, db):
         """Handle form submission"""
         # Validation
         if not self.intitule.strip():
@@ -64,8 +65,7 @@ class DossierEditPage(rio.Component):
             return
         
         try:
-            db = next(get_db())
-            dossier = db.query(Dossier).filter(Dossier.id == self.dossier_id).first()
+            dossier = get_dossier(db, self.dossier_id)
             
             if not dossier:
                 self.error_message = "Dossier non trouvé"
@@ -81,7 +81,7 @@ class DossierEditPage(rio.Component):
                 # Get current user
                 user_id = None
                 if self.current_username:
-                    current_user = db.query(User).filter(User.username == self.current_username).first()
+                    current_user = get_user_by_username(db, self.current_username)
                     if current_user:
                         user_id = current_user.id
 
@@ -106,18 +106,21 @@ class DossierEditPage(rio.Component):
                 dossier.montant_acte = float(self.montant_acte) if self.montant_acte else None
             except ValueError:
                 self.error_message = "Montant de l'acte invalide"
+                db.rollback()
                 return
             
             try:
                 dossier.emoluments = float(self.emoluments) if self.emoluments else None
             except ValueError:
                 self.error_message = "Émoluments invalides"
+                db.rollback()
                 return
             
             try:
                 dossier.debours = float(self.debours) if self.debours else None
             except ValueError:
                 self.error_message = "Débours invalides"
+                db.rollback()
                 return
             
             # Update closure date if status is CLOTURE
@@ -1,5 +1,6 @@
 import rio
-from src.database import get_db
+from sqlalchemy import select, func
+from src.database import with_session
 from src.models.dossier import Dossier
 from datetime import datetime
 
@@ -13,23 +14,27 @@ class DossierFormPage(rio.Component):
     error_message: str = ""
     success_message: str = ""
     
+    # Logged-in user, recorded as the responsable of the new dossier
+    responsable_id: int = None
+    
     # Callback to navigate back to list
     on_cancel: rio.EventHandler[[]] = None
     on_success: rio.EventHandler[[]] = None
     
-    def generate_numero_dossier(self) -> str:
+    async def generate_numero_dossier(self, db) -> str:
         """
         Generate automatic dossier number in format: YYYY-MM-SEQ
         Example: 2025-12-001
         """
-        db = next(get_db())
         now = datetime.now()
         year_month = now.strftime("%Y-%m")
         
         # Count existing dossiers for this month
-        count = db.query(Dossier).filter(
-            Dossier.numero_dossier.like(f"{year_month}-%")
-        ).count()
+        count = await db.scalar(
+            select(func.count(Dossier.id)).where(
+                Dossier.numero_dossier.like(f"{year_month}-%")
+            )
+        )
         
         # Generate sequential number
         seq = count + 1
@@ -37,7 +42,8 @@ class DossierFormPage(rio.Component):
         
         return numero
     
-    def on_submit(self):
+    @with_session
+    async def on_submit(self, db):
         """Handle form submission"""
         # Validation
         if not self.intitule.strip():
@@ -45,10 +51,8 @@ class DossierFormPage(rio.Component):
             return
         
         try:
-            db = next(get_db())
-            
             # Generate numero
-            numero = self.generate_numero_dossier()
+            numero = await self.generate_numero_dossier(db)
             
             # Create new dossier
             new_dossier = Dossier(
@@ -57,11 +61,11 @@ class DossierFormPage(rio.Component):
                 type_dossier=self.type_dossier,
                 statut="OUVERT",
                 date_ouverture=datetime.now().date(),
-                responsable_id=1  # TODO: Use actual logged-in user ID
+                responsable_id=self.responsable_id
             )
             
             db.add(new_dossier)
-            db.commit()
+            await db.commit()
             
             self.success_message = f"Dossier {numero} créé avec succès !"
             self.error_message = ""
@@ -76,7 +80,7 @@ class DossierFormPage(rio.Component):
                 
         except Exception as e:
             self.error_message = f"Erreur lors de la création : {str(e)}"
-            db.rollback()
+            await db.rollback()
     
     def on_cancel_click(self):
         """Handle cancel button"""
@@ -0,0 +1,299 @@
+from __future__ import annotations
+import rio
+from dataclasses import field
+from typing import Optional
+from src.database import async_read_session_scope, with_session
+from src.repositories.dossiers import (
+    DossierRow, DossierCursor, KANBAN_STATUTS, list_dossiers_page, count_dossiers, move_dossier_status,
+)
+from src.pages.dossier_list_view import STATUT_COLORS
+from src.utils import change_events
+from src.utils.debounce import LatestOnly
+
+# Cards fetched per column, first page and each "Charger plus"
+KANBAN_PAGE_SIZE = 20
+
+
+class KanbanCard(rio.Component):
+    """
+    Compact dossier card of a kanban column. It can be dragged to another
+    column, or moved one status back or forward with its arrow buttons.
+    """
+    dossier: DossierRow
+    can_move_back: bool = True
+    can_move_forward: bool = True
+    on_press: rio.EventHandler[[int]] = None
+    on_drag_start: rio.EventHandler[[DossierRow]] = None
+    on_drag_end: rio.EventHandler[[]] = None
+    on_move: rio.EventHandler[[DossierRow, int]] = None
+
+    def on_card_press(self):
+        if self.on_press:
+            self.on_press(self.dossier.id)
+
+    def on_card_drag_start(self, _event: rio.PointerEvent):
+        if self.on_drag_start:
+            self.on_drag_start(self.dossier)
+
+    def on_card_drag_end(self, _event: rio.PointerEvent):
+        # The board's handler is async, hand the coroutine back to Rio
+        if self.on_drag_end:
+            return self.on_drag_end()
+
+    def build(self) -> rio.Component:
+        dossier = self.dossier
+        return rio.PointerEventListener(
+            rio.Card(
+                rio.Column(
+                    rio.Text(dossier.intitule, style="heading3", overflow="ellipsize"),
+                    rio.Text(f"N° {dossier.numero_dossier}", style="text-dim"),
+                    rio.Row(
+                        rio.IconButton(
+                            "material/chevron_left",
+                            style="plain-text",
+                            min_size=1.8,
+                            on_press=lambda: self.on_move(dossier, -1) if self.on_move else None,
+                            is_sensitive=self.can_move_back,
+                        ),
+                        rio.Spacer(),
+                        rio.Text(dossier.type_dossier or "", style="text-dim"),
+                        rio.Spacer(),
+                        rio.IconButton(
+                            "material/chevron_right",
+                            style="plain-text",
+                            min_size=1.8,
+                            on_press=lambda: self.on_move(dossier, 1) if self.on_move else None,
+                            is_sensitive=self.can_move_forward,
+                        ),
+                        align_y=0.5
+                    ),
+                    spacing=0.5,
+                    margin=0.8
+                ),
+                on_press=self.on_card_press
+            ),
+            on_drag_start=self.on_card_drag_start,
+            on_drag_end=self.on_card_drag_end,
+        )
+
+
+class KanbanColumn(rio.Component):
+    """
+    One status of the board. The column loads its own first page and count
+    when mounted, appends further pages on "Charger plus", and reloads when
+    a committed change touches a dossier with its status, before or after.
+    """
+    statut: str
+    responsable_id: Optional[int] = None
+    is_drop_target: bool = False
+
+    dossiers: list[DossierRow] = field(default_factory=list)
+    next_cursor: Optional[DossierCursor] = None
+    total: Optional[int] = None
+
+    on_select: rio.EventHandler[[int]] = None
+    on_drag_start: rio.EventHandler[[DossierRow]] = None
+    on_drag_end: rio.EventHandler[[]] = None
+    on_hover: rio.EventHandler[[str]] = None
+    on_move: rio.EventHandler[[DossierRow, int]] = None
+
+    @rio.event.on_mount
+    def on_mount(self):
+        self._loads = LatestOnly()
+        # "Charger plus" has its own runner so it never cancels a pending reload
+        self._pages = LatestOnly()
+        self._unsubscribe_changes = change_events.subscribe(change_events.DOSSIER_STATUTS, self.on_statuts_changed)
+        self.reload()
+
+    @rio.event.on_unmount
+    def on_unmount(self):
+        self._unsubscribe_changes()
+        self._loads.cancel()
+        self._pages.cancel()
+
+    async def get_page(self, after: Optional[DossierCursor] = None, use_replica: bool = True):
+        """One page of the column, with the column count for the first page"""
+        async with async_read_session_scope(use_replica=use_replica) as db:
+            page = await db.run_sync(
+                list_dossiers_page, statut=self.statut, after=after,
+                limit=KANBAN_PAGE_SIZE, responsable_id=self.responsable_id
+            )
+            total = None if after else await db.run_sync(count_dossiers, self.statut, self.responsable_id)
+        return page, total
+
+    def reload(self, use_replica: bool = True):
+        """Load the column from the top, dropping a next page requested for the previous cards"""
+        self._pages.cancel()
+
+        def apply(result):
+            page, self.total = result
+            self.dossiers = page.rows
+            self.next_cursor = page.next_cursor
+
+        self._loads.submit(
+            lambda: self.get_page(use_replica=use_replica), apply, create_task=self.session.create_task
+        )
+
+    def on_statuts_changed(self, statuts: set):
+        """A dossier entered, left or was edited in this column: reload from the primary"""
+        if self.statut in statuts:
+            self.reload(use_replica=False)
+
+    def on_load_more(self):
+        """Append the next page; ignored while a reload is pending, it replaces the cards anyway"""
+        if self.next_cursor is None or self._loads.pending:
+            return
+        after = self.next_cursor
+
+        def apply(result):
+            page, _ = result
+            self.dossiers = self.dossiers + page.rows
+            self.next_cursor = page.next_cursor
+
+        self._pages.submit(lambda: self.get_page(after), apply, create_task=self.session.create_task)
+
+    def on_pointer_enter(self, _event: rio.PointerEvent):
+        if self.on_hover:
+            self.on_hover(self.statut)
+
+    def build(self) -> rio.Component:
+        position = KANBAN_STATUTS.index(self.statut)
+        cards = [
+            KanbanCard(
+                dossier,
+                can_move_back=position > 0,
+                can_move_forward=position < len(KANBAN_STATUTS) - 1,
+                on_press=self.on_select,
+                on_drag_start=self.on_drag_start,
+                on_drag_end=self.on_drag_end,
+                on_move=self.on_move,
+                key=f"kanban-{dossier.id}",
+            )
+            for dossier in self.dossiers
+        ]
+        if self.next_cursor is not None:
+            cards.append(
+                rio.Button(
+                    "Charger plus",
+                    icon="material/expand_more",
+                    on_press=self.on_load_more,
+                    style="minor",
+                    align_x=0.5
+                )
+            )
+
+        color = STATUT_COLORS.get(self.statut, rio.Color.GREY)
+        return rio.PointerEventListener(
+            rio.Card(
+                rio.Column(
+                    rio.Row(
+                        rio.Text(self.statut, style=rio.TextStyle(fill=color, font_weight="bold")),
+                        rio.Spacer(),
+                        rio.Text("…" if self.total is None else str(self.total), style="text-dim"),
+                        align_y=0.5
+                    ),
+                    rio.ScrollContainer(
+                        rio.Column(*cards, spacing=0.8, align_y=0),
+                        scroll_x="never",
+                        grow_y=True
+                    ),
+                    spacing=1,
+                    margin=1
+                ),
+                color=color.replace(opacity=0.15) if self.is_drop_target else "neutral",
+                min_width=18,
+                grow_x=True,
+                grow_y=True
+            ),
+            on_pointer_enter=self.on_pointer_enter,
+            consume_events=False,
+        )
+
+
+class DossierKanbanPage(rio.Component):
+    """
+    Kanban board of the dossiers, one column per status. Dropping a card on
+    another column changes its status and records the history in a single
+    statement; the columns then reload through the change notifications.
+    """
+    current_user_id: Optional[int] = None
+    # "MES": only the dossiers of current_user_id, "TOUS": everyone's
+    vue: str = "TOUS"
+
+    dragged: Optional[DossierRow] = None
+    drop_statut: Optional[str] = None
+    error_message: str = ""
+
+    on_view_dossier: rio.EventHandler[[int]] = None
+
+    def on_drag_start(self, dossier: DossierRow):
+        self.dragged = dossier
+        self.drop_statut = dossier.statut
+
+    def on_hover(self, statut: str):
+        if self.dragged is not None:
+            self.drop_statut = statut
+
+    async def on_drag_end(self):
+        dossier, statut = self.dragged, self.drop_statut
+        self.dragged = self.drop_statut = None
+        if dossier is not None and statut is not None and statut != dossier.statut:
+            await self.move(dossier, statut)
+
+    async def on_move(self, dossier: DossierRow, step: int):
+        position = KANBAN_STATUTS.index(dossier.statut) + step
+        if 0 <= position < len(KANBAN_STATUTS):
+            await self.move(dossier, KANBAN_STATUTS[position])
+
+    @with_session
+    async def move(self, dossier: DossierRow, statut: str, db):
+        """Write the new status and its history row; the commit notifies the columns"""
+        try:
+            moved = await db.run_sync(move_dossier_status, dossier.id, dossier.statut, statut, self.current_user_id)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            self.error_message = f"Erreur lors du changement de statut : {str(e)}"
+            return
+        self.error_message = "" if moved else f"Le dossier {dossier.numero_dossier} a été modifié entre-temps"
+
+    def on_dossier_click(self, dossier_id: int):
+        if self.on_view_dossier:
+            self.on_view_dossier(dossier_id)
+
+    def build(self) -> rio.Component:
+        responsable_id = self.current_user_id if self.vue == "MES" else None
+        columns = [
+            KanbanColumn(
+                statut,
+                responsable_id=responsable_id,
+                is_drop_target=self.dragged is not None and statut == self.drop_statut,
+                on_select=self.on_dossier_click,
+                on_drag_start=self.on_drag_start,
+                on_drag_end=self.on_drag_end,
+                on_hover=self.on_hover,
+                on_move=self.on_move,
+                # A new vue rebuilds the columns, which load their own data again
+                key=f"column-{statut}-{responsable_id}",
+            )
+            for statut in KANBAN_STATUTS
+        ]
+        return rio.Column(
+            rio.Row(
+                rio.Text("Suivi des Dossiers", style="heading1"),
+                rio.Spacer(),
+                rio.Dropdown(
+                    label="Vue",
+                    options={"Tous les dossiers": "TOUS", "Mes dossiers": "MES"},
+                    selected_value=self.bind().vue,
+                    min_width=15
+                ),
+                spacing=2,
+                align_y=0.5
+            ),
+            rio.Text(self.error_message, style=rio.TextStyle(fill=rio.Color.RED)) if self.error_message else rio.Spacer(min_height=0),
+            rio.Row(*columns, spacing=1, grow_y=True),
+            spacing=1,
+            margin=2,
+            grow_y=True
+        )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import rio
+from dataclasses import field
+from src.repositories.dossiers import DossierRow, DOSSIER_PAGE_SIZE
+
+# Cards materialised at once, whatever the number of loaded dossiers
+WINDOW_SIZE = 60
+# Cards the window moves by when stepping up or down
+WINDOW_STEP = DOSSIER_PAGE_SIZE
+
+STATUT_COLORS = {
+    "OUVERT": rio.Color.from_hex("3b82f6"),      # Blue
+    "INSTRUCTION": rio.Color.from_hex("f59e0b"),  # Orange
+    "SIGNATURE": rio.Color.from_hex("8b5cf6"),    # Purple
+    "FORMALITES": rio.Color.from_hex("06b6d4"),   # Cyan
+    "CLOTURE": rio.Color.from_hex("10b981"),      # Green
+    "ARCHIVE": rio.Color.from_hex("6b7280"),      # Gray
+}
+
+
+class DossierCard(rio.Component):
+    """
+    One dossier of the list. Its only state is the DossierRow (a tuple), so
+    Rio skips rebuilding a card whose row did not change.
+    """
+    dossier: DossierRow
+    on_press: rio.EventHandler[[int]] = None
+
+    def on_card_press(self):
+        if self.on_press:
+            self.on_press(self.dossier.id)
+
+    def build(self) -> rio.Component:
+        dossier = self.dossier
+        return rio.Card(
+            rio.Row(
+                # Left side - Main info
+                rio.Column(
+                    rio.Text(dossier.intitule, style="heading3"),
+                    rio.Row(
+                        rio.Text(f"N° {dossier.numero_dossier}", style="text-dim"),
+                        rio.Text("•", style="text-dim"),
+                        rio.Text(dossier.type_dossier or "", style="text-dim"),
+                        spacing=0.5
+                    ),
+                    spacing=0.5
+                ),
+                rio.Spacer(),
+                # Right side - Status and date
+                rio.Column(
+                    rio.Card(
+                        rio.Text(
+                            dossier.statut,
+                            style=rio.TextStyle(
+                                fill=rio.Color.WHITE,
+                                font_weight="bold",
+                                font_size=0.9
+                            )
+                        ),
+                        color=STATUT_COLORS.get(dossier.statut, rio.Color.GREY),
+                        margin=0.5
+                    ),
+                    rio.Text(
+                        f"Ouvert le {dossier.date_ouverture.strftime('%d/%m/%Y')}" if dossier.date_ouverture else "Date inconnue",
+                        style="text-dim"
+                    ),
+                    align_x=1,
+                    spacing=0.5
+                ),
+                spacing=2,
+                align_y=0.5
+            ),
+            margin=0.5,
+            grow_x=True,
+            on_press=self.on_card_press
+        )
+
+
+class DossierListView(rio.Component):
+    """
+    Windowed list of dossier cards: only WINDOW_SIZE cards exist in the
+    component tree (and in the browser), the rows above and below are
+    reached by moving the window. Cards are keyed by dossier id, so moving
+    the window or appending a page reuses the cards already built.
+
+    Give it a new `key` when the result set is replaced (new search) to start
+    again from the top.
+    """
+    dossiers: list[DossierRow] = field(default_factory=list)
+    has_more: bool = False
+    on_select: rio.EventHandler[[int]] = None
+    on_load_more: rio.EventHandler[[]] = None
+
+    window_start: int = 0
+
+    def clamped_start(self) -> int:
+        return max(0, min(self.window_start, len(self.dossiers) - WINDOW_SIZE))
+
+    def on_show_previous(self):
+        self.window_start = max(0, self.clamped_start() - WINDOW_STEP)
+
+    def on_show_next(self):
+        self.window_start = self.clamped_start() + WINDOW_STEP
+
+    def on_load_more_press(self):
+        # Slide the window so the page being fetched lands in view
+        self.window_start = self.clamped_start() + WINDOW_STEP
+        if self.on_load_more:
+            self.on_load_more()
+
+    def build(self) -> rio.Component:
+        start = self.clamped_start()
+        end = min(start + WINDOW_SIZE, len(self.dossiers))
+        children = []
+
+        if start > 0:
+            children.append(
+                rio.Button(
+                    f"{start} dossier(s) précédent(s)",
+                    icon="material/expand_less",
+                    on_press=self.on_show_previous,
+                    style="minor",
+                    align_x=0.5
+                )
+            )
+
+        for dossier in self.dossiers[start:end]:
+            children.append(DossierCard(dossier, on_press=self.on_select, key=f"dossier-{dossier.id}"))
+
+        hidden_below = len(self.dossiers) - end
+        if hidden_below > 0:
+            children.append(
+                rio.Button(
+                    f"{hidden_below} dossier(s) suivant(s)",
+                    icon="material/expand_more",
+                    on_press=self.on_show_next,
+                    style="minor",
+                    align_x=0.5
+                )
+            )
+        elif self.has_more:
+            children.append(
+                rio.Button(
+                    "Charger plus",
+                    icon="material/expand_more",
+                    on_press=self.on_load_more_press,
+                    style="minor",
+                    align_x=0.5
+                )
+            )
+
+        return rio.Column(*children, spacing=1)
@@ -1,122 +1,254 @@
 from __future__ import annotations
+import asyncio
 import rio
-from src.database import get_db
-from src.models.dossier import Dossier
+from dataclasses import field
+from typing import Optional
+from src.database import async_read_session_scope, read_session_scope
+from src.repositories.dossiers import (
+    DossierRow, DossierCursor, DossierFacets, DOSSIER_SORTS, DEFAULT_SORT, list_dossiers_page, count_dossier_facets,
+    prefetch_first_page, prefetched_first_page, EXPORT_COLUMNS, iter_dossier_export,
+)
+from src.pages.dossier_list_view import DossierListView
+from src.utils import change_events
+from src.utils.debounce import LatestOnly
+from src.utils.spreadsheet import EXPORT_FORMATS, new_export_path
 from datetime import datetime
 
+# Pause in typing after which the search runs
+SEARCH_DEBOUNCE_SECONDS = 0.3
+
+TYPE_OPTIONS = [
+    "TOUS",
+    "VENTE",
+    "SUCCESSION",
+    "DONATION",
+    "CREDIT-BAIL",
+    "PROCURATION",
+    "TESTAMENT",
+    "CONSTITUTION_SOCIETE",
+    "AUTRE"
+]
+STATUT_OPTIONS = [
+    "TOUS",
+    "OUVERT",
+    "INSTRUCTION",
+    "SIGNATURE",
+    "FORMALITES",
+    "CLOTURE",
+    "ARCHIVE"
+]
+SORT_OPTIONS = {sort.label: key for key, sort in DOSSIER_SORTS.items()}
+VUE_OPTIONS = {"Mes dossiers": "MES", "Tous les dossiers": "TOUS"}
+
+
+def default_filters(user_id: Optional[int]) -> tuple:
+    """Filters of a freshly opened list: the user's own dossiers, most recent first"""
+    return ("", "TOUS", "TOUS", user_id, DEFAULT_SORT)
+
+
+async def prefetch_my_dossiers(user_id: Optional[int]):
+    """
+    Load the default view of `user_id` in the background (called on login),
+    so DossierListPage shows it on mount without waiting for the database.
+    """
+    *criteria, sort = default_filters(user_id)
+    async with async_read_session_scope() as db:
+        await db.run_sync(prefetch_first_page, *criteria, sort=sort)
+
+
+def export_dossiers(filters: tuple, fmt: str):
+    """
+    Write every dossier matching `filters` to a new `fmt` file, batch by
+    batch from a server-side cursor. Blocking: run it in a worker thread.
+    """
+    search, type_dossier, statut, responsable_id, sort = filters
+    write, _ = EXPORT_FORMATS[fmt]
+    path = new_export_path(f".{fmt}")
+    with read_session_scope() as db:
+        batches = iter_dossier_export(db, search, type_dossier, statut, responsable_id, sort)
+        write(path, list(EXPORT_COLUMNS), batches)
+    return path
+
+
 class DossierListPage(rio.Component):
     """
-    Page displaying the list of all dossiers with search and filters.
+    Page displaying the list of dossiers with search and filters, by default
+    those of the logged-in user ("mes dossiers").
+
+    Results live in component state: build() never queries. They are
+    reloaded when the search or a filter changes, or when a committed change
+    to the dossiers table invalidates them. Typing is debounced and only the
+    latest load is kept, older ones are cancelled.
     """
     # Search and filter state
     search_query: str = ""
     filter_type: str = "TOUS"
     filter_statut: str = "TOUS"
+    # Key of DOSSIER_SORTS, applied by the database
+    sort: str = DEFAULT_SORT
+    # "MES": only the dossiers of current_user_id, "TOUS": everyone's
+    vue: str = "MES"
+    current_user_id: Optional[int] = None
+    # False right after the user saved a dossier: the first page is read from the primary
+    use_replica: bool = True
+    
+    # Loaded pages: rows shown so far and the keyset of the next page
+    dossiers: list[DossierRow] = field(default_factory=list)
+    next_cursor: Optional[DossierCursor] = None
+    loaded_filters: Optional[tuple] = None
+    # Counts shown in the dropdowns for the loaded search
+    facets: Optional[DossierFacets] = None
+    # Format of the export being written, if any
+    exporting: Optional[str] = None
     
     # Callbacks
     on_new_dossier: rio.EventHandler[[]] = None
     on_view_dossier: rio.EventHandler[[int]] = None
     
-    def get_filtered_dossiers(self):
-        """Fetch and filter dossiers based on search and filters"""
-        db = next(get_db())
-        query = db.query(Dossier)
-        
-        # Apply search filter
-        if self.search_query.strip():
-            search_term = f"%{self.search_query.strip()}%"
-            query = query.filter(
-                (Dossier.numero_dossier.like(search_term)) |
-                (Dossier.intitule.like(search_term))
+    @rio.event.on_mount
+    def on_mount(self):
+        self._loads = LatestOnly()
+        # "Charger plus" has its own runner so it never cancels a pending reload
+        self._pages = LatestOnly()
+        self._unsubscribe_changes = change_events.subscribe("dossiers", self.on_dossiers_changed)
+        filters = self.current_filters()
+        prefetched = prefetched_first_page(*filters[:-1], sort=filters[-1]) if self.use_replica else None
+        if prefetched is not None:
+            self.apply_first_page(filters, prefetched)
+        else:
+            self.reload(use_replica=self.use_replica)
+    
+    @rio.event.on_unmount
+    def on_unmount(self):
+        self._unsubscribe_changes()
+        self._loads.cancel()
+        self._pages.cancel()
+    
+    def current_filters(self) -> tuple:
+        """(search, type, statut, responsable_id, sort); the sort does not change the facet counts"""
+        responsable_id = self.current_user_id if self.vue == "MES" else None
+        return (self.search_query, self.filter_type, self.filter_statut, responsable_id, self.sort)
+    
+    async def get_filtered_dossiers(self, filters: tuple, after: Optional[DossierCursor] = None, use_replica: bool = True):
+        """Fetch one page of dossiers matching the search and filters"""
+        search, type_dossier, statut, responsable_id, sort = filters
+        async with async_read_session_scope(use_replica=use_replica) as db:
+            return await db.run_sync(
+                list_dossiers_page, search, type_dossier, statut,
+                after=after, sort=sort, responsable_id=responsable_id
             )
+    
+    async def get_first_page_and_facets(self, filters: tuple, use_replica: bool = True):
+        """First page and dropdown counts in one session (the counts are usually cached)"""
+        search, type_dossier, statut, responsable_id, sort = filters
+        async with async_read_session_scope(use_replica=use_replica) as db:
+            page = await db.run_sync(
+                list_dossiers_page, search, type_dossier, statut, sort=sort, responsable_id=responsable_id
+            )
+            facets = await db.run_sync(count_dossier_facets, search, type_dossier, statut, responsable_id)
+        return page, facets
+    
+    def apply_first_page(self, filters: tuple, result: tuple):
+        """Show a freshly loaded (or prefetched) first page and its facets"""
+        page, self.facets = result
+        self.dossiers = page.rows
+        self.next_cursor = page.next_cursor
+        self.loaded_filters = filters
+    
+    def reload(self, delay: float = 0.0, use_replica: bool = True):
+        """
+        (Re)load the list from the top for the current search and filters.
+        Supersedes any load still waiting or running, whose result is dropped,
+        including a next page requested for the previous results.
+        """
+        filters = self.current_filters()
+        self._pages.cancel()
+        self._loads.submit(
+            lambda: self.get_first_page_and_facets(filters, use_replica=use_replica),
+            lambda result: self.apply_first_page(filters, result),
+            delay=delay, create_task=self.session.create_task
+        )
+    
+    def on_search_change(self, _event=None):
+        """
+        Typing: wait for a pause before querying. A pending load may be for
+        text erased since, so it is replaced even when the box is back to the
+        filters shown.
+        """
+        if self.current_filters() != self.loaded_filters or self._loads.pending:
+            self.reload(delay=SEARCH_DEBOUNCE_SECONDS)
+    
+    def on_filters_change(self, _event=None):
+        """Enter in the search box or a dropdown choice: query right away"""
+        if self.current_filters() != self.loaded_filters or self._loads.pending:
+            self.reload()
+    
+    def on_dossiers_changed(self, dossier_ids: set):
+        """A dossier was created or modified: reload from the primary"""
+        self.reload(use_replica=False)
+    
+    def on_load_more(self):
+        """
+        Append the next page after the last dossier shown; ignored while a
+        reload is pending, its results replace the ones shown anyway.
+        """
+        if self.next_cursor is None or self._loads.pending:
+            return
+        filters, after = self.loaded_filters, self.next_cursor
         
-        # Apply type filter
-        if self.filter_type != "TOUS":
-            query = query.filter(Dossier.type_dossier == self.filter_type)
-        
-        # Apply status filter
-        if self.filter_statut != "TOUS":
-            query = query.filter(Dossier.statut == self.filter_statut)
-        
-        # Order by date (most recent first)
-        query = query.order_by(Dossier.date_ouverture.desc())
+        def apply(page):
+            self.dossiers = self.dossiers + page.rows
+            self.next_cursor = page.next_cursor
         
-        return query.all()
+        self._pages.submit(
+            lambda: self.get_filtered_dossiers(filters, after=after), apply,
+            create_task=self.session.create_task
+        )
+    
+    async def on_export(self, fmt: str):
+        """Export the current search and filters as a CSV or XLSX download"""
+        if self.exporting:
+            return
+        self.exporting = fmt
+        try:
+            # Off the event loop: a large export must not hold up other sessions
+            path = await asyncio.to_thread(export_dossiers, self.current_filters(), fmt)
+            _, media_type = EXPORT_FORMATS[fmt]
+            await self.session.save_file(
+                path, f"dossiers_{datetime.now():%Y%m%d_%H%M}.{fmt}", media_type=media_type
+            )
+        except Exception as e:
+            print(f"❌ Error exporting dossiers: {str(e)}")
+        finally:
+            self.exporting = None
     
     def on_dossier_click(self, dossier_id: int):
         """Handle dossier card click"""
         if self.on_view_dossier:
             self.on_view_dossier(dossier_id)
     
-    def get_statut_color(self, statut: str) -> rio.Color:
-        """Return color based on status"""
-        colors = {
-            "OUVERT": rio.Color.from_hex("3b82f6"),      # Blue
-            "INSTRUCTION": rio.Color.from_hex("f59e0b"),  # Orange
-            "SIGNATURE": rio.Color.from_hex("8b5cf6"),    # Purple
-            "FORMALITES": rio.Color.from_hex("06b6d4"),   # Cyan
-            "CLOTURE": rio.Color.from_hex("10b981"),      # Green
-            "ARCHIVE": rio.Color.from_hex("6b7280"),      # Gray
+    def facet_options(self, values: list[str], counts: dict) -> dict[str, str]:
+        """Dropdown labels with the number of dossiers behind each value"""
+        if self.facets is None:
+            return {value: value for value in values}
+        return {
+            f"{value} ({sum(counts.values()) if value == 'TOUS' else counts.get(value, 0)})": value
+            for value in values
         }
-        return colors.get(statut, rio.Color.GREY)
+    
+    def total_found(self) -> Optional[int]:
+        """Dossiers matching the loaded search and filters, from the type facet"""
+        if self.facets is None:
+            return None
+        search, type_dossier, statut, responsable_id, sort = self.loaded_filters
+        counts = self.facets.types
+        return sum(counts.values()) if type_dossier == "TOUS" else counts.get(type_dossier, 0)
     
     def build(self) -> rio.Component:
-        # Debug print
-        print(f"DEBUG: search_query value: {getattr(self, 'search_query', 'NOT_FOUND')}")
-
-        # Fetch filtered dossiers
-        dossiers = self.get_filtered_dossiers()
+        dossiers = self.dossiers
         
-        # Create the list of dossier cards
-        dossier_cards = []
-        for dossier in dossiers:
-            dossier_cards.append(
-                rio.Card(
-                    rio.Row(
-                        # Left side - Main info
-                        rio.Column(
-                            rio.Text(dossier.intitule, style="heading3"),
-                            rio.Row(
-                                rio.Text(f"N° {dossier.numero_dossier}", style="text-dim"),
-                                rio.Text("•", style="text-dim"),
-                                rio.Text(dossier.type_dossier, style="text-dim"),
-                                spacing=0.5
-                            ),
-                            spacing=0.5
-                        ),
-                        rio.Spacer(),
-                        # Right side - Status and date
-                        rio.Column(
-                            rio.Card(
-                                rio.Text(
-                                    dossier.statut,
-                                    style=rio.TextStyle(
-                                        fill=rio.Color.WHITE,
-                                        font_weight="bold",
-                                        font_size=0.9
-                                    )
-                                ),
-                                color=self.get_statut_color(dossier.statut),
-                                margin=0.5
-                            ),
-                            rio.Text(
-                                f"Ouvert le {dossier.date_ouverture.strftime('%d/%m/%Y')}" if dossier.date_ouverture else "Date inconnue",
-                                style="text-dim"
-                            ),
-                            align_x=1,
-                            spacing=0.5
-                        ),
-                        spacing=2,
-                        align_y=0.5
-                    ),
-                    margin=0.5,
-                    grow_x=True,
-                    on_press=lambda dossier_id=dossier.id: self.on_dossier_click(dossier_id)
-                )
-            )
-            
         # If no dossiers, show a message
-        if not dossier_cards:
+        if not dossiers:
             content = rio.Column(
                 rio.Icon("material/folder_off", fill=rio.Color.GREY, min_width=4, min_height=4),
                 rio.Text(
@@ -128,13 +260,34 @@ class DossierListPage(rio.Component):
                 margin_y=4
             )
         else:
-            content = rio.Column(*dossier_cards, spacing=1)
+            # Windowed: a new key per result set restarts it from the top
+            content = DossierListView(
+                dossiers=dossiers,
+                has_more=self.next_cursor is not None,
+                on_select=self.on_dossier_click,
+                on_load_more=self.on_load_more,
+                key=f"results-{self.loaded_filters}"
+            )
 
         return rio.Column(
             # Header with title and new button
             rio.Row(
                 rio.Text("Gestion des Dossiers", style="heading1"),
                 rio.Spacer(),
+                rio.Button(
+                    "Export en cours..." if self.exporting == "csv" else "Exporter CSV",
+                    icon="material/download",
+                    on_press=lambda: self.on_export("csv"),
+                    is_sensitive=self.exporting is None,
+                    style="minor"
+                ),
+                rio.Button(
+                    "Export en cours..." if self.exporting == "xlsx" else "Exporter Excel",
+                    icon="material/table_view",
+                    on_press=lambda: self.on_export("xlsx"),
+                    is_sensitive=self.exporting is None,
+                    style="minor"
+                ),
                 rio.Button(
                     "Nouveau Dossier", 
                     icon="material/add",
@@ -156,38 +309,40 @@ class DossierListPage(rio.Component):
                             text=self.bind().search_query,
                             label="Rechercher par numéro ou intitulé...",
                             prefix_text="🔍",
+                            on_change=self.on_search_change,
+                            on_confirm=self.on_filters_change,
                             grow_x=True
                         ),
+                        # Own or all dossiers
+                        rio.Dropdown(
+                            label="Vue",
+                            options=VUE_OPTIONS,
+                            selected_value=self.bind().vue,
+                            on_change=self.on_filters_change,
+                            min_width=12
+                        ),
                         # Type filter
                         rio.Dropdown(
                             label="Type",
-                            options=[
-                                "TOUS",
-                                "VENTE",
-                                "SUCCESSION",
-                                "DONATION",
-                                "CREDIT-BAIL",
-                                "PROCURATION",
-                                "TESTAMENT",
-                                "CONSTITUTION_SOCIETE",
-                                "AUTRE"
-                            ],
+                            options=self.facet_options(TYPE_OPTIONS, self.facets.types if self.facets else {}),
                             selected_value=self.bind().filter_type,
+                            on_change=self.on_filters_change,
                             min_width=15
                         ),
                         # Status filter
                         rio.Dropdown(
                             label="Statut",
-                            options=[
-                                "TOUS",
-                                "OUVERT",
-                                "INSTRUCTION",
-                                "SIGNATURE",
-                                "FORMALITES",
-                                "CLOTURE",
-                                "ARCHIVE"
-                            ],
+                            options=self.facet_options(STATUT_OPTIONS, self.facets.statuts if self.facets else {}),
                             selected_value=self.bind().filter_statut,
+                            on_change=self.on_filters_change,
+                            min_width=15
+                        ),
+                        # Sort, done by the database
+                        rio.Dropdown(
+                            label="Trier par",
+                            options=SORT_OPTIONS,
+                            selected_value=self.bind().sort,
+                            on_change=self.on_filters_change,
                             min_width=15
                         ),
                         spacing=2
@@ -201,7 +356,7 @@ class DossierListPage(rio.Component):
             
             # Results count
             rio.Text(
-                f"{len(dossiers)} dossier(s) trouvé(s)",
+                f"{self.total_found() if self.facets else len(dossiers)} dossier(s) trouvé(s)",
                 style="text-dim"
             ),
             
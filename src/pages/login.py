@@ -1,7 +1,8 @@
 from __future__ import annotations
+import asyncio
 import rio
-from src.database import get_db
-from src.models.user import User
+from src.database import with_session
+from src.repositories.lookups import get_user_by_username
 from src.auth import verify_password
 
 class LoginPage(rio.Component):
@@ -11,13 +12,14 @@ class LoginPage(rio.Component):
     
     # Callback function to call on successful login
     # This will be passed by the parent component
-    on_success: rio.EventHandler[str] = None
+    on_success: rio.EventHandler[[str, int]] = None
 
-    def on_login(self):
-        db = next(get_db())
-        user = db.query(User).filter(User.username == self.username).first()
+    @with_session
+    async def on_login(self, db):
+        user = await db.run_sync(get_user_by_username, self.username)
         
-        if not user or not verify_password(self.password, user.password_hash):
+        # bcrypt is deliberately slow, keep it off the event loop as well
+        if not user or not await asyncio.to_thread(verify_password, self.password, user.password_hash):
             self.error_message = "Nom d'utilisateur ou mot de passe incorrect"
             return
 
@@ -26,9 +28,9 @@ class LoginPage(rio.Component):
         # Clear error message
         self.error_message = ""
         
-        # Trigger the success event with username
+        # Trigger the success event with username and id
         if self.on_success:
-            self.on_success(user.username)
+            self.on_success(user.username, user.id)
 
     def build(self) -> rio.Component:
         return rio.Column(
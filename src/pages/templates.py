@@ -1,8 +1,9 @@
 from __future__ import annotations
 import rio
 from dataclasses import field
-from src.database import SessionLocal
+from src.database import session_scope, read_session_scope, with_session
 from src.models.template import Template
+from src.repositories.templates import TemplateListRow, list_templates
 from sqlalchemy.exc import SQLAlchemyError
 
 class TemplatesPage(rio.Component):
@@ -10,7 +11,7 @@ class TemplatesPage(rio.Component):
     Page for managing document templates
     """
     # State
-    templates: list[Template] = field(default_factory=list)
+    templates: list[TemplateListRow] = field(default_factory=list)
     selected_template_id: int = None
     is_editing: bool = False
     
@@ -25,18 +26,12 @@ class TemplatesPage(rio.Component):
     def on_mount(self):
         self.load_templates()
         
-    def load_templates(self):
-        session = SessionLocal()
+    def load_templates(self, use_replica: bool = True):
         try:
-            self.templates = session.query(Template).order_by(Template.nom).all()
-            # Detach objects so they can be used after session close if needed, 
-            # though accessing lazy props will fail. 
-            # Since Template has no relationships, this is fine.
-            session.expunge_all() 
+            with read_session_scope(use_replica=use_replica) as db:
+                self.templates = list_templates(db)
         except Exception as e:
             self.error_message = f"Erreur de chargement: {str(e)}"
-        finally:
-            session.close()
 
     def on_new_click(self):
         self.selected_template_id = None
@@ -48,11 +43,11 @@ class TemplatesPage(rio.Component):
         self.error_message = ""
         self.success_message = ""
 
-    def on_edit_click(self, template_id: int):
+    @with_session
+    def on_edit_click(self, template_id: int, db):
         self.selected_template_id = template_id
-        session = SessionLocal()
         try:
-            template = session.query(Template).filter(Template.id == template_id).first()
+            template = db.query(Template).filter(Template.id == template_id).first()
             if template:
                 self.form_nom = template.nom
                 self.form_type = template.type_acte
@@ -63,8 +58,6 @@ class TemplatesPage(rio.Component):
                 self.success_message = ""
         except Exception as e:
             self.error_message = f"Erreur: {str(e)}"
-        finally:
-            session.close()
 
     def on_cancel_edit(self):
         self.is_editing = False
@@ -79,52 +72,46 @@ class TemplatesPage(rio.Component):
             self.error_message = "Le contenu est obligatoire"
             return
 
-        session = SessionLocal()
         try:
-            if self.selected_template_id:
-                # Update
-                template = session.query(Template).filter(Template.id == self.selected_template_id).first()
-                if template:
-                    template.nom = self.form_nom
-                    template.type_acte = self.form_type
-                    template.description = self.form_description
-                    template.contenu = self.form_contenu
-            else:
-                # Create
-                template = Template(
-                    nom=self.form_nom,
-                    type_acte=self.form_type,
-                    description=self.form_description,
-                    contenu=self.form_contenu
-                )
-                session.add(template)
+            with session_scope() as db:
+                if self.selected_template_id:
+                    # Update
+                    template = db.query(Template).filter(Template.id == self.selected_template_id).first()
+                    if template:
+                        template.nom = self.form_nom
+                        template.type_acte = self.form_type
+                        template.description = self.form_description
+                        template.contenu = self.form_contenu
+                else:
+                    # Create
+                    template = Template(
+                        nom=self.form_nom,
+                        type_acte=self.form_type,
+                        description=self.form_description,
+                        contenu=self.form_contenu
+                    )
+                    db.add(template)
             
-            session.commit()
             self.is_editing = False
             self.success_message = "Template enregistré avec succès"
         except SQLAlchemyError as e:
-            session.rollback()
             self.error_message = f"Erreur d'enregistrement: {str(e)}"
         except Exception as e:
-            session.rollback()
             self.error_message = f"Erreur inattendue: {str(e)}"
         finally:
-            session.close()
-            # Reload templates to reflect changes
-            self.load_templates()
+            # Reload templates to reflect changes (from the primary, the replica may lag)
+            self.load_templates(use_replica=False)
 
     def on_delete_click(self, template_id: int):
-        session = SessionLocal()
         try:
-            template = session.query(Template).filter(Template.id == template_id).first()
-            if template:
-                session.delete(template)
-                session.commit()
+            with session_scope() as db:
+                template = db.query(Template).filter(Template.id == template_id).first()
+                if template:
+                    db.delete(template)
         except Exception as e:
             self.error_message = f"Erreur de suppression: {str(e)}"
         finally:
-            session.close()
-            self.load_templates()
+            self.load_templates(use_replica=False)
 
     def build(self) -> rio.Component:
         if self.is_editing:
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import rio
+from datetime import date
+from typing import NamedTuple, Optional
+from src.database import async_read_session_scope
+from src.repositories.workload import WorkloadRow, get_workload, DOSSIER_DELAI_JOURS, FORMALITE_DELAI_JOURS
+from src.pages.dossier_list_view import STATUT_COLORS
+from src.utils import change_events
+from src.utils.debounce import LatestOnly
+from src.utils.ttl_cache import TTLCache
+
+# One aggregate shared by every session; a committed change to any table it
+# is computed from drops it, the TTL only bounds how stale it gets otherwise
+WORKLOAD_CACHE_TTL = 60
+_workload_cache = TTLCache(WORKLOAD_CACHE_TTL, maxsize=2)
+WORKLOAD_TABLES = ("dossiers", "actes", "formalites", "users")
+for _table in WORKLOAD_TABLES:
+    change_events.subscribe(_table, _workload_cache.clear)
+
+
+async def load_workload() -> list[WorkloadRow]:
+    """Workload rows from the shared cache, computed in one query on a miss"""
+    today = date.today()
+
+    async def load():
+        async with async_read_session_scope() as db:
+            return await db.run_sync(get_workload, today)
+    # Keyed by day, so items falling late at midnight are picked up
+    return await _workload_cache.get_or_load_async(today.isoformat(), load)
+
+
+class ResponsableLoad(NamedTuple):
+    """Workload rows of one responsable with their totals"""
+    responsable_id: Optional[int]
+    username: str
+    role: str
+    statuts: list[WorkloadRow]
+    dossiers: int
+    dossiers_en_retard: int
+    actes_brouillon: int
+    formalites_en_retard: int
+
+
+def group_by_responsable(rows: list[WorkloadRow]) -> list[ResponsableLoad]:
+    """Rows grouped per responsable, most loaded first, unassigned dossiers last"""
+    grouped: dict[Optional[int], list[WorkloadRow]] = {}
+    for row in rows:
+        grouped.setdefault(row.responsable_id, []).append(row)
+    loads = [
+        ResponsableLoad(
+            responsable_id,
+            statuts[0].username or ("Non assigné" if responsable_id is None else f"Utilisateur {responsable_id}"),
+            statuts[0].role or "",
+            statuts,
+            sum(row.dossiers for row in statuts),
+            sum(row.dossiers_en_retard for row in statuts),
+            sum(row.actes_brouillon for row in statuts),
+            sum(row.formalites_en_retard for row in statuts),
+        )
+        for responsable_id, statuts in grouped.items()
+    ]
+    return sorted(loads, key=lambda load: (load.responsable_id is None, -load.dossiers, load.username))
+
+
+class WorkloadPage(rio.Component):
+    """
+    Load of each responsable: dossiers in progress per status, draft actes
+    and late items. Loaded on mount and again when a committed change touches
+    one of the tables it is computed from.
+    """
+    rows: Optional[list[WorkloadRow]] = None
+
+    @rio.event.on_mount
+    def on_mount(self):
+        self._loads = LatestOnly()
+        self._unsubscribes = [change_events.subscribe(table, self.on_data_changed) for table in WORKLOAD_TABLES]
+        self.reload()
+
+    @rio.event.on_unmount
+    def on_unmount(self):
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._loads.cancel()
+
+    def reload(self):
+        self._loads.submit(load_workload, self.apply_rows, create_task=self.session.create_task)
+
+    def apply_rows(self, rows: list[WorkloadRow]):
+        self.rows = rows
+
+    def on_data_changed(self, _ids: set):
+        self.reload()
+
+    def _figure(self, label: str, value: int, alert: bool = False) -> rio.Component:
+        fill = rio.Color.RED if alert and value else None
+        return rio.Column(
+            rio.Text(str(value), style=rio.TextStyle(font_size=1.6, font_weight="bold", fill=fill)),
+            rio.Text(label, style="text-dim"),
+            min_width=9
+        )
+
+    def _responsable_card(self, load: ResponsableLoad) -> rio.Component:
+        statuts = [
+            rio.Row(
+                rio.Text(row.statut or "—", style=rio.TextStyle(fill=STATUT_COLORS.get(row.statut, rio.Color.GREY)), min_width=10),
+                rio.Text(f"{row.dossiers} dossier(s)", min_width=9),
+                rio.Text(f"{row.actes_brouillon} brouillon(s)", style="text-dim", min_width=9),
+                rio.Text(
+                    f"{row.dossiers_en_retard + row.formalites_en_retard} en retard",
+                    style=rio.TextStyle(fill=rio.Color.RED) if row.dossiers_en_retard + row.formalites_en_retard else "text-dim",
+                ),
+                spacing=2
+            )
+            for row in load.statuts
+        ]
+        return rio.Card(
+            rio.Column(
+                rio.Row(
+                    rio.Text(load.username, style="heading3"),
+                    rio.Text(load.role, style="text-dim"),
+                    spacing=1,
+                    align_y=0.5
+                ),
+                rio.Row(
+                    self._figure("Dossiers en cours", load.dossiers),
+                    self._figure("Actes en brouillon", load.actes_brouillon),
+                    self._figure(f"Dossiers > {DOSSIER_DELAI_JOURS} j", load.dossiers_en_retard, alert=True),
+                    self._figure(f"Formalités > {FORMALITE_DELAI_JOURS} j", load.formalites_en_retard, alert=True),
+                    spacing=2
+                ),
+                *statuts,
+                spacing=1,
+                margin=1.5
+            ),
+            grow_x=True
+        )
+
+    def build(self) -> rio.Component:
+        if self.rows is None:
+            body = rio.Text("Chargement…", style="text-dim")
+        elif not self.rows:
+            body = rio.Text("Aucun dossier en cours", style="text-dim")
+        else:
+            body = rio.Column(*(self._responsable_card(load) for load in group_by_responsable(self.rows)), spacing=1.5)
+        return rio.ScrollContainer(
+            rio.Column(
+                rio.Text("Charge de travail", style="heading1"),
+                rio.Text(
+                    "Dossiers en cours, actes en brouillon et éléments en retard par responsable",
+                    style="text-dim"
+                ),
+                body,
+                spacing=2,
+                margin=2
+            ),
+            scroll_x="never"
+        )
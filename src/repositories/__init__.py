@@ -0,0 +1,14 @@
+from src.repositories.dossiers import (
+    DossierRow, DossierCursor, DossierPage, DOSSIER_PAGE_SIZE, build_dossier_list_query, list_dossiers,
+    list_dossiers_page, DossierFacets, count_dossier_facets, prefetch_first_page, prefetched_first_page,
+    EXPORT_COLUMNS, iter_dossier_export,
+    build_dossier_detail_query, get_dossier_detail,
+)
+from src.repositories.clients import ClientPickerRow, build_client_search_query, search_clients
+from src.repositories.templates import TemplateOption, TemplateListRow, list_template_options, list_templates
+from src.repositories.actes import generate_acte_content
+from src.repositories.lookups import get_user_by_username, get_dossier, get_template, get_acte
+from src.repositories.dashboard import DashboardKpis, build_dashboard_kpis_query, get_dashboard_kpis
+from src.repositories.stats import CounterValue, read_counters, reconcile_stats_counters
+from src.repositories.rollups import RollupRow, refresh_monthly_rollups, read_monthly_rollups
+from src.repositories.workload import WorkloadRow, build_workload_query, get_workload
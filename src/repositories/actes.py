@@ -0,0 +1,20 @@
+from typing import Optional
+from src.models.dossier import Dossier
+from src.models.template import Template
+from src.repositories.lookups import get_dossier, get_template
+from src.utils.template_engine import TemplateEngine
+
+
+def generate_acte_content(db, template_id: int, dossier_id: int) -> Optional[tuple[Template, Dossier, str]]:
+    """
+    Load the template and the dossier and merge them. Returns
+    (template, dossier, contenu), or None when either is missing.
+    """
+    template = get_template(db, template_id)
+    dossier = get_dossier(db, dossier_id)
+    if not template or not dossier:
+        return None
+
+    # For now simple context, later we can enrich with parties info
+    ctx = TemplateEngine.get_dossier_context(dossier)
+    return template, dossier, TemplateEngine.merge(template.contenu, ctx)
@@ -0,0 +1,39 @@
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from src.models.client import Client
+
+
+class ClientPickerRow(NamedTuple):
+    """Columns shown in the client picker of AddPartieDialog."""
+    id: int
+    type_client: str
+    nom: str
+    prenom: Optional[str]
+    telephone: Optional[str]
+
+
+def build_client_search_query(search: str = "", limit: int = 50):
+    """Build the SELECT behind the client picker"""
+    query = select(
+        Client.id,
+        Client.type_client,
+        Client.nom,
+        Client.prenom,
+        Client.telephone,
+    )
+
+    if search.strip():
+        search_term = f"%{search.strip()}%"
+        query = query.where(
+            (Client.nom.like(search_term)) |
+            (Client.prenom.like(search_term)) |
+            (Client.email.like(search_term))
+        )
+
+    return query.order_by(Client.nom).limit(limit)
+
+
+def search_clients(db, search: str = "", limit: int = 50) -> list[ClientPickerRow]:
+    """Return up to `limit` clients whose name, first name or email matches `search`"""
+    result = db.execute(build_client_search_query(search, limit))
+    return [ClientPickerRow._make(row) for row in result]
@@ -0,0 +1,51 @@
+from typing import NamedTuple
+from decimal import Decimal
+from sqlalchemy import select, func
+from src.models.acte import StatutActe
+from src.models.formalite import Formalite, STATUTS_FORMALITE_EN_ATTENTE
+from src.models.stats import StatsCounter
+
+# Statuses after which a dossier no longer counts as "en cours"
+STATUTS_DOSSIER_TERMINES = ("CLOTURE", "ARCHIVE")
+
+
+class DashboardKpis(NamedTuple):
+    """Figures of the dashboard cards."""
+    dossiers_en_cours: int
+    actes_a_signer: int  # actes FINALISE, awaiting signature
+    formalites_en_attente: int
+    emoluments: Decimal  # totals over every dossier
+    debours: Decimal
+
+
+def build_dashboard_kpis_query():
+    """
+    Build the single SELECT behind the dashboard. Dossier and acte figures
+    are read from the handful of stats_counters rows kept up to date by
+    triggers, so their cost does not grow with the tables; the few pending
+    formalités are counted on idx_formalites_statut.
+    """
+    def counter_sum(column, dimension, condition=None):
+        query = select(func.coalesce(func.sum(column), 0)).where(StatsCounter.dimension == dimension)
+        return (query.where(condition) if condition is not None else query).scalar_subquery()
+
+    formalites_en_attente = (
+        select(func.count()).select_from(Formalite)
+        .where(Formalite.statut.in_(STATUTS_FORMALITE_EN_ATTENTE)).scalar_subquery()
+    )
+    return select(
+        counter_sum(StatsCounter.count, "statut", StatsCounter.key.notin_(STATUTS_DOSSIER_TERMINES)).label("dossiers_en_cours"),
+        counter_sum(StatsCounter.count, "acte_statut", StatsCounter.key == StatutActe.FINALISE.value).label("actes_a_signer"),
+        formalites_en_attente.label("formalites_en_attente"),
+        counter_sum(StatsCounter.emoluments, "statut").label("emoluments"),
+        counter_sum(StatsCounter.debours, "statut").label("debours"),
+    )
+
+
+def get_dashboard_kpis(db) -> DashboardKpis:
+    """Compute the dashboard figures (uncached, see DashboardPage for the shared cache)"""
+    row = db.execute(build_dashboard_kpis_query()).one()
+    return DashboardKpis(
+        row.dossiers_en_cours, row.actes_a_signer, row.formalites_en_attente,
+        Decimal(str(row.emoluments)).quantize(Decimal("0.01")), Decimal(str(row.debours)).quantize(Decimal("0.01")),
+    )
@@ -0,0 +1,417 @@
+import re
+from typing import Any, NamedTuple, Optional
+from datetime import date, datetime
+from sqlalchemy import Integer, Text, select, insert, update, tuple_, func, literal, literal_column, case, union_all
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import joinedload, selectinload
+from src.models.dossier import Dossier, DossierParties, DossierHistorique, SEARCH_CONFIG
+from src.utils import change_events
+from src.utils.ttl_cache import TTLCache
+
+
+class DossierRow(NamedTuple):
+    """Columns shown on a dossier card in the list page."""
+    id: int
+    numero_dossier: str
+    intitule: str
+    type_dossier: Optional[str]
+    statut: Optional[str]
+    date_ouverture: date
+    rank: Optional[float] = None  # full-text relevance, only when searching on PostgreSQL
+    sort_value: Any = None  # value of the selected sort key, unless sorting by date
+
+
+# Dossiers fetched per "Charger plus" on the list page
+DOSSIER_PAGE_SIZE = 50
+
+
+class DossierCursor(NamedTuple):
+    """Keyset position in the dossier list: the last row already shown."""
+    date_ouverture: date
+    id: int
+    rank: Optional[float] = None
+    sort_value: Any = None
+
+
+class DossierPage(NamedTuple):
+    rows: list[DossierRow]
+    next_cursor: Optional[DossierCursor]  # None on the last page
+
+
+class DossierSort(NamedTuple):
+    label: str
+    key: Any  # SQL expression, NULLs folded so the keyset stays total
+    descending: bool
+
+
+# Sort options of the list page. Every key has a matching (key, id) index in
+# src.models.dossier / migrations/phase7_sort_indexes.sql; the constants are
+# inlined so PostgreSQL matches the expression indexes with any driver.
+DEFAULT_SORT = "date"
+DOSSIER_SORTS = {
+    "date": DossierSort("Date d'ouverture", Dossier.date_ouverture, True),
+    "numero": DossierSort("Numéro", Dossier.numero_dossier, False),
+    "intitule": DossierSort("Intitulé", Dossier.intitule, False),
+    "statut": DossierSort("Statut", func.coalesce(Dossier.statut, literal_column("''")), False),
+    # Groups the dossiers of each responsable; ordering by user name would need a join no index can serve
+    "responsable": DossierSort("Responsable", func.coalesce(Dossier.responsable_id, literal_column("0")), False),
+    "montant_acte": DossierSort("Montant de l'acte", func.coalesce(Dossier.montant_acte, literal_column("0")), True),
+    "emoluments": DossierSort("Émoluments", func.coalesce(Dossier.emoluments, literal_column("0")), True),
+}
+
+
+# Generated tsvector column, created on PostgreSQL only (see src.models.dossier.SEARCH_DDL)
+_search_vector = literal_column("dossiers.search_vector", type_=TSVECTOR)
+
+
+def _prefix_tsquery(search: str) -> str:
+    """'cession immeu' -> 'cession:* & immeu:*' so results follow the user while typing"""
+    return " & ".join(f"{word}:*" for word in re.findall(r"\w+", search))
+
+
+def _search_condition(search: str, full_text: bool):
+    """WHERE clause of a dossier search and, when full-text, the tsquery to rank with"""
+    search = search.strip()
+    tsquery_text = _prefix_tsquery(search) if full_text else ""
+    if tsquery_text:
+        tsquery = func.to_tsquery(literal_column(f"'{SEARCH_CONFIG}'"), tsquery_text)
+        return _search_vector.op("@@")(tsquery) | Dossier.numero_dossier.ilike(f"%{search}%"), tsquery
+    if search:
+        search_term = f"%{search}%"
+        return Dossier.numero_dossier.ilike(search_term) | Dossier.intitule.ilike(search_term), None
+    return None, None
+
+
+def build_dossier_list_query(search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                             after: Optional[DossierCursor] = None, limit: Optional[int] = None,
+                             full_text: bool = False, sort: str = DEFAULT_SORT,
+                             responsable_id: Optional[int] = None):
+    """
+    Build the SELECT behind the dossier list. Only the card columns are
+    selected, `description` and the financial fields stay in the database.
+
+    Rows are ordered by (date_ouverture, id), most recent first, or by the
+    key of `sort` (see DOSSIER_SORTS) then id. `after` seeks past a cursor
+    instead of using OFFSET, so every page costs the same index range scan
+    however deep the user scrolls.
+
+    With `full_text` (PostgreSQL) the search goes through the French,
+    accent-insensitive `search_vector`; under the default sort rows are
+    ranked by relevance first and the rank then leads the keyset. Otherwise
+    it falls back to case-insensitive LIKE on the numéro and intitulé.
+
+    `responsable_id` restricts the list to one clerk's dossiers ("mes
+    dossiers"), served by idx_dossiers_responsable.
+    """
+    columns = [
+        Dossier.id,
+        Dossier.numero_dossier,
+        Dossier.intitule,
+        Dossier.type_dossier,
+        Dossier.statut,
+        Dossier.date_ouverture,
+    ]
+    order = DOSSIER_SORTS[sort]
+    keyset = [order.key, Dossier.id]
+
+    # Apply search filter
+    condition, tsquery = _search_condition(search, full_text)
+    if tsquery is not None and sort == DEFAULT_SORT:
+        rank = func.ts_rank_cd(_search_vector, tsquery)
+        columns.append(rank.label("rank"))
+        keyset.insert(0, rank)
+    if sort != DEFAULT_SORT:
+        columns.append(order.key.label("sort_value"))
+    query = select(*columns)
+    if condition is not None:
+        query = query.where(condition)
+
+    # Apply type filter
+    if type_dossier != "TOUS":
+        query = query.where(Dossier.type_dossier == type_dossier)
+
+    # Apply status filter
+    if statut != "TOUS":
+        query = query.where(Dossier.statut == statut)
+
+    if responsable_id is not None:
+        query = query.where(Dossier.responsable_id == responsable_id)
+
+    if after is not None:
+        position = [after.date_ouverture if sort == DEFAULT_SORT else after.sort_value, after.id]
+        if len(keyset) == 3:
+            position.insert(0, after.rank)
+        if order.descending:
+            query = query.where(tuple_(*keyset) < tuple_(*position))
+        else:
+            query = query.where(tuple_(*keyset) > tuple_(*position))
+
+    # Best match first when ranking, then by the sort key, id breaks ties
+    query = query.order_by(*(column.desc() if order.descending else column.asc() for column in keyset))
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def full_text_available(db) -> bool:
+    """The search_vector column only exists on PostgreSQL"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def list_dossiers(db, search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS") -> list[DossierRow]:
+    """Return the dossier list rows matching the search and filters"""
+    query = build_dossier_list_query(search, type_dossier, statut, full_text=full_text_available(db))
+    return [DossierRow(**row._mapping) for row in db.execute(query)]
+
+
+def list_dossiers_page(db, search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                       after: Optional[DossierCursor] = None, limit: int = DOSSIER_PAGE_SIZE,
+                       sort: str = DEFAULT_SORT, responsable_id: Optional[int] = None) -> DossierPage:
+    """Return the next `limit` dossier list rows after `after` (first page when None)"""
+    # One extra row tells whether another page exists without a COUNT
+    query = build_dossier_list_query(
+        search, type_dossier, statut, after, limit + 1,
+        full_text=full_text_available(db), sort=sort, responsable_id=responsable_id
+    )
+    rows = [DossierRow(**row._mapping) for row in db.execute(query)]
+    if len(rows) <= limit:
+        return DossierPage(rows, None)
+    rows = rows[:limit]
+    last = rows[-1]
+    return DossierPage(rows, DossierCursor(last.date_ouverture, last.id, last.rank, last.sort_value))
+
+
+# Spreadsheet export: header -> column, financial fields included
+EXPORT_COLUMNS = {
+    "Numéro": Dossier.numero_dossier,
+    "Intitulé": Dossier.intitule,
+    "Type": Dossier.type_dossier,
+    "Statut": Dossier.statut,
+    "Date d'ouverture": Dossier.date_ouverture,
+    "Date de clôture": Dossier.date_cloture,
+    "Montant de l'acte": Dossier.montant_acte,
+    "Émoluments": Dossier.emoluments,
+    "Débours": Dossier.debours,
+}
+# Rows fetched per round trip of the export cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def build_dossier_export_query(search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                               responsable_id: Optional[int] = None, sort: str = DEFAULT_SORT,
+                               full_text: bool = False):
+    """Every row of the list for these filters, in the list order, with EXPORT_COLUMNS"""
+    query = build_dossier_list_query(
+        search, type_dossier, statut, full_text=full_text, sort=sort, responsable_id=responsable_id
+    )
+    return query.with_only_columns(*EXPORT_COLUMNS.values())
+
+
+def iter_dossier_export(db, search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                        responsable_id: Optional[int] = None, sort: str = DEFAULT_SORT,
+                        batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yield the export rows in lists of at most `batch_size` tuples. The rows
+    come through a server-side cursor (yield_per), so only one batch is in
+    memory at a time however many dossiers match.
+    """
+    query = build_dossier_export_query(
+        search, type_dossier, statut, responsable_id, sort, full_text=full_text_available(db)
+    )
+    result = db.execute(query, execution_options={"yield_per": batch_size})
+    for batch in result.partitions():
+        yield [tuple(row) for row in batch]
+
+
+class DossierFacets(NamedTuple):
+    """Dossier counts per value of the list page dropdowns."""
+    types: dict  # type_dossier -> count, within the search and status filter
+    statuts: dict  # statut -> count, within the search and type filter
+
+
+# Facet counts are shared by all sessions for a short while and dropped as
+# soon as a dossier is committed
+FACET_CACHE_TTL = 30
+_facet_cache = TTLCache(FACET_CACHE_TTL)
+change_events.subscribe("dossiers", _facet_cache.clear)
+
+
+def build_dossier_facets_query(search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                               full_text: bool = False, responsable_id: Optional[int] = None):
+    """
+    Build the single statement counting dossiers per type and per status.
+    Each dropdown is counted within the search and the *other* dropdown's
+    filter, so the numbers match what choosing that option would list.
+    Rows are (facet, value, count) with facet "type" or "statut".
+
+    With `full_text` (PostgreSQL) the search matches like the list and the
+    counts come from one pass with GROUPING SETS and FILTER; other backends
+    get the equivalent UNION ALL of two GROUP BY.
+    """
+    condition, _ = _search_condition(search, full_text)
+    if responsable_id is not None:
+        mine = Dossier.responsable_id == responsable_id
+        condition = mine if condition is None else condition & mine
+    type_match = Dossier.type_dossier == type_dossier if type_dossier != "TOUS" else None
+    statut_match = Dossier.statut == statut if statut != "TOUS" else None
+
+    def count_where(match):
+        return func.count().filter(match) if match is not None else func.count()
+
+    if full_text:
+        grouped_by_type = func.grouping(Dossier.statut) == 1
+        query = select(
+            case((grouped_by_type, literal("type")), else_=literal("statut")),
+            case((grouped_by_type, Dossier.type_dossier), else_=Dossier.statut),
+            case((grouped_by_type, count_where(statut_match)), else_=count_where(type_match)),
+        ).group_by(func.grouping_sets(Dossier.type_dossier, Dossier.statut))
+        return query.where(condition) if condition is not None else query
+
+    parts = []
+    for facet, column, match in (("type", Dossier.type_dossier, statut_match), ("statut", Dossier.statut, type_match)):
+        part = select(literal(facet), column, func.count()).group_by(column)
+        for clause in (condition, match):
+            if clause is not None:
+                part = part.where(clause)
+        parts.append(part)
+    return union_all(*parts)
+
+
+def count_dossier_facets(db, search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                         responsable_id: Optional[int] = None) -> DossierFacets:
+    """Counts per type and per status for the dropdowns, cached for FACET_CACHE_TTL seconds"""
+    full_text = full_text_available(db)
+    key = (search.strip(), type_dossier, statut, responsable_id, full_text)
+
+    def load():
+        facets = DossierFacets({}, {})
+        query = build_dossier_facets_query(search, type_dossier, statut, full_text, responsable_id)
+        for facet, value, count in db.execute(query):
+            (facets.types if facet == "type" else facets.statuts)[value] = count
+        return facets
+
+    return _facet_cache.get_or_load(key, load)
+
+
+# First pages loaded ahead of the list page (right after login), with their
+# facets, until a dossier is committed
+FIRST_PAGE_CACHE_TTL = 120
+_first_page_cache = TTLCache(FIRST_PAGE_CACHE_TTL)
+change_events.subscribe("dossiers", _first_page_cache.clear)
+
+
+def prefetch_first_page(db, search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                        responsable_id: Optional[int] = None,
+                        sort: str = DEFAULT_SORT) -> tuple[DossierPage, DossierFacets]:
+    """Load the first page and facets of a list view and keep them for prefetched_first_page()"""
+    key = (search.strip(), type_dossier, statut, responsable_id, sort)
+    page = list_dossiers_page(db, search, type_dossier, statut, sort=sort, responsable_id=responsable_id)
+    result = (page, count_dossier_facets(db, search, type_dossier, statut, responsable_id))
+    _first_page_cache.set(key, result)
+    return result
+
+
+def prefetched_first_page(search: str = "", type_dossier: str = "TOUS", statut: str = "TOUS",
+                          responsable_id: Optional[int] = None,
+                          sort: str = DEFAULT_SORT) -> Optional[tuple[DossierPage, DossierFacets]]:
+    """First page and facets stored by prefetch_first_page(), None if absent or invalidated"""
+    return _first_page_cache.get((search.strip(), type_dossier, statut, responsable_id, sort))
+
+
+# Columns of the kanban board, in workflow order
+KANBAN_STATUTS = ["OUVERT", "INSTRUCTION", "SIGNATURE", "FORMALITES", "CLOTURE"]
+
+
+def count_dossiers(db, statut: str, responsable_id: Optional[int] = None) -> int:
+    """Number of dossiers in `statut`, counted on idx_dossiers_statut_date"""
+    query = select(func.count()).select_from(Dossier).where(Dossier.statut == statut)
+    if responsable_id is not None:
+        query = query.where(Dossier.responsable_id == responsable_id)
+    return db.execute(query).scalar_one()
+
+
+def build_status_move(dossier_id: int, ancien_statut: str, nouveau_statut: str,
+                      user_id: Optional[int] = None, commentaire: Optional[str] = None,
+                      single_statement: bool = True):
+    """
+    Statements moving a dossier from `ancien_statut` to `nouveau_statut` and
+    recording the DossierHistorique row. The UPDATE only applies if the
+    dossier is still in `ancien_statut`, so a stale card cannot overwrite a
+    concurrent change. Clôture sets date_cloture, any other status clears it.
+
+    With `single_statement` (PostgreSQL) the UPDATE is a data-modifying CTE
+    feeding the INSERT: one round trip. Otherwise returns the UPDATE and the
+    INSERT to run one after the other.
+    """
+    moved = (
+        update(Dossier)
+        .where(Dossier.id == dossier_id, Dossier.statut == ancien_statut)
+        .values(
+            statut=nouveau_statut,
+            date_cloture=func.coalesce(Dossier.date_cloture, func.current_date()) if nouveau_statut == "CLOTURE" else None,
+        )
+        .returning(Dossier.id)
+    )
+    history_columns = ["dossier_id", "ancien_statut", "nouveau_statut", "date_changement", "user_id", "commentaire"]
+
+    def history_from(dossier_ids):
+        rows = select(
+            dossier_ids, literal(ancien_statut), literal(nouveau_statut),
+            literal(datetime.utcnow()), literal(user_id, Integer), literal(commentaire, Text),
+        )
+        return insert(DossierHistorique).from_select(history_columns, rows).returning(DossierHistorique.dossier_id)
+
+    if single_statement:
+        moved = moved.cte("moved")
+        return [history_from(moved.c.id).add_cte(moved)]
+    return [moved, history_from]
+
+
+def move_dossier_status(db, dossier_id: int, ancien_statut: str, nouveau_statut: str,
+                        user_id: Optional[int] = None,
+                        commentaire: str = "Changement de statut via le tableau kanban") -> bool:
+    """
+    Change the status of a dossier and write its history in the caller's
+    transaction (commit afterwards). Returns False when the dossier was no
+    longer in `ancien_statut`, nothing is written then.
+    """
+    if ancien_statut == nouveau_statut:
+        return False
+    if db.get_bind().dialect.name == "postgresql":
+        [statement] = build_status_move(dossier_id, ancien_statut, nouveau_statut, user_id, commentaire)
+        moved = db.execute(statement).scalar() is not None
+    else:
+        update_statement, history_from = build_status_move(
+            dossier_id, ancien_statut, nouveau_statut, user_id, commentaire, single_statement=False
+        )
+        moved = db.execute(update_statement).scalar() is not None
+        if moved:
+            db.execute(history_from(literal(dossier_id)))
+    if moved:
+        change_events.mark_changed(db, "dossiers", {dossier_id})
+        change_events.mark_changed(db, change_events.DOSSIER_STATUTS, {ancien_statut, nouveau_statut})
+    return moved
+
+
+def build_dossier_detail_query(dossier_id: int):
+    """
+    Build the SELECT behind get_dossier_detail(): the dossier joined to its
+    responsable, each collection then read by one SELECT ... IN, so the
+    parties, history, documents and actes are not multiplied together.
+    """
+    return select(Dossier).options(
+        joinedload(Dossier.responsable),
+        selectinload(Dossier.parties_associations).joinedload(DossierParties.client),
+        selectinload(Dossier.historique).joinedload(DossierHistorique.user),
+        selectinload(Dossier.documents),
+        selectinload(Dossier.actes)
+    ).where(Dossier.id == dossier_id)
+
+
+def get_dossier_detail(db, dossier_id: int) -> Optional[Dossier]:
+    """
+    Load a dossier with everything DossierDetailPage shows (responsable,
+    parties and their clients, history with users, documents, actes) in
+    five round trips at most, so rendering the tabs never triggers lazy loads.
+    """
+    return db.execute(build_dossier_detail_query(dossier_id)).scalars().first()
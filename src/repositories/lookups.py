@@ -0,0 +1,35 @@
+"""
+Hot single-row lookups. The statements are built once at import time with
+bind parameters, so each call skips statement construction and hits
+SQLAlchemy's compiled cache directly; on asyncpg they also reuse the
+server-side prepared statement (see DB_PREPARED_STATEMENT_CACHE_SIZE).
+
+Async handlers call them through `await db.run_sync(get_user_by_username, name)`.
+"""
+from typing import Optional
+from sqlalchemy import select, bindparam
+from src.models.user import User
+from src.models.dossier import Dossier
+from src.models.template import Template
+from src.models.acte import Acte
+
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_DOSSIER_BY_ID = select(Dossier).where(Dossier.id == bindparam("id"))
+_TEMPLATE_BY_ID = select(Template).where(Template.id == bindparam("id"))
+_ACTE_BY_ID = select(Acte).where(Acte.id == bindparam("id"))
+
+
+def get_user_by_username(db, username: str) -> Optional[User]:
+    return db.execute(_USER_BY_USERNAME, {"username": username}).scalars().first()
+
+
+def get_dossier(db, dossier_id: int) -> Optional[Dossier]:
+    return db.execute(_DOSSIER_BY_ID, {"id": dossier_id}).scalars().first()
+
+
+def get_template(db, template_id: int) -> Optional[Template]:
+    return db.execute(_TEMPLATE_BY_ID, {"id": template_id}).scalars().first()
+
+
+def get_acte(db, acte_id: int) -> Optional[Acte]:
+    return db.execute(_ACTE_BY_ID, {"id": acte_id}).scalars().first()
@@ -0,0 +1,148 @@
+import os
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import NamedTuple, Optional
+from sqlalchemy import select, delete, insert, func, text
+from src.models.dossier import Dossier, DossierHistorique
+from src.models.rollup import MonthlyRollup, RollupDirtyMonth, RollupWatermark
+from src.utils import change_events
+
+# Seconds between two refreshes run by the server (0: leave it to refresh_rollups.py in cron)
+ROLLUP_REFRESH_INTERVAL = float(os.getenv("ROLLUP_REFRESH_INTERVAL", "300"))
+MONTHLY = "monthly"
+
+
+class RollupRow(NamedTuple):
+    mois: str
+    type_dossier: str
+    dossiers_ouverts: int
+    dossiers_clotures: int
+    emoluments: Decimal
+    debours: Decimal
+
+
+def month_of(column, dialect: str):
+    """'YYYY-MM' of a date or datetime column"""
+    if dialect == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+
+def month_bounds(months) -> tuple[date, date]:
+    """First day of the earliest month and of the month after the latest one"""
+    first, last = min(months), max(months)
+    year, month = int(last[:4]), int(last[5:])
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return date(int(first[:4]), int(first[5:]), 1), end
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value or 0)).quantize(Decimal("0.01"))
+
+
+def _take_dirty_months(db) -> set[str]:
+    """
+    Dequeue the months marked by the triggers. Only the committed rows this
+    statement sees are removed: a month marked by a transaction still running
+    stays queued for the next refresh.
+    """
+    return set(db.scalars(delete(RollupDirtyMonth).returning(RollupDirtyMonth.mois)))
+
+
+def _recount(db, months: Optional[set[str]], dialect: str) -> list[RollupRow]:
+    """Rollup rows of `months` (every month when None), from range scans of dossiers and the history"""
+    totals = defaultdict(lambda: [0, 0, Decimal(0), Decimal(0)])
+
+    opened_month = month_of(Dossier.date_ouverture, dialect)
+    opened = select(opened_month, func.coalesce(Dossier.type_dossier, ""), func.count()).group_by(
+        opened_month, func.coalesce(Dossier.type_dossier, "")
+    )
+    closed_month = month_of(DossierHistorique.date_changement, dialect)
+    closed = (
+        select(
+            closed_month, func.coalesce(Dossier.type_dossier, ""), func.count(),
+            func.sum(Dossier.emoluments), func.sum(Dossier.debours),
+        )
+        .join(Dossier, Dossier.id == DossierHistorique.dossier_id)
+        .where(DossierHistorique.nouveau_statut == "CLOTURE", DossierHistorique.date_changement.isnot(None))
+        .group_by(closed_month, func.coalesce(Dossier.type_dossier, ""))
+    )
+    if months is not None:
+        start, end = month_bounds(months)
+        opened = opened.where(Dossier.date_ouverture >= start, Dossier.date_ouverture < end, opened_month.in_(months))
+        closed = closed.where(
+            DossierHistorique.date_changement >= start, DossierHistorique.date_changement < end,
+            closed_month.in_(months),
+        )
+
+    for mois, type_dossier, count in db.execute(opened):
+        totals[mois, type_dossier][0] = count
+    for mois, type_dossier, count, emoluments, debours in db.execute(closed):
+        totals[mois, type_dossier][1:] = [count, _money(emoluments), _money(debours)]
+    return [RollupRow(mois, type_dossier, *values) for (mois, type_dossier), values in sorted(totals.items())]
+
+
+def refresh_monthly_rollups(db, full: bool = False) -> list[str]:
+    """
+    Bring monthly_rollups up to date in the caller's transaction (commit
+    afterwards) and return the months rewritten. Only the months queued in
+    rollup_dirty_months are recomputed: the triggers queue them on every
+    insert, edit or deletion of a dossier or of its clôture, including the
+    month a dossier is moved out of. `full` (or a first run) rebuilds every
+    month.
+
+    Dossiers count in the month they were opened, fees in the month the
+    dossier was closed according to dossier_historique.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Concurrent refreshes (several workers, cron) run one after the other
+        db.execute(text("LOCK TABLE monthly_rollups IN EXCLUSIVE MODE"))
+    watermark = db.get(RollupWatermark, MONTHLY)
+
+    dirty = _take_dirty_months(db)
+    months = None if watermark is None or full else dirty
+    rows = [] if months == set() else _recount(db, months, dialect)
+
+    if months is None:
+        db.execute(delete(MonthlyRollup))
+    elif months:
+        db.execute(delete(MonthlyRollup).where(MonthlyRollup.mois.in_(months)))
+    if rows:
+        db.execute(insert(MonthlyRollup), [row._asdict() for row in rows])
+
+    refreshed_at = datetime.now(timezone.utc)
+    if watermark is None:
+        db.add(RollupWatermark(name=MONTHLY, refreshed_at=refreshed_at))
+    else:
+        watermark.refreshed_at = refreshed_at
+    db.flush()
+    months = sorted(months if months is not None else {row.mois for row in rows})
+    if months:
+        # Published with the commit, so open dashboards redraw their charts
+        change_events.mark_changed(db, "monthly_rollups", months)
+    return months
+
+
+def read_monthly_rollups(db, first_month: str, last_month: str) -> list[RollupRow]:
+    """Rollup rows from `first_month` to `last_month` included ('YYYY-MM'), by month then type"""
+    query = (
+        select(
+            MonthlyRollup.mois, MonthlyRollup.type_dossier, MonthlyRollup.dossiers_ouverts,
+            MonthlyRollup.dossiers_clotures, MonthlyRollup.emoluments, MonthlyRollup.debours,
+        )
+        .where(MonthlyRollup.mois >= first_month, MonthlyRollup.mois <= last_month)
+        .order_by(MonthlyRollup.mois, MonthlyRollup.type_dossier)
+    )
+    return [
+        RollupRow(mois, type_dossier, ouverts, clotures, _money(emoluments), _money(debours))
+        for mois, type_dossier, ouverts, clotures, emoluments, debours in db.execute(query)
+    ]
+
+
+def last_months(count: int, today: Optional[date] = None) -> list[str]:
+    """The `count` months up to the current one, oldest first, as 'YYYY-MM'"""
+    today = today or date.today()
+    index = today.year * 12 + today.month - 1
+    return [f"{i // 12:04d}-{i % 12 + 1:02d}" for i in range(index - count + 1, index + 1)]
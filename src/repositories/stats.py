@@ -0,0 +1,84 @@
+import logging
+from typing import NamedTuple
+from decimal import Decimal
+from sqlalchemy import select, delete, insert, text, union_all, literal, func, literal_column
+from src.models.stats import StatsCounter, counter_keys
+
+logger = logging.getLogger("agen_ohada.stats")
+
+
+def _money(value) -> Decimal:
+    return Decimal(str(value)).quantize(Decimal("0.01"))
+
+
+class CounterValue(NamedTuple):
+    count: int
+    emoluments: Decimal
+    debours: Decimal
+
+
+def read_counters(db, dimension: str) -> dict[str, CounterValue]:
+    """Counters of one dimension ("statut", "type", "responsable", "mois", "acte_statut"), by key"""
+    rows = db.execute(
+        select(StatsCounter.key, StatsCounter.count, StatsCounter.emoluments, StatsCounter.debours)
+        .where(StatsCounter.dimension == dimension, StatsCounter.count != 0)
+    )
+    return {
+        key: CounterValue(count, _money(emoluments), _money(debours))
+        for key, count, emoluments, debours in rows
+    }
+
+
+def build_counters_recount_query(dialect: str):
+    """Every counter recomputed from the base tables, as (dimension, key, count, emoluments, debours)"""
+    parts = []
+    for table in ("dossiers", "actes"):
+        for dimension, key in counter_keys(table, table, dialect):
+            key = literal_column(key)
+            if table == "dossiers":
+                amounts = (
+                    func.coalesce(func.sum(literal_column("dossiers.emoluments")), 0),
+                    func.coalesce(func.sum(literal_column("dossiers.debours")), 0),
+                )
+            else:
+                amounts = (literal(0), literal(0))
+            parts.append(
+                select(literal(dimension), key, func.count(), *amounts)
+                .select_from(StatsCounter.metadata.tables[table]).group_by(key)
+            )
+    return union_all(*parts)
+
+
+def reconcile_stats_counters(db) -> int:
+    """
+    Rebuild stats_counters from dossiers and actes in the caller's transaction
+    (commit afterwards) and return the number of counters that had drifted.
+    On PostgreSQL the table is locked first: writers wait for the rebuild,
+    so no increment is lost or counted twice.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        db.execute(text("LOCK TABLE stats_counters IN EXCLUSIVE MODE"))
+
+    current = {
+        (dimension, key): (count, _money(emoluments), _money(debours))
+        for dimension, key, count, emoluments, debours in db.execute(
+            select(StatsCounter.dimension, StatsCounter.key, StatsCounter.count,
+                   StatsCounter.emoluments, StatsCounter.debours).where(StatsCounter.count != 0)
+        )
+    }
+    expected = {
+        (dimension, key): (count, _money(emoluments), _money(debours))
+        for dimension, key, count, emoluments, debours in db.execute(build_counters_recount_query(dialect))
+    }
+    drifted = {counter for counter in current.keys() | expected.keys() if current.get(counter) != expected.get(counter)}
+
+    db.execute(delete(StatsCounter))
+    if expected:
+        db.execute(insert(StatsCounter), [
+            {"dimension": dimension, "key": key, "count": count, "emoluments": emoluments, "debours": debours}
+            for (dimension, key), (count, emoluments, debours) in expected.items()
+        ])
+    if drifted:
+        logger.warning("stats_counters: %d counter(s) repaired: %s", len(drifted), sorted(drifted)[:20])
+    return len(drifted)
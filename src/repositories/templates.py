@@ -0,0 +1,39 @@
+from typing import NamedTuple, Optional
+from sqlalchemy import select, func
+from src.models.template import Template
+
+# Length of the description excerpt shown in the template list
+DESCRIPTION_EXCERPT_LENGTH = 120
+
+
+class TemplateOption(NamedTuple):
+    """Entry of the template dropdown in ActeEditPage."""
+    id: int
+    nom: str
+
+
+class TemplateListRow(NamedTuple):
+    """Card of the template library in TemplatesPage."""
+    id: int
+    nom: str
+    type_acte: str
+    description: Optional[str]
+
+
+def list_template_options(db) -> list[TemplateOption]:
+    """Return id and name of every template, without the `contenu` body"""
+    result = db.execute(select(Template.id, Template.nom).order_by(Template.nom))
+    return [TemplateOption._make(row) for row in result]
+
+
+def list_templates(db) -> list[TemplateListRow]:
+    """Return the template library with a truncated description"""
+    result = db.execute(
+        select(
+            Template.id,
+            Template.nom,
+            Template.type_acte,
+            func.substr(Template.description, 1, DESCRIPTION_EXCERPT_LENGTH),
+        ).order_by(Template.nom)
+    )
+    return [TemplateListRow._make(row) for row in result]
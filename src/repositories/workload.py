@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+from sqlalchemy import select, func, union_all, literal
+from src.models.acte import Acte, StatutActe
+from src.models.dossier import Dossier
+from src.models.formalite import Formalite, STATUTS_FORMALITE_EN_ATTENTE
+from src.models.user import User
+from src.repositories.dashboard import STATUTS_DOSSIER_TERMINES
+
+# A dossier still open this many days after date_ouverture is late
+DOSSIER_DELAI_JOURS = 90
+# A formalité deposited this many days ago and still pending is late
+FORMALITE_DELAI_JOURS = 30
+
+
+class WorkloadRow(NamedTuple):
+    """Load of one responsable for one dossier status (None: dossiers nobody is assigned)"""
+    responsable_id: Optional[int]
+    username: Optional[str]
+    role: Optional[str]
+    statut: str
+    dossiers: int
+    dossiers_en_retard: int
+    actes_brouillon: int
+    formalites_en_retard: int
+
+
+def build_workload_query(today: Optional[date] = None):
+    """
+    Build the single SELECT behind the workload view: dossiers in progress,
+    draft actes and late items per (responsable, dossier status). Each part
+    is read through an index on its status (idx_dossiers_responsable,
+    idx_actes_statut, idx_formalites_statut) before the totals are merged.
+    """
+    today = today or date.today()
+    dossier_limit = today - timedelta(days=DOSSIER_DELAI_JOURS)
+    formalite_limit = today - timedelta(days=FORMALITE_DELAI_JOURS)
+    statut = func.coalesce(Dossier.statut, "")
+    en_cours = statut.notin_(STATUTS_DOSSIER_TERMINES)
+
+    dossiers = select(
+        Dossier.responsable_id, statut.label("statut"),
+        func.count().label("dossiers"),
+        func.count().filter(Dossier.date_ouverture < dossier_limit).label("dossiers_en_retard"),
+        literal(0).label("actes_brouillon"), literal(0).label("formalites_en_retard"),
+    ).where(en_cours).group_by(Dossier.responsable_id, statut)
+    actes = (
+        select(Dossier.responsable_id, statut, literal(0), literal(0), func.count(), literal(0))
+        .select_from(Acte).join(Dossier, Dossier.id == Acte.dossier_id)
+        .where(Acte.statut == StatutActe.BROUILLON.value, en_cours)
+        .group_by(Dossier.responsable_id, statut)
+    )
+    formalites = (
+        select(Dossier.responsable_id, statut, literal(0), literal(0), literal(0), func.count())
+        .select_from(Formalite).join(Dossier, Dossier.id == Formalite.dossier_id)
+        .where(
+            Formalite.statut.in_(STATUTS_FORMALITE_EN_ATTENTE),
+            Formalite.date_depot < formalite_limit,
+            en_cours,
+        )
+        .group_by(Dossier.responsable_id, statut)
+    )
+    parts = union_all(dossiers, actes, formalites).subquery("parts")
+
+    return (
+        select(
+            parts.c.responsable_id, User.username, User.role, parts.c.statut,
+            func.sum(parts.c.dossiers).label("dossiers"),
+            func.sum(parts.c.dossiers_en_retard).label("dossiers_en_retard"),
+            func.sum(parts.c.actes_brouillon).label("actes_brouillon"),
+            func.sum(parts.c.formalites_en_retard).label("formalites_en_retard"),
+        )
+        .select_from(parts)
+        .outerjoin(User, User.id == parts.c.responsable_id)
+        .group_by(parts.c.responsable_id, User.username, User.role, parts.c.statut)
+        .order_by(User.username, parts.c.responsable_id, parts.c.statut)
+    )
+
+
+def get_workload(db, today: Optional[date] = None) -> list[WorkloadRow]:
+    """Compute the workload rows (uncached, see WorkloadPage for the shared cache)"""
+    return [
+        WorkloadRow(
+            row.responsable_id, row.username, row.role, row.statut,
+            int(row.dossiers), int(row.dossiers_en_retard), int(row.actes_brouillon), int(row.formalites_en_retard),
+        )
+        for row in db.execute(build_workload_query(today))
+    ]
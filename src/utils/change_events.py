@@ -0,0 +1,111 @@
+"""
+In-process change notifications. Every committed ORM change is published per
+table ("dossiers", "actes", ...) with the primary keys that changed, so pages
+holding cached query results can invalidate them instead of re-querying on
+each render:
+
+    unsubscribe = change_events.subscribe("dossiers", self.on_dossiers_changed)
+
+Changes to the rows shown inside a dossier (actes, documents, ...) are also
+published under DOSSIER_CONTENTS with the ids of their dossiers, so a detail
+page reloads only for its own dossier, and the statuses a written dossier
+left or entered under DOSSIER_STATUTS (with the statut values instead of
+ids), so a kanban column reloads only when its status is touched.
+src.utils.notify_bus republishes the
+changes committed by the other server processes.
+"""
+import logging
+import threading
+import weakref
+from collections import defaultdict
+from sqlalchemy import event, inspect
+
+logger = logging.getLogger("agen_ohada.change_events")
+
+_lock = threading.Lock()
+_subscribers = defaultdict(list)  # table name -> callback references
+
+DOSSIER_CONTENTS = "dossier_contents"
+# Tables whose rows belong to a dossier through their dossier_id column
+DOSSIER_CONTENT_TABLES = ("actes", "documents", "dossier_parties", "dossier_historique", "formalites")
+DOSSIER_STATUTS = "dossier_statuts"
+
+
+def subscribe(table: str, callback):
+    """
+    Call `callback(ids)` after each commit touching `table`. Returns the
+    function that removes the subscription (call it on unmount). Bound
+    methods are held weakly, so a component dropped without unmounting does
+    not stay alive through the bus.
+    """
+    ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+    with _lock:
+        _subscribers[table].append(ref)
+
+    def unsubscribe():
+        with _lock:
+            if ref in _subscribers[table]:
+                _subscribers[table].remove(ref)
+    return unsubscribe
+
+
+def publish(table: str, ids: set):
+    """Notify the subscribers of `table`; a failing subscriber never breaks the caller"""
+    with _lock:
+        refs = list(_subscribers[table])
+    for ref in refs:
+        callback = ref()
+        if callback is None:
+            with _lock:
+                if ref in _subscribers[table]:
+                    _subscribers[table].remove(ref)
+            continue
+        try:
+            callback(ids)
+        except Exception:
+            logger.exception("Change subscriber %r failed for %s", callback, table)
+
+
+def mark_changed(session, table: str, ids):
+    """
+    Record rows written with Core statements (UPDATE/INSERT that bypass the
+    ORM flush) so they are published with the session's next commit.
+    """
+    session.info.setdefault("changed_rows", defaultdict(set))[table].update(ids)
+
+
+def _after_flush(session, flush_context):
+    changed = session.info.setdefault("changed_rows", defaultdict(set))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        key = state.mapper.primary_key_from_instance(obj)
+        changed[obj.__table__.name].add(key[0] if len(key) == 1 else tuple(key))
+        # Read from the loaded state: no lazy load inside the flush
+        dossier_id = state.dict.get("dossier_id") if obj.__table__.name in DOSSIER_CONTENT_TABLES else None
+        if dossier_id is not None:
+            changed[DOSSIER_CONTENTS].add(dossier_id)
+        if obj.__table__.name == "dossiers":
+            changed[DOSSIER_STATUTS].update(_statuts(state))
+
+
+def _statuts(state) -> set:
+    """Status of a flushed dossier before and after the flush (history is not reset yet)"""
+    history = state.attrs.statut.history
+    return {statut for statut in (*history.added, *history.unchanged, *history.deleted) if statut is not None}
+
+
+def _after_commit(session):
+    changed = session.info.pop("changed_rows", None)
+    for table, ids in (changed or {}).items():
+        publish(table, ids)
+
+
+def _after_rollback(session):
+    session.info.pop("changed_rows", None)
+
+
+def install(session_class):
+    """Publish the changes committed by every session of `session_class`"""
+    event.listen(session_class, "after_flush", _after_flush)
+    event.listen(session_class, "after_commit", _after_commit)
+    event.listen(session_class, "after_rollback", _after_rollback)
@@ -0,0 +1,47 @@
+"""
+Latest-wins execution for queries driven by user input (search boxes,
+filters): only the most recent request runs to completion and applies its
+result, older ones are cancelled or discarded.
+"""
+import asyncio
+
+
+class LatestOnly:
+    """
+    Each submit() cancels the pending or in-flight request, optionally waits
+    `delay` seconds for the input to settle, awaits `fetch()` and hands the
+    result to `apply()` only if no newer request was submitted meanwhile.
+
+        self._loads.submit(fetch, apply, delay=0.3, create_task=self.session.create_task)
+    """
+
+    def __init__(self):
+        self._task = None
+        self._generation = 0
+
+    def submit(self, fetch, apply, delay: float = 0.0, create_task=None) -> asyncio.Task:
+        self.cancel()
+        self._generation += 1
+        generation = self._generation
+
+        async def run():
+            if delay > 0:
+                await asyncio.sleep(delay)
+            result = await fetch()
+            # A request that finished late must not overwrite newer results
+            if generation == self._generation:
+                apply(result)
+
+        self._task = (create_task or asyncio.ensure_future)(run())
+        return self._task
+
+    def cancel(self):
+        """Drop the current request, whether still waiting or already querying"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self._generation += 1
+
+    @property
+    def pending(self) -> bool:
+        return self._task is not None and not self._task.done()
@@ -0,0 +1,155 @@
+"""
+Cross-process change notifications over PostgreSQL LISTEN/NOTIFY.
+
+Triggers on the tables below NOTIFY every committed row change (PostgreSQL
+delivers notifications at commit, never for rolled back transactions). One
+listener task per server process receives them and republishes them on
+src.utils.change_events, so the pages and caches already subscribed there
+refresh for changes made by colleagues on other server processes as well.
+
+Each connection of the writing engines tags itself with ORIGIN; the listener
+skips its own process' notifications, already published in-process when the
+session committed.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+import asyncpg
+from sqlalchemy import DDL, event, make_url
+from src.utils import change_events
+
+logger = logging.getLogger("agen_ohada.notify_bus")
+
+CHANNEL = "agen_ohada_changes"
+ORIGIN = uuid.uuid4().hex
+# Tables whose committed changes are announced to the other processes
+NOTIFIED_TABLES = ("dossiers", "actes", "documents", "formalites")
+# Notifications arriving within this delay are published together, one call per table
+FANOUT_DELAY = 0.1
+RECONNECT_DELAY = 5.0
+
+NOTIFY_DDL = [
+    f"""CREATE OR REPLACE FUNCTION agen_notify_change() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        data jsonb;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN data := to_jsonb(OLD); ELSE data := to_jsonb(NEW); END IF;
+        PERFORM pg_notify('{CHANNEL}', json_build_object(
+            'table', TG_TABLE_NAME,
+            'id', data->'id',
+            'dossier_id', data->'dossier_id',
+            'statut', data->'statut',
+            'ancien_statut', CASE WHEN TG_OP = 'UPDATE' THEN to_jsonb(OLD)->'statut' END,
+            'origin', current_setting('agen_ohada.origin', true)
+        )::text);
+        RETURN NULL;
+    END $$""",
+]
+for _table in NOTIFIED_TABLES:
+    NOTIFY_DDL += [
+        f"DROP TRIGGER IF EXISTS trg_notify_change ON {_table}",
+        f"""CREATE TRIGGER trg_notify_change AFTER INSERT OR UPDATE OR DELETE ON {_table}
+        FOR EACH ROW EXECUTE FUNCTION agen_notify_change()""",
+    ]
+
+
+def install(metadata, *engines):
+    """
+    Create the triggers with the metadata (same DDL as
+    migrations/phase13_notify_changes.sql) and tag the connections of the
+    PostgreSQL `engines` with ORIGIN.
+    """
+    for statement in NOTIFY_DDL:
+        event.listen(metadata, "after_create", DDL(statement.replace("%", "%%")).execute_if(dialect="postgresql"))
+    for engine in engines:
+        if engine.dialect.name == "postgresql":
+            event.listen(engine, "connect", _tag_connection)
+
+
+def _tag_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"SELECT set_config('agen_ohada.origin', '{ORIGIN}', false)")
+    cursor.close()
+    # Ends the implicit transaction, the setting then lasts as long as the connection
+    dbapi_connection.commit()
+
+
+class Fanout:
+    """
+    Collects notification payloads and publishes them per table on
+    change_events, plus the dossiers whose contents changed and the statuses
+    the dossiers left or entered.
+    """
+
+    def __init__(self, origin: str = ORIGIN):
+        self.origin = origin
+        self.pending = defaultdict(set)
+
+    def feed(self, payload: str) -> bool:
+        """Record one notification; False when it is ignored (own process, unreadable)"""
+        try:
+            change = json.loads(payload)
+        except ValueError:
+            logger.warning("Unreadable change notification: %r", payload)
+            return False
+        table = change.get("table")
+        if table is None or change.get("origin") == self.origin:
+            return False
+        if change.get("id") is not None:
+            self.pending[table].add(change["id"])
+        if table in change_events.DOSSIER_CONTENT_TABLES and change.get("dossier_id") is not None:
+            self.pending[change_events.DOSSIER_CONTENTS].add(change["dossier_id"])
+        if table == "dossiers":
+            self.pending[change_events.DOSSIER_STATUTS].update(
+                statut for statut in (change.get("statut"), change.get("ancien_statut")) if statut is not None
+            )
+        return True
+
+    def flush(self):
+        pending, self.pending = self.pending, defaultdict(set)
+        for table, ids in pending.items():
+            change_events.publish(table, ids)
+
+
+async def listen(database_url: str):
+    """
+    Listener task of the server process: LISTEN on CHANNEL and republish
+    the other processes' changes until cancelled, reconnecting after a lost
+    connection. Changes committed while disconnected are not replayed; the
+    cache TTLs bound how long they stay unseen.
+    """
+    dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+    loop = asyncio.get_running_loop()
+    fanout = Fanout()
+    scheduled = None
+
+    def flush():
+        nonlocal scheduled
+        scheduled = None
+        fanout.flush()
+
+    def on_notification(_connection, _pid, _channel, payload):
+        nonlocal scheduled
+        if fanout.feed(payload) and scheduled is None:
+            scheduled = loop.call_later(FANOUT_DELAY, flush)
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: closed.set())
+            await connection.add_listener(CHANNEL, on_notification)
+            logger.info("Listening for changes on %s", CHANNEL)
+            await closed.wait()
+            logger.warning("Change notification connection lost, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Change notification listener failed, retrying in %.0f s", RECONNECT_DELAY)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+        await asyncio.sleep(RECONNECT_DELAY)
@@ -0,0 +1,58 @@
+"""
+Incremental spreadsheet writers for exports: rows arrive in batches (e.g.
+from a server-side cursor) and are written as they come, so the size of an
+export never decides the memory used to produce it.
+"""
+import csv
+import os
+import tempfile
+import time
+from pathlib import Path
+from openpyxl import Workbook
+
+# Where generated files wait to be downloaded
+EXPORT_DIR = Path(os.getenv("EXPORT_DIR", os.path.join(tempfile.gettempdir(), "agen_ohada_exports")))
+# Exports older than this (in seconds) are deleted when a new one is created
+EXPORT_MAX_AGE = 3600
+
+
+def write_csv(path, header: list[str], batches):
+    """CSV as read by a French Excel: UTF-8 with BOM, ';' separated"""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(header)
+        for batch in batches:
+            writer.writerows(batch)
+
+
+def write_xlsx(path, header: list[str], batches, sheet_title: str = "Export"):
+    """XLSX through openpyxl's write-only mode, which streams rows to disk"""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_title)
+    sheet.append(header)
+    for batch in batches:
+        for row in batch:
+            sheet.append(row)
+    workbook.save(path)
+
+
+# format -> (writer, media type)
+EXPORT_FORMATS = {
+    "csv": (write_csv, "text/csv"),
+    "xlsx": (write_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def new_export_path(suffix: str) -> Path:
+    """Fresh file in EXPORT_DIR, removing the exports left over from earlier downloads"""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    expired = time.time() - EXPORT_MAX_AGE
+    for old in EXPORT_DIR.iterdir():
+        try:
+            if old.stat().st_mtime < expired:
+                old.unlink()
+        except OSError:
+            pass
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=EXPORT_DIR)
+    os.close(fd)
+    return Path(path)
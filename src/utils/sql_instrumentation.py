@@ -0,0 +1,207 @@
+"""
+SQL instrumentation: attributes every statement to the Rio interaction that
+issued it (e.g. "DossierDetailPage.load_dossier"), measures its duration and
+row count, keeps per-interaction counters and logs slow statements.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Statements slower than this (in milliseconds) go to the slow-query log
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+# Optional file for the slow-query log (stderr when empty)
+DB_SLOW_QUERY_LOG = os.getenv("DB_SLOW_QUERY_LOG", "")
+# Prefix statements with /* label */ so they can be traced in the PostgreSQL logs
+DB_SQL_COMMENT_TAGS = os.getenv("DB_SQL_COMMENT_TAGS", "False").lower() in ("1", "true", "yes")
+
+UNTAGGED = "<untagged>"
+
+slow_query_log = logging.getLogger("agen_ohada.slow_queries")
+if not slow_query_log.handlers:
+    _handler = logging.FileHandler(DB_SLOW_QUERY_LOG, encoding="utf-8") if DB_SLOW_QUERY_LOG else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s [SLOW] %(message)s"))
+    slow_query_log.addHandler(_handler)
+    slow_query_log.setLevel(logging.WARNING)
+    slow_query_log.propagate = False
+
+
+class _Interaction:
+    """One execution of a labelled handler, counting the queries it issues."""
+    __slots__ = ("label", "queries")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.queries = 0
+
+
+class QueryCounter:
+    """Statements captured by count_queries()."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+_current_interaction: ContextVar = ContextVar("current_interaction", default=None)
+_active_counters = []
+
+_stats_lock = threading.Lock()
+_stats = {}  # label -> counters
+
+
+def _label_stats(label: str) -> dict:
+    stats = _stats.get(label)
+    if stats is None:
+        stats = _stats[label] = {
+            "calls": 0,
+            "queries": 0,
+            "max_queries_per_call": 0,
+            "rows": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0,
+            "slow_queries": 0,
+        }
+    return stats
+
+
+def current_label() -> str:
+    """Label of the interaction running in the current context"""
+    current = _current_interaction.get()
+    return current.label if current else UNTAGGED
+
+
+def caller_label(depth: int = 1) -> str:
+    """
+    Build a "Component.method" label from the calling frame. `depth` counts
+    frames above the caller of this function.
+    """
+    frame = sys._getframe(depth + 1)
+    owner = frame.f_locals.get("self")
+    if owner is not None:
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    return frame.f_code.co_name
+
+
+@contextmanager
+def interaction(label: str):
+    """
+    Attribute every statement executed inside the block to `label`. Nested
+    interactions take over until they exit.
+    """
+    current = _Interaction(label)
+    token = _current_interaction.set(current)
+    try:
+        yield current
+    finally:
+        _current_interaction.reset(token)
+        with _stats_lock:
+            stats = _label_stats(label)
+            stats["calls"] += 1
+            stats["max_queries_per_call"] = max(stats["max_queries_per_call"], current.queries)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    if DB_SQL_COMMENT_TAGS:
+        label = current_label().replace("*/", "")
+        statement = f"/* {label} */ {statement}"
+    return statement, parameters
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    rowcount = getattr(cursor, "rowcount", -1)
+    rows = rowcount if rowcount and rowcount > 0 else 0
+
+    current = _current_interaction.get()
+    label = current.label if current else UNTAGGED
+    if current is not None:
+        current.queries += 1
+    for counter in _active_counters:
+        counter.statements.append(statement)
+
+    with _stats_lock:
+        stats = _label_stats(label)
+        stats["queries"] += 1
+        stats["rows"] += rows
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        if elapsed_ms >= DB_SLOW_QUERY_MS:
+            stats["slow_queries"] += 1
+
+    if elapsed_ms >= DB_SLOW_QUERY_MS:
+        slow_query_log.warning(
+            "%.1f ms | %s | rows=%s | %s",
+            elapsed_ms, label, rowcount, " ".join(statement.split())
+        )
+
+
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+
+@contextmanager
+def count_queries():
+    """Capture every statement executed on an instrumented engine inside the block"""
+    counter = QueryCounter()
+    _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _active_counters.remove(counter)
+
+
+@contextmanager
+def assert_max_queries(limit: int):
+    """
+    Fail with AssertionError when the block issues more than `limit`
+    statements, e.g. because a relationship fell back to lazy loading:
+
+        with assert_max_queries(5):
+            get_dossier_detail(db, dossier_id)
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > limit:
+        executed = "\n".join(
+            f"  {i}. {' '.join(statement.split())}" for i, statement in enumerate(counter.statements, 1)
+        )
+        raise AssertionError(f"Expected at most {limit} queries, {counter.count} executed:\n{executed}")
+
+
+def install(engine):
+    """Attach the instrumentation listeners to a (sync) Engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute, retval=True)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def get_query_stats() -> dict:
+    """
+    Per-interaction counters: calls, queries, rows, total/max duration in ms,
+    slow statements and the worst query count seen for a single call. A high
+    `max_queries_per_call` usually points at an N+1 pattern.
+    """
+    with _stats_lock:
+        snapshot = {label: dict(stats) for label, stats in _stats.items()}
+    for stats in snapshot.values():
+        stats["avg_ms"] = stats["total_ms"] / stats["queries"] if stats["queries"] else 0.0
+        stats["queries_per_call"] = stats["queries"] / stats["calls"] if stats["calls"] else float(stats["queries"])
+    return snapshot
+
+
+def reset_query_stats():
+    """Clear all per-interaction counters"""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,91 @@
+"""
+Small in-process cache with a time-to-live, shared by every Rio session of
+the worker. Used for aggregate figures that many users read at once and that
+may be a few seconds stale (facet counts, dashboard KPIs).
+"""
+import asyncio
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Map of key -> value expiring `ttl` seconds after it was loaded. At most
+    `maxsize` keys are kept, the oldest loaded is dropped first.
+
+        counts = cache.get_or_load(key, lambda: run_aggregate(db))
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (expires_at, value)
+        self._loading = {}  # key -> task shared by concurrent get_or_load_async() misses
+        self._generation = 0  # bumped by clear(), so a load started before it is not stored
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return default
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def _store_loaded(self, key, value, generation):
+        """Store a loaded value unless clear() was called since the load started"""
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value)
+
+    def get_or_load(self, key, loader):
+        """Cached value for `key`, calling `loader()` on a miss or after expiry"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            generation = self._generation
+            value = loader()
+            self._store_loaded(key, value, generation)
+        return value
+
+    async def get_or_load_async(self, key, loader):
+        """
+        Async get_or_load(): on a miss, concurrent callers share a single
+        `await loader()`, so a burst of sessions opening the same page costs
+        one query. A caller cancelled while waiting does not cancel the load.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        task = self._loading.get(key)
+        if task is None:
+            generation = self._generation
+
+            async def load():
+                try:
+                    result = await loader()
+                finally:
+                    if self._loading.get(key) is asyncio.current_task():
+                        del self._loading[key]
+                self._store_loaded(key, result, generation)
+                return result
+
+            task = self._loading[key] = asyncio.ensure_future(load())
+        return await asyncio.shield(task)
+
+    def clear(self, *_):
+        """Drop every entry; accepts and ignores change-event arguments"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._loading.clear()
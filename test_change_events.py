@@ -0,0 +1,85 @@
+"""
+Change notifications: committed ORM changes are published per table (and per
+parent dossier for its contents), rolled back ones are not.
+"""
+from src.models.acte import Acte
+from src.models.dossier import Dossier
+from src.utils import change_events
+
+
+def _collect(table):
+    received = []
+
+    def on_change(ids):
+        received.append(ids)
+    return received, on_change
+
+
+def test_commit_publishes_changed_ids(db_session, seeded_dossier):
+    received, on_change = _collect("dossiers")
+    unsubscribe = change_events.subscribe("dossiers", on_change)
+    try:
+        dossier = db_session.get(Dossier, seeded_dossier["dossier_id"])
+        dossier.statut = "SIGNATURE"
+        db_session.commit()
+    finally:
+        unsubscribe()
+    assert received == [{seeded_dossier["dossier_id"]}]
+
+
+def test_rollback_publishes_nothing(db_session, seeded_dossier):
+    received, on_change = _collect("dossiers")
+    unsubscribe = change_events.subscribe("dossiers", on_change)
+    try:
+        dossier = db_session.get(Dossier, seeded_dossier["dossier_id"])
+        dossier.statut = "SIGNATURE"
+        db_session.flush()
+        db_session.rollback()
+    finally:
+        unsubscribe()
+    assert received == []
+
+
+def test_unsubscribe_and_failing_subscribers(db_session, seeded_dossier):
+    received, on_change = _collect("dossiers")
+
+    def broken(ids):
+        raise RuntimeError("boom")
+
+    unsubscribe_broken = change_events.subscribe("dossiers", broken)
+    change_events.subscribe("dossiers", on_change)()
+    try:
+        dossier = db_session.get(Dossier, seeded_dossier["dossier_id"])
+        dossier.statut = "CLOTURE"
+        db_session.commit()  # the failing subscriber must not break the commit
+    finally:
+        unsubscribe_broken()
+    assert received == []
+
+
+def test_dossier_contents_publish_the_parent_dossier(db_session, seeded_dossier):
+    received, on_change = _collect(change_events.DOSSIER_CONTENTS)
+    unsubscribe = change_events.subscribe(change_events.DOSSIER_CONTENTS, on_change)
+    try:
+        db_session.add(Acte(dossier_id=seeded_dossier["dossier_id"], titre="Nouvel acte", statut="BROUILLON"))
+        db_session.commit()
+    finally:
+        unsubscribe()
+    assert received == [{seeded_dossier["dossier_id"]}]
+
+
+def test_dossier_writes_publish_their_statuts(db_session, seeded_dossier):
+    received, on_change = _collect(change_events.DOSSIER_STATUTS)
+    unsubscribe = change_events.subscribe(change_events.DOSSIER_STATUTS, on_change)
+    try:
+        dossier = db_session.get(Dossier, seeded_dossier["dossier_id"])
+        ancien = dossier.statut
+        dossier.statut = "SIGNATURE"
+        db_session.commit()
+        dossier.intitule = "Intitulé modifié"
+        db_session.commit()
+        db_session.add(Dossier(numero_dossier="STAT-1", intitule="Nouveau"))
+        db_session.commit()
+    finally:
+        unsubscribe()
+    assert received == [{ancien, "SIGNATURE"}, {"SIGNATURE"}, {"OUVERT"}]
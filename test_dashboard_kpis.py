@@ -0,0 +1,39 @@
+"""
+Dashboard KPIs: one aggregate statement over dossiers, actes and
+formalites.
+"""
+from datetime import date
+from decimal import Decimal
+from src.models.acte import Acte
+from src.models.dossier import Dossier
+from src.models.formalite import Formalite
+from src.repositories.dashboard import get_dashboard_kpis
+
+
+def test_kpis_come_from_one_statement(db_session, assert_max_queries):
+    before = get_dashboard_kpis(db_session)
+
+    dossiers = [
+        Dossier(numero_dossier="KPI-1", intitule="En cours", statut="INSTRUCTION", date_ouverture=date.today(),
+                emoluments=Decimal("150000"), debours=Decimal("20000")),
+        Dossier(numero_dossier="KPI-2", intitule="Clos", statut="CLOTURE", date_ouverture=date.today(),
+                emoluments=Decimal("50000")),
+    ]
+    db_session.add_all(dossiers)
+    db_session.flush()
+    db_session.add_all([
+        Acte(dossier_id=dossiers[0].id, titre="A signer", statut="FINALISE"),
+        Acte(dossier_id=dossiers[0].id, titre="Brouillon", statut="BROUILLON"),
+        Formalite(dossier_id=dossiers[1].id, type_formalite="ENREGISTREMENT", statut="A_FAIRE"),
+        Formalite(dossier_id=dossiers[1].id, type_formalite="PUBLICITE_FONCIERE", statut="TERMINEE"),
+    ])
+    db_session.commit()
+    db_session.connection()
+
+    with assert_max_queries(1):
+        after = get_dashboard_kpis(db_session)
+    assert after.dossiers_en_cours - before.dossiers_en_cours == 1
+    assert after.actes_a_signer - before.actes_a_signer == 1
+    assert after.formalites_en_attente - before.formalites_en_attente == 1
+    assert after.emoluments - before.emoluments == Decimal("200000")
+    assert after.debours - before.debours == Decimal("20000")
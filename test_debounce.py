@@ -0,0 +1,73 @@
+"""
+LatestOnly: debounced, cancellable loads where only the newest result is applied.
+"""
+import asyncio
+from src.utils.debounce import LatestOnly
+
+
+def test_burst_of_submits_runs_only_the_last():
+    fetched, applied = [], []
+
+    async def scenario():
+        loads = LatestOnly()
+        for term in ["s", "su", "suc", "succession"]:
+            async def fetch(term=term):
+                fetched.append(term)
+                return term
+            task = loads.submit(fetch, applied.append, delay=0.05)
+            await asyncio.sleep(0.01)  # typing faster than the debounce delay
+        await task
+
+    asyncio.run(scenario())
+    assert fetched == ["succession"]
+    assert applied == ["succession"]
+
+
+def test_in_flight_query_is_cancelled_by_newer_one():
+    applied, cancelled = [], []
+
+    async def scenario():
+        loads = LatestOnly()
+
+        async def slow_fetch():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "ancien"
+
+        async def fast_fetch():
+            return "nouveau"
+
+        loads.submit(slow_fetch, applied.append)
+        await asyncio.sleep(0.01)
+        await loads.submit(fast_fetch, applied.append)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert cancelled == [True]
+    assert applied == ["nouveau"]
+
+
+def test_stale_result_is_discarded():
+    applied = []
+
+    async def scenario():
+        loads = LatestOnly()
+
+        async def stubborn_fetch():
+            # A driver that finishes its query despite the cancellation
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                pass
+            return "ancien"
+
+        first = loads.submit(stubborn_fetch, applied.append)
+        await asyncio.sleep(0)
+        loads.cancel()
+        await first
+
+    asyncio.run(scenario())
+    assert applied == []
@@ -0,0 +1,58 @@
+"""
+Spreadsheet export of the dossier list: same rows and order as the list
+for the current filters, financial columns included, fetched and written
+batch by batch.
+"""
+import csv
+from datetime import date, timedelta
+from decimal import Decimal
+import pytest
+from openpyxl import load_workbook
+from src.models.dossier import Dossier
+from src.repositories.dossiers import EXPORT_COLUMNS, iter_dossier_export
+from src.utils.spreadsheet import write_csv, write_xlsx
+
+
+@pytest.fixture
+def export_dossiers(db_session):
+    db_session.add_all(
+        Dossier(numero_dossier=f"EXP-{i:02d}", intitule=f"Export {i}",
+                type_dossier="VENTE" if i % 2 else "DONATION", statut="OUVERT",
+                date_ouverture=date.today() - timedelta(days=i),
+                montant_acte=Decimal("1000.50") * i, emoluments=Decimal("25.00"), debours=None)
+        for i in range(7)
+    )
+    db_session.commit()
+    db_session.connection()
+
+
+def test_export_streams_fixed_size_batches_in_list_order(db_session, export_dossiers):
+    batches = list(iter_dossier_export(db_session, search="EXP-", batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    rows = [row for batch in batches for row in batch]
+    assert [row[0] for row in rows] == [f"EXP-{i:02d}" for i in range(7)]
+    assert len(rows[0]) == len(EXPORT_COLUMNS)
+
+
+def test_export_keeps_filters_and_sort(db_session, export_dossiers):
+    rows = [row for batch in iter_dossier_export(db_session, "EXP-", "VENTE", sort="numero") for row in batch]
+    assert [row[0] for row in rows] == ["EXP-01", "EXP-03", "EXP-05"]
+
+
+def test_csv_and_xlsx_writers(db_session, export_dossiers, tmp_path):
+    header = list(EXPORT_COLUMNS)
+    write_csv(tmp_path / "d.csv", header, iter_dossier_export(db_session, "EXP-", batch_size=2))
+    write_xlsx(tmp_path / "d.xlsx", header, iter_dossier_export(db_session, "EXP-", batch_size=2))
+
+    with open(tmp_path / "d.csv", encoding="utf-8-sig", newline="") as f:
+        lines = list(csv.reader(f, delimiter=";"))
+    assert lines[0] == header
+    assert len(lines) == 8
+    assert lines[2][0] == "EXP-01" and lines[2][6] == "1000.50"
+
+    sheet = load_workbook(tmp_path / "d.xlsx").active
+    values = list(sheet.values)
+    assert list(values[0]) == header
+    assert len(values) == 8
+    assert values[2][0] == "EXP-01" and values[2][6] == pytest.approx(1000.5)
@@ -0,0 +1,57 @@
+"""
+Facet counts of the dossier list dropdowns: one statement, each dropdown
+counted within the search and the other dropdown, cached until a dossier
+is committed.
+"""
+from datetime import date
+import pytest
+from src.models.dossier import Dossier
+from src.repositories.dossiers import count_dossier_facets
+
+
+@pytest.fixture
+def facet_dossiers(db_session):
+    specs = [
+        ("VENTE", "OUVERT"), ("VENTE", "OUVERT"), ("VENTE", "CLOTURE"),
+        ("SUCCESSION", "OUVERT"), ("DONATION", "SIGNATURE"),
+    ]
+    db_session.add_all(
+        Dossier(numero_dossier=f"FACET-{i}", intitule=f"Facette {type_dossier.lower()} {i}",
+                type_dossier=type_dossier, statut=statut, date_ouverture=date.today())
+        for i, (type_dossier, statut) in enumerate(specs)
+    )
+    # Outside the search
+    db_session.add(Dossier(numero_dossier="OTHER-1", intitule="Autre", type_dossier="VENTE",
+                           statut="OUVERT", date_ouverture=date.today()))
+    db_session.commit()
+    db_session.connection()
+
+
+def test_counts_per_type_and_status(db_session, facet_dossiers, assert_max_queries):
+    with assert_max_queries(1):
+        facets = count_dossier_facets(db_session, search="Facette")
+    assert facets.types == {"VENTE": 3, "SUCCESSION": 1, "DONATION": 1}
+    assert facets.statuts == {"OUVERT": 3, "CLOTURE": 1, "SIGNATURE": 1}
+
+
+def test_each_dropdown_counts_within_the_other_filter(db_session, facet_dossiers):
+    facets = count_dossier_facets(db_session, search="Facette", type_dossier="VENTE", statut="OUVERT")
+    # Types within statut=OUVERT, statuses within type=VENTE
+    assert facets.types == {"VENTE": 2, "SUCCESSION": 1}
+    assert facets.statuts == {"OUVERT": 2, "CLOTURE": 1}
+
+
+def test_counts_are_cached_until_a_dossier_is_committed(db_session, facet_dossiers, assert_max_queries):
+    count_dossier_facets(db_session, search="Facette", statut="CLOTURE")
+    with assert_max_queries(0):
+        cached = count_dossier_facets(db_session, search="Facette", statut="CLOTURE")
+    assert cached.types == {"VENTE": 1}
+
+    db_session.add(Dossier(numero_dossier="FACET-9", intitule="Facette vente 9", type_dossier="VENTE",
+                           statut="CLOTURE", date_ouverture=date.today()))
+    db_session.commit()
+    db_session.connection()
+
+    with assert_max_queries(1):
+        refreshed = count_dossier_facets(db_session, search="Facette", statut="CLOTURE")
+    assert refreshed.types == {"VENTE": 2}
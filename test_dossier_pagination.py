@@ -0,0 +1,88 @@
+"""
+Keyset pagination of the dossier list: pages follow (date_ouverture, id)
+most recent first, never skip or repeat a row, and keep the filters.
+"""
+from datetime import date, timedelta
+import pytest
+from src.models.dossier import Dossier
+from src.repositories.dossiers import DOSSIER_SORTS, list_dossiers_page
+
+
+@pytest.fixture
+def paged_dossiers(db_session):
+    """Eleven dossiers over four days, several sharing the same opening date"""
+    today = date.today()
+    dossiers = [
+        Dossier(
+            numero_dossier=f"PAGE-{i:03d}",
+            intitule=f"Succession famille {i}" if i % 2 else f"Vente terrain {i}",
+            type_dossier="SUCCESSION" if i % 2 else "VENTE",
+            statut="OUVERT" if i % 3 else "CLOTURE",
+            date_ouverture=today - timedelta(days=i // 3),
+            montant_acte=None if i % 4 == 0 else 1000 * (i % 5),
+        )
+        for i in range(11)
+    ]
+    db_session.add_all(dossiers)
+    db_session.commit()
+    db_session.connection()
+    return dossiers
+
+
+def _all_pages(db, limit, **filters):
+    pages, cursor = [], None
+    while True:
+        page = list_dossiers_page(db, after=cursor, limit=limit, **filters)
+        pages.append(page.rows)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_pages_cover_every_dossier_once_in_order(db_session, paged_dossiers):
+    pages = _all_pages(db_session, limit=4, search="PAGE-")
+    rows = [row for page in pages for row in page]
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    expected = sorted(paged_dossiers, key=lambda d: (d.date_ouverture, d.id), reverse=True)
+    assert [row.id for row in rows] == [d.id for d in expected]
+
+
+def test_pages_keep_filters(db_session, paged_dossiers):
+    rows = [row for page in _all_pages(db_session, limit=2, type_dossier="SUCCESSION", statut="OUVERT") for row in page]
+
+    expected = {d.id for d in paged_dossiers if d.type_dossier == "SUCCESSION" and d.statut == "OUVERT"}
+    assert {row.id for row in rows} == expected
+    assert len(rows) == len(expected)
+
+
+@pytest.mark.parametrize("sort,key,descending", [
+    ("numero", lambda d: d.numero_dossier, False),
+    ("intitule", lambda d: d.intitule, False),
+    ("statut", lambda d: d.statut, False),
+    ("montant_acte", lambda d: d.montant_acte or 0, True),
+])
+def test_sorted_pages_cover_every_dossier_once_in_order(db_session, paged_dossiers, sort, key, descending):
+    rows = [row for page in _all_pages(db_session, limit=3, search="PAGE-", sort=sort) for row in page]
+
+    expected = sorted(paged_dossiers, key=lambda d: (key(d), d.id), reverse=descending)
+    assert [row.id for row in rows] == [d.id for d in expected]
+
+
+def test_every_sort_paginates(db_session, paged_dossiers):
+    for sort in DOSSIER_SORTS:
+        rows = [row for page in _all_pages(db_session, limit=4, search="PAGE-", sort=sort) for row in page]
+        assert sorted(row.id for row in rows) == sorted(d.id for d in paged_dossiers), sort
+
+
+def test_last_page_has_no_cursor(db_session, paged_dossiers):
+    page = list_dossiers_page(db_session, search="PAGE-", limit=11)
+    assert len(page.rows) == 11
+    assert page.next_cursor is None
+
+
+def test_each_page_is_a_single_query(db_session, paged_dossiers, assert_max_queries):
+    first = list_dossiers_page(db_session, search="PAGE-", limit=5)
+    with assert_max_queries(1):
+        second = list_dossiers_page(db_session, search="PAGE-", after=first.next_cursor, limit=5)
+    assert not {row.id for row in first.rows} & {row.id for row in second.rows}
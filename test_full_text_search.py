@@ -0,0 +1,57 @@
+"""
+French full-text search of the dossier list: accent- and case-insensitive,
+stemmed, prefix-matching while typing, ranked, and still paginated.
+
+Needs PostgreSQL (DATABASE_URL); skipped on the embedded SQLite backend.
+"""
+from datetime import date
+import pytest
+from src.database import engine
+from src.models.dossier import Dossier
+from src.repositories.dossiers import list_dossiers_page
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "postgresql", reason="full-text search needs PostgreSQL")
+
+
+@pytest.fixture
+def searchable_dossiers(db_session):
+    rows = {
+        "titre": Dossier(numero_dossier="FTS-001", intitule="Cession d'un immeuble à Bamako",
+                         type_dossier="VENTE", date_ouverture=date(2024, 1, 10)),
+        "description": Dossier(numero_dossier="FTS-002", intitule="Vente terrain",
+                               type_dossier="VENTE", date_ouverture=date(2024, 3, 5),
+                               description="Cession partielle, l'immeuble voisin n'est pas concerné"),
+        "accents": Dossier(numero_dossier="FTS-003", intitule="Donation entre ÉPOUX",
+                           type_dossier="DONATION", date_ouverture=date(2024, 2, 1)),
+        "autre": Dossier(numero_dossier="FTS-004", intitule="Succession Traoré",
+                         type_dossier="SUCCESSION", date_ouverture=date(2024, 4, 1)),
+    }
+    db_session.add_all(rows.values())
+    db_session.commit()
+    db_session.connection()
+    return {name: dossier.id for name, dossier in rows.items()}
+
+
+def _ids(db, search, **kwargs):
+    return [row.id for row in list_dossiers_page(db, search=search, **kwargs).rows]
+
+
+def test_title_match_ranks_above_description_match(db_session, searchable_dossiers):
+    assert _ids(db_session, "cession immeuble") == [searchable_dossiers["titre"], searchable_dossiers["description"]]
+
+
+def test_accents_case_and_stemming(db_session, searchable_dossiers):
+    assert _ids(db_session, "epoux") == [searchable_dossiers["accents"]]
+    assert _ids(db_session, "successions traore") == [searchable_dossiers["autre"]]
+
+
+def test_prefix_while_typing_and_numero(db_session, searchable_dossiers):
+    assert _ids(db_session, "immeu") == [searchable_dossiers["titre"], searchable_dossiers["description"]]
+    assert _ids(db_session, "FTS-003") == [searchable_dossiers["accents"]]
+
+
+def test_ranked_results_paginate(db_session, searchable_dossiers):
+    first = list_dossiers_page(db_session, search="cession immeuble", limit=1)
+    second = list_dossiers_page(db_session, search="cession immeuble", after=first.next_cursor, limit=1)
+    assert [row.id for row in first.rows + second.rows] == [searchable_dossiers["titre"], searchable_dossiers["description"]]
+    assert second.next_cursor is None
@@ -0,0 +1,72 @@
+"""
+Kanban board: per-status pages and counts, and status moves that write the
+dossier and its history together and notify the columns.
+"""
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import select
+from src.models.dossier import Dossier, DossierHistorique
+from src.repositories.dossiers import count_dossiers, list_dossiers_page, move_dossier_status
+from src.utils import change_events
+
+
+@pytest.fixture
+def board(db_session):
+    dossiers = [
+        Dossier(numero_dossier=f"KAN-{i}", intitule=f"Kanban {i}", statut="OUVERT" if i < 3 else "SIGNATURE",
+                date_ouverture=date.today() - timedelta(days=i))
+        for i in range(5)
+    ]
+    db_session.add_all(dossiers)
+    db_session.commit()
+    db_session.connection()
+    return dossiers
+
+
+def test_each_column_counts_and_pages_its_status(db_session, board):
+    assert count_dossiers(db_session, "OUVERT") >= 3
+    page = list_dossiers_page(db_session, search="KAN-", statut="SIGNATURE", limit=1)
+    rest = list_dossiers_page(db_session, search="KAN-", statut="SIGNATURE", after=page.next_cursor, limit=1)
+    assert [row.numero_dossier for row in page.rows + rest.rows] == ["KAN-3", "KAN-4"]
+
+
+def test_move_writes_status_and_history(db_session, board, assert_max_queries):
+    dossier = board[0]
+    notified = []
+
+    def on_change(ids):
+        notified.append(ids)
+
+    unsubscribes = [
+        change_events.subscribe("dossiers", on_change),
+        change_events.subscribe(change_events.DOSSIER_STATUTS, on_change),
+    ]
+    try:
+        with assert_max_queries(1 if db_session.get_bind().dialect.name == "postgresql" else 2):
+            assert move_dossier_status(db_session, dossier.id, "OUVERT", "CLOTURE", commentaire="Glissé")
+        db_session.commit()
+    finally:
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+
+    db_session.refresh(dossier)
+    assert dossier.statut == "CLOTURE"
+    assert dossier.date_cloture is not None
+    history = db_session.execute(
+        select(DossierHistorique).where(DossierHistorique.dossier_id == dossier.id)
+    ).scalars().all()
+    assert [(h.ancien_statut, h.nouveau_statut, h.commentaire) for h in history] == [("OUVERT", "CLOTURE", "Glissé")]
+    # Only the two columns concerned reload
+    assert {dossier.id} in notified and {"OUVERT", "CLOTURE"} in notified
+
+
+def test_stale_move_writes_nothing(db_session, board):
+    dossier = board[3]
+    assert not move_dossier_status(db_session, dossier.id, "OUVERT", "INSTRUCTION")
+    db_session.commit()
+
+    db_session.refresh(dossier)
+    assert dossier.statut == "SIGNATURE"
+    assert db_session.execute(
+        select(DossierHistorique).where(DossierHistorique.dossier_id == dossier.id)
+    ).first() is None
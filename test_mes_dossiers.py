@@ -0,0 +1,58 @@
+"""
+"Mes dossiers": the list and its counts restricted to one responsable, and
+the first page prefetched at login until a dossier is committed.
+"""
+from datetime import date, timedelta
+import pytest
+from src.models.dossier import Dossier
+from src.models.user import User
+from src.repositories.dossiers import (
+    list_dossiers_page, count_dossier_facets, prefetch_first_page, prefetched_first_page,
+)
+
+
+@pytest.fixture
+def clerks(db_session):
+    """Two clerks, the first owning four dossiers and the second two"""
+    users = [
+        User(username=f"mes_clerc{i}", email=f"mes{i}@test.local", password_hash="x", role="CLERC")
+        for i in range(2)
+    ]
+    db_session.add_all(users)
+    db_session.flush()
+    db_session.add_all(
+        Dossier(numero_dossier=f"MES-{i}", intitule=f"Dossier suivi {i}", type_dossier="VENTE",
+                statut="OUVERT" if i % 2 else "SIGNATURE", date_ouverture=date.today() - timedelta(days=i),
+                responsable_id=users[0 if i < 4 else 1].id)
+        for i in range(6)
+    )
+    db_session.commit()
+    db_session.connection()
+    return [user.id for user in users]
+
+
+def test_list_keeps_only_the_responsable_dossiers(db_session, clerks):
+    page = list_dossiers_page(db_session, search="MES-", responsable_id=clerks[0], limit=3)
+    rest = list_dossiers_page(db_session, search="MES-", responsable_id=clerks[0], after=page.next_cursor, limit=3)
+
+    assert [row.numero_dossier for row in page.rows + rest.rows] == ["MES-0", "MES-1", "MES-2", "MES-3"]
+    assert rest.next_cursor is None
+
+
+def test_facets_count_only_the_responsable_dossiers(db_session, clerks):
+    facets = count_dossier_facets(db_session, search="MES-", responsable_id=clerks[1])
+    assert facets.types == {"VENTE": 2}
+    assert facets.statuts == {"SIGNATURE": 1, "OUVERT": 1}
+
+
+def test_prefetched_page_is_served_until_a_dossier_changes(db_session, clerks, assert_max_queries):
+    page, facets = prefetch_first_page(db_session, "MES-", responsable_id=clerks[1])
+
+    with assert_max_queries(0):
+        assert prefetched_first_page("MES-", responsable_id=clerks[1]) == (page, facets)
+    assert prefetched_first_page("MES-", responsable_id=clerks[0]) is None
+
+    db_session.add(Dossier(numero_dossier="MES-9", intitule="Nouveau", date_ouverture=date.today(),
+                           responsable_id=clerks[1]))
+    db_session.commit()
+    assert prefetched_first_page("MES-", responsable_id=clerks[1]) is None
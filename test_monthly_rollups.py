@@ -0,0 +1,112 @@
+"""
+monthly_rollups: dossiers count in their opening month, fees in their
+clôture month, and a refresh only rewrites the months the triggers queued
+since the previous one, whatever the write (insert, edit, deletion).
+"""
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import update
+from src.models.dossier import Dossier, DossierHistorique
+from src.models.rollup import MonthlyRollup
+from src.repositories.rollups import refresh_monthly_rollups, read_monthly_rollups, last_months
+from src.pages.dashboard import trend_series
+
+
+def _rows(db):
+    return {(row.mois, row.type_dossier): row for row in read_monthly_rollups(db, "1998-01", "1998-12")}
+
+
+@pytest.fixture
+def history(db_session):
+    """Two dossiers opened in March 1998, one of them closed in May"""
+    ouvert = Dossier(numero_dossier="ROLL-1", intitule="Ouvert", statut="OUVERT", type_dossier="VENTE",
+                     date_ouverture=date(1998, 3, 2))
+    clos = Dossier(numero_dossier="ROLL-2", intitule="Clos", statut="CLOTURE", type_dossier="VENTE",
+                   date_ouverture=date(1998, 3, 20),
+                   emoluments=Decimal("1000"), debours=Decimal("150"))
+    db_session.add_all([ouvert, clos])
+    db_session.flush()
+    db_session.add(DossierHistorique(dossier_id=clos.id, ancien_statut="FORMALITES", nouveau_statut="CLOTURE",
+                                     date_changement=datetime(1998, 5, 4)))
+    db_session.commit()
+    refresh_monthly_rollups(db_session, full=True)
+    db_session.commit()
+
+
+def test_full_refresh_counts_openings_and_closures(db_session, history):
+    rows = _rows(db_session)
+    assert rows["1998-03", "VENTE"].dossiers_ouverts == 2
+    assert rows["1998-03", "VENTE"].emoluments == Decimal("0.00")
+    mai = rows["1998-05", "VENTE"]
+    assert (mai.dossiers_ouverts, mai.dossiers_clotures) == (0, 1)
+    assert (mai.emoluments, mai.debours) == (Decimal("1000.00"), Decimal("150.00"))
+
+
+def test_incremental_refresh_rewrites_only_touched_months(db_session, history):
+    # Drift in an untouched month survives an incremental refresh...
+    db_session.execute(update(MonthlyRollup).where(MonthlyRollup.mois == "1998-03").values(dossiers_ouverts=99))
+    db_session.add(Dossier(numero_dossier="ROLL-3", intitule="Nouveau", statut="OUVERT", type_dossier="DONATION",
+                           date_ouverture=date(1998, 7, 1)))
+    db_session.commit()
+
+    assert refresh_monthly_rollups(db_session) == ["1998-07"]
+    rows = _rows(db_session)
+    assert rows["1998-07", "DONATION"].dossiers_ouverts == 1
+    assert rows["1998-03", "VENTE"].dossiers_ouverts == 99
+    assert refresh_monthly_rollups(db_session) == []
+
+    # ... and is repaired by a full one
+    refresh_monthly_rollups(db_session, full=True)
+    assert _rows(db_session)["1998-03", "VENTE"].dossiers_ouverts == 2
+
+
+def test_closure_marks_its_month(db_session, history):
+    ouvert = db_session.query(Dossier).filter_by(numero_dossier="ROLL-1").one()
+    ouvert.emoluments = Decimal("500")
+    db_session.add(DossierHistorique(dossier_id=ouvert.id, ancien_statut="FORMALITES", nouveau_statut="CLOTURE",
+                                     date_changement=datetime(1998, 5, 28)))
+    db_session.commit()
+
+    assert refresh_monthly_rollups(db_session) == ["1998-03", "1998-05"]
+    mai = _rows(db_session)["1998-05", "VENTE"]
+    assert (mai.dossiers_clotures, mai.emoluments) == (2, Decimal("1500.00"))
+
+
+def test_edits_and_deletions_mark_old_and_new_months(db_session, history):
+    clos = db_session.query(Dossier).filter_by(numero_dossier="ROLL-2").one()
+    clos.type_dossier = "DONATION"
+    clos.date_ouverture = date(1998, 4, 10)
+    clos.debours = Decimal("175")
+    db_session.commit()
+
+    assert refresh_monthly_rollups(db_session) == ["1998-03", "1998-04", "1998-05"]
+    rows = _rows(db_session)
+    assert rows["1998-03", "VENTE"].dossiers_ouverts == 1
+    assert rows["1998-04", "DONATION"].dossiers_ouverts == 1
+    assert ("1998-05", "VENTE") not in rows
+    assert rows["1998-05", "DONATION"].debours == Decimal("175.00")
+
+    db_session.delete(clos)
+    db_session.commit()
+    assert refresh_monthly_rollups(db_session) == ["1998-04", "1998-05"]
+    assert set(_rows(db_session)) == {("1998-03", "VENTE")}
+
+
+def test_trend_series_fills_every_bucket():
+    months = last_months(12, date(1998, 12, 15))
+    assert months[0] == "1998-01" and months[-1] == "1998-12"
+    rows = [
+        MonthlyRollup(mois="1998-03", type_dossier="VENTE", dossiers_ouverts=2, dossiers_clotures=0,
+                      emoluments=Decimal(0), debours=Decimal(0)),
+        MonthlyRollup(mois="1998-05", type_dossier="", dossiers_ouverts=1, dossiers_clotures=1,
+                      emoluments=Decimal("1000"), debours=Decimal("150")),
+    ]
+    labels, opened, fees = trend_series(rows, "12 mois", date(1998, 12, 15))
+    assert len(labels) == 12 and labels[2] == "Mars 98"
+    assert {serie.label: serie.values[2] + serie.values[4] for serie in opened} == {"Sans type": 1, "VENTE": 2}
+    assert fees[0].values[4] == 1000.0 and fees[1].values[4] == 150.0
+
+    labels, opened, fees = trend_series(rows, "5 ans", date(1998, 12, 15))
+    assert labels == ["1994", "1995", "1996", "1997", "1998"]
+    assert fees[0].values == [0, 0, 0, 0, 1000.0]
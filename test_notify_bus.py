@@ -0,0 +1,53 @@
+"""
+NOTIFY fan-out: notifications of the other processes are republished per
+table on change_events, the process' own ones are skipped.
+"""
+import json
+from src.utils import change_events, notify_bus
+
+
+def _payload(table, id, dossier_id=None, origin="autre-processus", statut=None, ancien_statut=None):
+    return json.dumps({"table": table, "id": id, "dossier_id": dossier_id, "origin": origin,
+                       "statut": statut, "ancien_statut": ancien_statut})
+
+
+def test_fanout_groups_changes_per_table():
+    received = {}
+
+    def on_dossiers(ids):
+        received["dossiers"] = ids
+
+    def on_contents(ids):
+        received[change_events.DOSSIER_CONTENTS] = ids
+
+    def on_statuts(statuts):
+        received[change_events.DOSSIER_STATUTS] = statuts
+
+    unsubscribes = [
+        change_events.subscribe("dossiers", on_dossiers),
+        change_events.subscribe(change_events.DOSSIER_CONTENTS, on_contents),
+        change_events.subscribe(change_events.DOSSIER_STATUTS, on_statuts),
+    ]
+    fanout = notify_bus.Fanout(origin="ce-processus")
+    try:
+        assert fanout.feed(_payload("dossiers", 1, statut="SIGNATURE", ancien_statut="OUVERT"))
+        assert fanout.feed(_payload("dossiers", 2, statut="OUVERT"))
+        assert fanout.feed(_payload("actes", 10, dossier_id=3))
+        assert fanout.feed(_payload("documents", 20, dossier_id=3))
+        assert not fanout.feed(_payload("dossiers", 4, origin="ce-processus"))
+        assert not fanout.feed("pas du json")
+        fanout.flush()
+        fanout.flush()  # nothing left to publish
+    finally:
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+    assert received == {
+        "dossiers": {1, 2},
+        change_events.DOSSIER_CONTENTS: {3},
+        change_events.DOSSIER_STATUTS: {"OUVERT", "SIGNATURE"},
+    }
+
+
+def test_notify_ddl_covers_the_notified_tables():
+    triggers = [statement for statement in notify_bus.NOTIFY_DDL if statement.startswith("CREATE TRIGGER")]
+    assert [statement.split(" ON ")[1].split()[0] for statement in triggers] == list(notify_bus.NOTIFIED_TABLES)
@@ -0,0 +1,45 @@
+"""
+Query budget tests: pin the number of statements issued by the hot paths so
+that a relationship silently falling back to lazy loading fails the build.
+"""
+from src.repositories.dossiers import get_dossier_detail, list_dossiers
+from src.repositories.actes import generate_acte_content
+
+
+def test_load_dossier_query_budget(db_session, seeded_dossier, assert_max_queries):
+    # The dossier with its responsable, then one SELECT per collection
+    with assert_max_queries(5):
+        dossier = get_dossier_detail(db_session, seeded_dossier["dossier_id"])
+    assert dossier is not None
+
+
+def test_render_tabs_without_lazy_loads(db_session, seeded_dossier, assert_max_queries):
+    dossier = get_dossier_detail(db_session, seeded_dossier["dossier_id"])
+
+    # Everything DossierDetailPage reads while building its tabs
+    with assert_max_queries(0):
+        parties = [(p.role_dans_acte, p.client.nom, p.client.prenom, p.client.telephone) for p in dossier.parties_associations]
+        history = [(h.nouveau_statut, h.user.username if h.user else None) for h in dossier.historique]
+        documents = [d.titre for d in dossier.documents]
+        actes = [a.titre for a in dossier.actes]
+        responsable = dossier.responsable.username
+
+    assert len(parties) == 3
+    assert len(history) == 2
+    assert len(documents) == 2
+    assert len(actes) == 2
+    assert responsable == "test_clerc"
+
+
+def test_list_dossiers_single_query(db_session, seeded_dossier, assert_max_queries):
+    with assert_max_queries(1):
+        rows = list_dossiers(db_session, search="Immeuble")
+    assert [row.id for row in rows] == [seeded_dossier["dossier_id"]]
+
+
+def test_generate_acte_query_budget(db_session, seeded_dossier, assert_max_queries):
+    with assert_max_queries(2):
+        template, dossier, contenu = generate_acte_content(
+            db_session, seeded_dossier["template_id"], seeded_dossier["dossier_id"]
+        )
+    assert "TEST-0001" in contenu
@@ -0,0 +1,133 @@
+"""
+Plan regression suite: EXPLAIN every hot query issued by the pages and fail
+when PostgreSQL falls back to a sequential scan, i.e. when an index from
+schema.sql / migrations/phase4_indexes.sql is missing or no longer usable.
+
+Needs PostgreSQL (DATABASE_URL); skipped on the embedded SQLite backend.
+"""
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import select, text
+from src.database import engine
+from src.models.client import Client
+from src.models.dossier import Dossier, DossierParties
+from src.models.user import User
+from src.repositories.clients import build_client_search_query
+from src.repositories.dossiers import DOSSIER_SORTS, DossierCursor, build_dossier_list_query, build_dossier_facets_query, build_dossier_detail_query
+from src.repositories import lookups
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "postgresql", reason="EXPLAIN checks need PostgreSQL")
+
+TYPES = ["VENTE", "SUCCESSION", "DONATION", "CONSTITUTION_SOCIETE", "AUTRE"]
+STATUTS = ["OUVERT", "INSTRUCTION", "SIGNATURE", "FORMALITE", "CLOTURE"]
+
+
+@pytest.fixture
+def plan_data(db_session):
+    """A few hundred dossiers and clients, analyzed, with sequential scans discouraged"""
+    user = User(username="plan_clerc", email="plan@test.local", password_hash="x", role="CLERC")
+    db_session.add(user)
+    db_session.flush()
+
+    clients = [
+        Client(type_client="PHYSIQUE", nom=f"Diallo{i}", prenom=f"Awa{i}", email=f"client{i}@test.local")
+        for i in range(500)
+    ]
+    dossiers = [
+        Dossier(
+            numero_dossier=f"PLAN-{i:05d}", intitule=f"Vente parcelle {i}",
+            type_dossier=TYPES[i % len(TYPES)], statut=STATUTS[i % len(STATUTS)],
+            date_ouverture=date.today() - timedelta(days=i), responsable_id=user.id,
+        )
+        for i in range(500)
+    ]
+    db_session.add_all(clients + dossiers)
+    db_session.flush()
+    db_session.add_all(
+        DossierParties(dossier_id=dossier.id, client_id=client.id, role_dans_acte="VENDEUR")
+        for dossier, client in zip(dossiers, clients)
+    )
+    db_session.flush()
+
+    for table in ("users", "clients", "dossiers", "dossier_parties"):
+        db_session.execute(text(f"ANALYZE {table}"))
+    # Tables this small are always cheaper to scan; with sequential scans
+    # disabled the planner picks an index whenever one can serve the query,
+    # so a Seq Scan left in the plan means the index is missing.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    return {"user": user.username, "dossier_id": dossiers[0].id, "client_id": clients[0].id}
+
+
+def _seq_scans(plan: dict, node_type: str = "Seq Scan") -> list[str]:
+    found = [plan.get("Relation Name", "?")] if plan["Node Type"] == node_type else []
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child, node_type)
+    return found
+
+
+def _explain(db, statement):
+    sql = statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    return sql, db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+
+
+def assert_no_seq_scan(db, statement):
+    sql, plan = _explain(db, statement)
+    assert not _seq_scans(plan), f"Sequential scan on {_seq_scans(plan)} for:\n{sql}"
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"search": "parcelle 42"},
+    {"search": "PLAN-0004"},
+    {"search": "parcelle 42", "full_text": True},
+    {"search": "vente parcel", "type_dossier": "VENTE", "full_text": True},
+    {"type_dossier": "VENTE"},
+    {"statut": "OUVERT"},
+    {"statut": "OUVERT", "type_dossier": "VENTE"},
+    {"responsable_id": 1},
+    {"responsable_id": 1, "statut": "OUVERT"},
+])
+def test_dossier_list_uses_indexes(db_session, plan_data, filters):
+    assert_no_seq_scan(db_session, build_dossier_list_query(**filters, limit=51))
+
+
+@pytest.mark.parametrize("filters", [{}, {"type_dossier": "VENTE"}, {"statut": "OUVERT", "type_dossier": "VENTE"}])
+def test_dossier_list_next_page_uses_indexes(db_session, plan_data, filters):
+    cursor = DossierCursor(date.today() - timedelta(days=100), plan_data["dossier_id"])
+    assert_no_seq_scan(db_session, build_dossier_list_query(**filters, after=cursor, limit=51))
+
+
+@pytest.mark.parametrize("sort", DOSSIER_SORTS)
+def test_dossier_sorts_read_an_index_in_order(db_session, plan_data, sort):
+    first = build_dossier_list_query(limit=51, sort=sort)
+    sql, plan = _explain(db_session, first)
+    assert not _seq_scans(plan) and not _seq_scans(plan, "Sort"), f"Table scan or sort for:\n{sql}"
+
+    cursor = DossierCursor(date.today(), plan_data["dossier_id"], sort_value=date.today() if sort == "date" else 0)
+    if sort in ("numero", "intitule", "statut"):
+        cursor = cursor._replace(sort_value="M")
+    sql, plan = _explain(db_session, build_dossier_list_query(after=cursor, limit=51, sort=sort))
+    assert not _seq_scans(plan) and not _seq_scans(plan, "Sort"), f"Table scan or sort for:\n{sql}"
+
+
+@pytest.mark.parametrize("search", ["", "Diallo4", "Awa12", "client7@"])
+def test_client_picker_uses_indexes(db_session, plan_data, search):
+    assert_no_seq_scan(db_session, build_client_search_query(search))
+
+
+def test_search_facets_use_indexes(db_session, plan_data):
+    assert_no_seq_scan(db_session, build_dossier_facets_query("parcelle", statut="OUVERT", full_text=True))
+
+
+def test_dossier_detail_uses_indexes(db_session, plan_data):
+    assert_no_seq_scan(db_session, build_dossier_detail_query(plan_data["dossier_id"]))
+
+
+def test_parties_by_client_use_index(db_session, plan_data):
+    query = select(DossierParties).where(DossierParties.client_id == plan_data["client_id"])
+    assert_no_seq_scan(db_session, query)
+
+
+def test_hot_lookups_use_indexes(db_session, plan_data):
+    assert_no_seq_scan(db_session, lookups._USER_BY_USERNAME.params(username=plan_data["user"]))
+    assert_no_seq_scan(db_session, lookups._DOSSIER_BY_ID.params(id=plan_data["dossier_id"]))
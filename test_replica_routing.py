@@ -0,0 +1,41 @@
+"""
+Replica routing: the health check never blocks the caller, an unreachable
+replica sends reads to the primary while it is probed in the background.
+"""
+import threading
+import time
+import src.database as database
+
+
+class _UnreachableReplica:
+    """Engine stand-in whose connection attempt hangs until released, then fails"""
+
+    def __init__(self):
+        self.attempted = threading.Event()
+        self.release = threading.Event()
+
+    def connect(self):
+        self.attempted.set()
+        self.release.wait(5)
+        raise OSError("connection timed out")
+
+
+def test_replica_probe_runs_in_background(monkeypatch):
+    replica = _UnreachableReplica()
+    monkeypatch.setattr(database, "replica_engine", replica)
+    monkeypatch.setattr(database, "_replica_check_running", False)
+    monkeypatch.setattr(database, "_replica_status", {"healthy": True, "lag": 0, "checked_at": None, "error": None})
+
+    started = time.monotonic()
+    assert database.replica_available() is True  # last known status while the probe runs
+    assert database.replica_available() is True  # no second probe
+    assert time.monotonic() - started < 0.5
+    assert replica.attempted.wait(1)
+
+    replica.release.set()
+    for _ in range(50):
+        if database._replica_status["error"]:
+            break
+        time.sleep(0.02)
+    assert database.replica_available() is False
+    assert "timed out" in database.get_replica_status()["error"]
@@ -0,0 +1,67 @@
+"""
+stats_counters: triggers keep the running totals in step with every write
+to dossiers and actes, ORM or Core, and reconciliation repairs drift.
+"""
+from datetime import date
+from decimal import Decimal
+import pytest
+from sqlalchemy import update
+from src.models.acte import Acte
+from src.models.dossier import Dossier
+from src.models.stats import StatsCounter
+from src.repositories.dossiers import move_dossier_status
+from src.repositories.stats import read_counters, reconcile_stats_counters
+
+
+def _counts(db, dimension):
+    return {key: value.count for key, value in read_counters(db, dimension).items()}
+
+
+@pytest.fixture
+def counted(db_session):
+    dossier = Dossier(numero_dossier="STAT-1", intitule="Compteurs", statut="OUVERT", type_dossier="NOUVEAU_TYPE",
+                      date_ouverture=date(1999, 1, 15), emoluments=Decimal("1000"), debours=Decimal("200"))
+    db_session.add(dossier)
+    db_session.flush()
+    db_session.add(Acte(dossier_id=dossier.id, titre="Acte", statut="BROUILLON"))
+    db_session.commit()
+    return dossier
+
+
+def test_insert_counts_every_dimension(db_session, counted):
+    assert _counts(db_session, "type").get("NOUVEAU_TYPE") == 1
+    month = read_counters(db_session, "mois")["1999-01"]
+    assert (month.count, month.emoluments, month.debours) == (1, Decimal("1000.00"), Decimal("200.00"))
+
+
+def test_updates_move_counts_between_keys(db_session, counted):
+    before = _counts(db_session, "statut")
+    counted.statut = "INSTRUCTION"
+    counted.emoluments = Decimal("1500")
+    db_session.commit()
+    move_dossier_status(db_session, counted.id, "INSTRUCTION", "SIGNATURE")
+    db_session.execute(update(Acte).where(Acte.dossier_id == counted.id).values(statut="FINALISE"))
+    db_session.commit()
+
+    after = _counts(db_session, "statut")
+    assert after.get("OUVERT", 0) == before.get("OUVERT", 0) - 1
+    assert after.get("SIGNATURE", 0) == before.get("SIGNATURE", 0) + 1
+    assert after.get("INSTRUCTION", 0) == before.get("INSTRUCTION", 0)
+    assert read_counters(db_session, "mois")["1999-01"].emoluments == Decimal("1500.00")
+    assert _counts(db_session, "acte_statut").get("FINALISE", 0) >= 1
+
+
+def test_delete_uncounts(db_session, counted):
+    db_session.query(Acte).filter(Acte.dossier_id == counted.id).delete()
+    db_session.delete(counted)
+    db_session.commit()
+    assert "1999-01" not in read_counters(db_session, "mois")
+
+
+def test_reconciliation_repairs_drift(db_session, counted):
+    db_session.execute(
+        update(StatsCounter).where(StatsCounter.dimension == "mois", StatsCounter.key == "1999-01").values(count=7)
+    )
+    assert reconcile_stats_counters(db_session) == 1
+    assert _counts(db_session, "mois")["1999-01"] == 1
+    assert reconcile_stats_counters(db_session) == 0
@@ -0,0 +1,69 @@
+"""
+Shared TTL cache: concurrent async misses run the loader once, and a clear()
+during a load keeps the stale result out of the cache.
+"""
+import asyncio
+from src.utils.ttl_cache import TTLCache
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load_async("k", loader) for _ in range(20)))
+
+    assert asyncio.run(scenario()) == [1] * 20
+    assert len(calls) == 1
+    assert cache.get("k") == 1
+
+
+def test_clear_during_load_drops_the_result():
+    cache = TTLCache(ttl=60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return "stale"
+
+    async def scenario():
+        task = asyncio.ensure_future(cache.get_or_load_async("k", loader))
+        await asyncio.sleep(0)
+        cache.clear()
+        return await task
+
+    assert asyncio.run(scenario()) == "stale"
+    assert cache.get("k") is None
+
+
+def test_clear_during_sync_load_drops_the_result():
+    cache = TTLCache(ttl=60)
+
+    def loader():
+        cache.clear()  # a commit lands while the query runs
+        return "stale"
+
+    assert cache.get_or_load("k", loader) == "stale"
+    assert cache.get("k") is None
+
+
+def test_cancelled_waiter_does_not_cancel_the_load():
+    cache = TTLCache(ttl=60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def scenario():
+        first = asyncio.ensure_future(cache.get_or_load_async("k", loader))
+        second = asyncio.ensure_future(cache.get_or_load_async("k", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "value"
+    assert cache.get("k") == "value"
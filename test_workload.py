@@ -0,0 +1,49 @@
+"""
+Workload view: dossiers in progress, draft actes and late items per
+responsable and status, in one aggregate statement.
+"""
+from datetime import date, timedelta
+from src.models.acte import Acte
+from src.models.dossier import Dossier
+from src.models.formalite import Formalite
+from src.models.user import User
+from src.repositories.workload import get_workload, DOSSIER_DELAI_JOURS, FORMALITE_DELAI_JOURS
+from src.pages.workload import group_by_responsable
+
+
+def test_workload_per_responsable_and_status(db_session, assert_max_queries):
+    clerc = User(username="clerc_charge", email="clerc_charge@example.com", password_hash="x", role="CLERC")
+    db_session.add(clerc)
+    db_session.flush()
+    old = date.today() - timedelta(days=DOSSIER_DELAI_JOURS + 1)
+    dossiers = [
+        Dossier(numero_dossier="WL-1", intitule="Ancien", statut="INSTRUCTION", date_ouverture=old, responsable_id=clerc.id),
+        Dossier(numero_dossier="WL-2", intitule="Récent", statut="INSTRUCTION", date_ouverture=date.today(), responsable_id=clerc.id),
+        Dossier(numero_dossier="WL-3", intitule="Signature", statut="SIGNATURE", date_ouverture=date.today(), responsable_id=clerc.id),
+        Dossier(numero_dossier="WL-4", intitule="Clos", statut="CLOTURE", date_ouverture=old, responsable_id=clerc.id),
+    ]
+    db_session.add_all(dossiers)
+    db_session.flush()
+    db_session.add_all([
+        Acte(dossier_id=dossiers[1].id, titre="Brouillon", statut="BROUILLON"),
+        Acte(dossier_id=dossiers[1].id, titre="Finalisé", statut="FINALISE"),
+        Acte(dossier_id=dossiers[3].id, titre="Brouillon d'un dossier clos", statut="BROUILLON"),
+        Formalite(dossier_id=dossiers[2].id, type_formalite="ENREGISTREMENT", statut="EN_COURS",
+                  date_depot=date.today() - timedelta(days=FORMALITE_DELAI_JOURS + 1)),
+        Formalite(dossier_id=dossiers[2].id, type_formalite="PUBLICITE_FONCIERE", statut="EN_COURS",
+                  date_depot=date.today()),
+    ])
+    db_session.commit()
+    db_session.connection()
+
+    with assert_max_queries(1):
+        rows = get_workload(db_session)
+    mine = {row.statut: row for row in rows if row.responsable_id == clerc.id}
+    assert set(mine) == {"INSTRUCTION", "SIGNATURE"}
+    instruction, signature = mine["INSTRUCTION"], mine["SIGNATURE"]
+    assert (instruction.dossiers, instruction.dossiers_en_retard, instruction.actes_brouillon) == (2, 1, 1)
+    assert (signature.dossiers, signature.formalites_en_retard) == (1, 1)
+    assert instruction.username == "clerc_charge" and instruction.role == "CLERC"
+
+    (load,) = [load for load in group_by_responsable(rows) if load.responsable_id == clerc.id]
+    assert (load.dossiers, load.actes_brouillon, load.dossiers_en_retard, load.formalites_en_retard) == (3, 1, 1, 1)